@@ -1,3 +1,10 @@
+from importlib.metadata import version, PackageNotFoundError  # for keying caches on the package version
+
+try:
+    __version__ = version("teiphy")
+except PackageNotFoundError:
+    __version__ = "unknown"
+
 from .common import xml_ns, tei_ns
 from .format import Format
 from .witness import Witness
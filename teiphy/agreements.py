@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+
+import numpy as np  # for matrix multiplication
+
+
+def get_unit_columns(reading_offsets: np.ndarray, unit_inds=None):
+    """Gathers the columns of the given variation units in a reading support array.
+
+    Args:
+        reading_offsets: A NumPy array of the column offsets of the variation units in the reading support array.
+        unit_inds: An optional list of the indices of the variation units to include. If it is not specified, then all variation units are included.
+
+    Returns:
+        An int NumPy array of the indices of the included variation units.
+        An int NumPy array of the number of columns of each included variation unit.
+        An int NumPy array of the offsets of the included variation units in the gathered columns.
+        An int NumPy array of the gathered column indices.
+    """
+    if unit_inds is None:
+        unit_inds = range(len(reading_offsets) - 1)
+    unit_inds = np.asarray(unit_inds, dtype=int)
+    starts = np.asarray(reading_offsets)[unit_inds]
+    widths = np.asarray(reading_offsets)[unit_inds + 1] - starts
+    unit_offsets = np.concatenate([[0], np.cumsum(widths)]).astype(int)
+    cols = np.arange(unit_offsets[-1]) + np.repeat(starts - unit_offsets[:-1], widths)
+    return unit_inds, widths, unit_offsets, cols
+
+
+def get_unit_sums(array: np.ndarray, unit_offsets: np.ndarray):
+    """Sums the columns of each variation unit in each row of a block of a reading support array.
+
+    Args:
+        array: A two-dimensional NumPy array whose columns are grouped into variation units.
+        unit_offsets: An int NumPy array of the column offsets of the variation units in the array, ending with the number of columns.
+
+    Returns:
+        A NumPy array with a row for each row of the input and a column for each variation unit.
+    """
+    sums = np.zeros((array.shape[0], len(unit_offsets) - 1), dtype=np.result_type(array.dtype, np.int64))
+    # Units without readings sum to 0, and they have to be left out of the reduction, which would otherwise give them the value of the next column:
+    nonempty = np.flatnonzero(np.diff(unit_offsets) > 0)
+    if len(nonempty) > 0:
+        sums[:, nonempty] = np.add.reduceat(array, unit_offsets[nonempty], axis=1, dtype=sums.dtype)
+    return sums
+
+
+def get_block_size(nrows: int, block: slice = None):
+    """Returns the number of rows in the given block of an array's rows.
+
+    Args:
+        nrows: The number of rows in the array.
+        block: An optional slice of the array's rows. If it is not specified, then the block contains all rows.
+
+    Returns:
+        The number of rows in the block.
+    """
+    return nrows if block is None else len(range(nrows)[block])
+
+
+def gram_counts(matrix: np.ndarray, other: np.ndarray = None):
+    """Counts the columns shared by every pair of rows in two-dimensional binary arrays using matrix multiplication.
+
+    Args:
+        matrix: A two-dimensional NumPy array of zeroes and ones.
+        other: An optional second array of zeroes and ones with the same number of columns, whose rows are paired with the rows of the first array.
+            If it is not specified, then the rows of the first array are paired with each other.
+
+    Returns:
+        An int NumPy array whose entry (i, j) is the number of columns in which both row i of the first array and row j of the second array are 1.
+    """
+    # Single-precision products are exact as long as no count exceeds 2^24, which holds for every block that the callers pass in:
+    matrix = matrix.astype(np.float32)
+    other = matrix if other is None else other.astype(np.float32)
+    return np.rint(matrix @ other.T).astype(int)
+
+
+def shared_extant_counts(
+    extant_mask: np.ndarray, unit_inds=None, chunk_size: int = 1 << 24, row_block: slice = None, col_block: slice = None
+):
+    """Counts the variation units at which both witnesses in each pair are extant, as the product of the extant mask with its transpose.
+
+    Args:
+        extant_mask: A boolean NumPy array with a row for each witness and a column for each variation unit.
+        unit_inds: An optional list of the indices of the variation units to include. If it is not specified, then all variation units are included.
+        chunk_size: An optional maximum number of entries of the extant mask to read at a time.
+        row_block: An optional slice of the witnesses for the rows of the counts. If it is not specified, then all witnesses are included.
+        col_block: An optional slice of the witnesses for the columns of the counts. If it is not specified, then it is the same as the row block.
+
+    Returns:
+        An int NumPy array with a row for each witness in the row block and a column for each witness in the column block.
+    """
+    if unit_inds is None:
+        unit_inds = range(extant_mask.shape[1])
+    unit_inds = np.asarray(unit_inds, dtype=int)
+    row_block = slice(None) if row_block is None else row_block
+    nrows = get_block_size(extant_mask.shape[0], row_block)
+    ncols = nrows if col_block is None else get_block_size(extant_mask.shape[0], col_block)
+    counts = np.zeros((nrows, ncols), dtype=int)
+    units_per_chunk = max(1, chunk_size // max(nrows + ncols, 1))
+    for chunk_start in range(0, len(unit_inds), units_per_chunk):
+        chunk_unit_inds = unit_inds[chunk_start : chunk_start + units_per_chunk]
+        row_extant = extant_mask[row_block][:, chunk_unit_inds]
+        col_extant = None if col_block is None else extant_mask[col_block][:, chunk_unit_inds]
+        counts += gram_counts(row_extant, col_extant)
+    return counts
+
+
+def get_unit_overlaps(
+    row_supported: np.ndarray, col_supported: np.ndarray, row_extant: np.ndarray, col_extant: np.ndarray
+):
+    """Returns a mask of the pairs of witnesses that are both extant at a variation unit and support a common reading there.
+
+    Args:
+        row_supported: A boolean NumPy array with a row for each of the first witnesses and a column for each reading in the unit.
+        col_supported: A boolean NumPy array with a row for each of the second witnesses and a column for each reading in the unit.
+        row_extant: A boolean NumPy array indicating whether each of the first witnesses is extant at the unit.
+        col_extant: A boolean NumPy array indicating whether each of the second witnesses is extant at the unit.
+
+    Returns:
+        An int NumPy array of zeroes and ones with a row for each of the first witnesses and a column for each of the second witnesses.
+    """
+    unit_overlaps = gram_counts(row_supported, col_supported) > 0
+    unit_overlaps &= row_extant[:, np.newaxis] & col_extant[np.newaxis, :]
+    return unit_overlaps.astype(int)
+
+
+class AgreementCounts:
+    """Class for the pairwise agreement, overlap, and shared extant variation unit counts of a collation's witnesses,
+    computed with matrix multiplication over binary witness-by-reading support matrices.
+
+    The reading support array is processed in blocks of variation units.
+    For each block, the agreements are counted as the product of the matrix of unambiguously supported readings with its transpose,
+    and the shared extant variation units are counted as the product of the extant mask with its transpose.
+    Where a witness supports more than one reading in a variation unit, the overlaps of that witness with all others are counted for the unit separately,
+    so that each variation unit contributes at most one overlap to each pair of witnesses.
+    The counts can be restricted to a tile of pairs whose first witnesses are in one block of rows and whose second witnesses are in another.
+
+    Attributes:
+        shared_extant: An int NumPy array of the number of variation units at which both witnesses in each pair are extant.
+        agreements: An int NumPy array of the number of variation units at which both witnesses in each pair unambiguously support the same reading.
+        overlaps: An int NumPy array of the number of variation units at which both witnesses in each pair are extant and support a common reading.
+    """
+
+    __slots__ = ["shared_extant", "agreements", "overlaps"]
+
+    def __init__(
+        self,
+        reading_support: np.ndarray,
+        reading_offsets: np.ndarray,
+        extant_mask: np.ndarray,
+        unit_inds=None,
+        chunk_size: int = 1 << 24,
+        row_block: slice = None,
+        col_block: slice = None,
+    ):
+        """Constructs a new AgreementCounts instance from a reading support array.
+
+        Args:
+            reading_support: A NumPy array with a row for each witness and a column for each substantive reading of each variation unit.
+            reading_offsets: A NumPy array of the column offsets of the variation units in the reading support array.
+            extant_mask: A boolean NumPy array with a row for each witness and a column for each variation unit.
+            unit_inds: An optional list of the indices of the variation units to include. If it is not specified, then all variation units are included.
+            chunk_size: An optional maximum number of entries of the reading support array to read at a time.
+                The reading support array is processed in blocks of variation units, so that it can be a memory-mapped array larger than memory.
+            row_block: An optional slice of the witnesses for the rows of the counts. If it is not specified, then all witnesses are included.
+            col_block: An optional slice of the witnesses for the columns of the counts. If it is not specified, then it is the same as the row block.
+        """
+        # Gather the columns of the included variation units:
+        unit_inds, widths, unit_offsets, cols = get_unit_columns(reading_offsets, unit_inds)
+        row_block = slice(None) if row_block is None else row_block
+        nrows = get_block_size(reading_support.shape[0], row_block)
+        ncols = nrows if col_block is None else get_block_size(reading_support.shape[0], col_block)
+        self.shared_extant = np.zeros((nrows, ncols), dtype=int)
+        self.agreements = np.zeros((nrows, ncols), dtype=int)
+        ambiguous_overlaps = np.zeros((nrows, ncols), dtype=int)
+        # Process the variation units in blocks, so that only a block of the reading support array is read into memory at a time:
+        units_per_chunk = max(1, chunk_size // max((nrows + ncols) * int(widths.max(initial=1)), 1))
+        for chunk_start in range(0, len(unit_inds), units_per_chunk):
+            chunk_end = min(chunk_start + units_per_chunk, len(unit_inds))
+            chunk_offsets = unit_offsets[chunk_start : chunk_end + 1] - unit_offsets[chunk_start]
+            chunk_cols = cols[unit_offsets[chunk_start] : unit_offsets[chunk_end]]
+            col_units = np.repeat(np.arange(chunk_end - chunk_start), widths[chunk_start:chunk_end])
+            row_extant = extant_mask[row_block][:, unit_inds[chunk_start:chunk_end]]
+            # Mark the readings that each witness supports in this block, and count the readings each witness supports in each unit:
+            row_supported = reading_support[row_block][:, chunk_cols] > 0
+            row_nsupported = get_unit_sums(row_supported, chunk_offsets)
+            row_unambiguous = row_supported & (row_nsupported == 1)[:, col_units]
+            if col_block is None:
+                col_extant, col_supported, col_nsupported = row_extant, row_supported, row_nsupported
+                self.shared_extant += gram_counts(row_extant)
+                self.agreements += gram_counts(row_unambiguous)
+            else:
+                col_extant = extant_mask[col_block][:, unit_inds[chunk_start:chunk_end]]
+                col_supported = reading_support[col_block][:, chunk_cols] > 0
+                col_nsupported = get_unit_sums(col_supported, chunk_offsets)
+                col_unambiguous = col_supported & (col_nsupported == 1)[:, col_units]
+                self.shared_extant += gram_counts(row_extant, col_extant)
+                # Two witnesses agree in a unit if they both support the same reading and no other, so only one product of their rows can be nonzero there:
+                self.agreements += gram_counts(row_unambiguous, col_unambiguous)
+            # The rows of witnesses that are ambiguous in a unit can share more than one reading with another row,
+            # so count their overlaps in that unit separately:
+            row_ambiguous = row_nsupported > 1
+            col_ambiguous = col_nsupported > 1
+            for k in np.flatnonzero(row_ambiguous.any(axis=0) | col_ambiguous.any(axis=0)):
+                rows = np.flatnonzero(row_ambiguous[:, k])
+                cols_k = np.flatnonzero(col_ambiguous[:, k])
+                unit_row_supported = row_supported[:, chunk_offsets[k] : chunk_offsets[k + 1]]
+                unit_col_supported = col_supported[:, chunk_offsets[k] : chunk_offsets[k + 1]]
+                row_overlaps = get_unit_overlaps(
+                    unit_row_supported[rows], unit_col_supported, row_extant[rows, k], col_extant[:, k]
+                )
+                col_overlaps = get_unit_overlaps(
+                    unit_row_supported, unit_col_supported[cols_k], row_extant[:, k], col_extant[cols_k, k]
+                )
+                # Add the overlaps to the rows and columns of the ambiguous witnesses, without counting pairs of ambiguous witnesses twice:
+                ambiguous_overlaps[rows, :] += row_overlaps
+                ambiguous_overlaps[:, cols_k] += col_overlaps
+                ambiguous_overlaps[np.ix_(rows, cols_k)] -= row_overlaps[:, cols_k]
+        self.overlaps = self.agreements + ambiguous_overlaps
+
+    def shared_extant_counts(self):
+        """Returns a matrix of the number of variation units at which both witnesses in each pair are extant.
+
+        Returns:
+            An int NumPy array with a row and column for each witness.
+        """
+        return self.shared_extant.copy()
+
+    def agreement_counts(self):
+        """Returns a matrix of the number of variation units at which both witnesses in each pair unambiguously support the same reading.
+
+        Returns:
+            An int NumPy array with a row and column for each witness.
+        """
+        return self.agreements.copy()
+
+    def disagreement_counts(self):
+        """Returns a matrix of the number of variation units at which both witnesses in each pair are extant but have no supported readings in common.
+
+        Returns:
+            An int NumPy array with a row and column for each witness.
+        """
+        return self.shared_extant - self.overlaps
+
+
+def get_expected_information(row_supports: np.ndarray, col_supports: np.ndarray, weights: np.ndarray):
+    """Returns the expected information content of the agreement of every pair of witnesses at a variation unit, given that they agree.
+
+    Args:
+        row_supports: A float NumPy array with a row for each of the first witnesses and a column for each reading in the unit.
+        col_supports: A float NumPy array with a row for each of the second witnesses and a column for each reading in the unit.
+        weights: A float NumPy array of the information content of each reading in the unit.
+
+    Returns:
+        A float NumPy array with a row for each of the first witnesses and a column for each of the second witnesses.
+    """
+    probabilities_of_agreement = row_supports @ col_supports.T
+    weighted_agreements = (row_supports * weights) @ col_supports.T
+    expected_information = np.zeros(probabilities_of_agreement.shape, dtype=float)
+    np.divide(
+        weighted_agreements,
+        probabilities_of_agreement,
+        out=expected_information,
+        where=(probabilities_of_agreement > 0),
+    )
+    return expected_information
+
+
+def information_weighted_agreements(
+    supports: np.ndarray, unit_offsets: np.ndarray, weights: np.ndarray, other_supports: np.ndarray = None
+):
+    """Sums, over the variation units in a block of normalized reading support, the expected information content of the agreement of every pair of witnesses,
+    given that they agree.
+
+    Where both witnesses in a pair support a single reading, the expected information content of their agreement is just the weight of their shared reading,
+    so these contributions are summed for all pairs at once as a weighted matrix product.
+    Where either witness divides its support between readings, the weighted product for the unit is divided by the probability of their agreement,
+    which is only computed for the rows of such witnesses.
+
+    Args:
+        supports: A two-dimensional float NumPy array with a row for each witness and a column for each reading in the block,
+            whose entries in each variation unit sum to 1 (or 0, if the witness contributes nothing there).
+        unit_offsets: An int NumPy array of the column offsets of the variation units in the block, ending with the number of columns.
+        weights: A float NumPy array of the information content of each reading in the block.
+        other_supports: An optional second array of normalized reading support for the same readings, whose witnesses are paired with those of the first.
+            If it is not specified, then the witnesses of the first array are paired with each other.
+
+    Returns:
+        A float NumPy array with a row for each witness in the first array and a column for each witness in the second.
+    """
+    widths = np.diff(unit_offsets)
+    col_units = np.repeat(np.arange(len(widths)), widths)
+    row_nsupported = get_unit_sums(supports > 0, unit_offsets)
+    col_supports = supports if other_supports is None else other_supports
+    col_nsupported = row_nsupported if other_supports is None else get_unit_sums(other_supports > 0, unit_offsets)
+    # Sum the weights of the readings on which pairs of witnesses with single readings agree:
+    row_definite_supports = np.where((row_nsupported == 1)[:, col_units], supports, 0.0)
+    col_definite_supports = np.where((col_nsupported == 1)[:, col_units], col_supports, 0.0)
+    matrix = (row_definite_supports * weights) @ col_definite_supports.T
+    # Then add the contributions of the witnesses that divide their support between readings, one unit at a time:
+    row_diffuse = row_nsupported > 1
+    col_diffuse = col_nsupported > 1
+    for k in np.flatnonzero(row_diffuse.any(axis=0) | col_diffuse.any(axis=0)):
+        rows = np.flatnonzero(row_diffuse[:, k])
+        cols = np.flatnonzero(col_diffuse[:, k])
+        unit_row_supports = supports[:, unit_offsets[k] : unit_offsets[k + 1]]
+        unit_col_supports = col_supports[:, unit_offsets[k] : unit_offsets[k + 1]]
+        unit_weights = weights[unit_offsets[k] : unit_offsets[k + 1]]
+        row_information = get_expected_information(unit_row_supports[rows], unit_col_supports, unit_weights)
+        col_information = get_expected_information(unit_row_supports, unit_col_supports[cols], unit_weights)
+        # Add the contributions to the rows and columns of the diffuse witnesses, without counting pairs of diffuse witnesses twice:
+        matrix[rows, :] += row_information
+        matrix[:, cols] += col_information
+        matrix[np.ix_(rows, cols)] -= row_information[:, cols]
+    if other_supports is not None:
+        return matrix
+    # The products can differ from their transposes by rounding, so copy the upper triangle over the lower one to keep the matrix symmetric:
+    return np.triu(matrix) + np.triu(matrix, 1).T
+
+
+def get_divergences(supports: np.ndarray, unit_offsets: np.ndarray, sampling_probabilities: np.ndarray):
+    """Returns the Kullback-Leibler divergence (in bits) of each witness's normalized reading support from the sampling distribution in each variation unit of a block,
+    along with the total of each witness's support in each unit.
+
+    Args:
+        supports: A two-dimensional float NumPy array with a row for each witness and a column for each reading in the block.
+        unit_offsets: An int NumPy array of the column offsets of the variation units in the block, ending with the number of columns.
+        sampling_probabilities: A float NumPy array of the sampling probability of each reading in the block.
+
+    Returns:
+        A float NumPy array of divergences with a row for each witness and a column for each variation unit.
+        A float NumPy array of support totals with a row for each witness and a column for each variation unit.
+    """
+    # Skip the readings that each witness does not support:
+    terms = np.zeros(supports.shape, dtype=float)
+    rows, cols = np.nonzero(supports > 0)
+    terms[rows, cols] = supports[rows, cols] * np.log2(supports[rows, cols] / sampling_probabilities[cols])
+    return get_unit_sums(terms, unit_offsets), get_unit_sums(supports, unit_offsets)
+
+
+def mutual_information(
+    supports: np.ndarray,
+    unit_offsets: np.ndarray,
+    sampling_probabilities: np.ndarray,
+    other_supports: np.ndarray = None,
+):
+    """Sums, over the variation units in a block of normalized reading support, the mutual information (in bits) of every pair of witnesses.
+
+    In each unit, the observed joint distribution of two witnesses' readings is the outer product of their reading support vectors a and b,
+    and the expected joint distribution is the outer product of the readings' sampling probabilities p with themselves,
+    so the Kullback-Leibler divergence of the observed distribution from the expected one decomposes as sum(b) * KL(a || p) + sum(a) * KL(b || p).
+    The contributions of all pairs of witnesses are therefore the sums of two matrix products of per-witness divergences and support totals.
+
+    Args:
+        supports: A two-dimensional float NumPy array with a row for each witness and a column for each reading in the block,
+            whose entries in each variation unit sum to 1 (or 0, if the witness contributes nothing there).
+        unit_offsets: An int NumPy array of the column offsets of the variation units in the block, ending with the number of columns.
+        sampling_probabilities: A float NumPy array of the sampling probability of each reading in the block.
+        other_supports: An optional second array of normalized reading support for the same readings, whose witnesses are paired with those of the first.
+            If it is not specified, then the witnesses of the first array are paired with each other.
+
+    Returns:
+        A float NumPy array with a row for each witness in the first array and a column for each witness in the second.
+    """
+    # Witnesses whose support in a unit sums to 0 (because they are lacunose there) contribute nothing to it:
+    row_divergences, row_totals = get_divergences(supports, unit_offsets, sampling_probabilities)
+    if other_supports is None:
+        matrix = row_divergences @ row_totals.T
+        return matrix + matrix.T
+    col_divergences, col_totals = get_divergences(other_supports, unit_offsets, sampling_probabilities)
+    return row_divergences @ col_totals.T + row_totals @ col_divergences.T
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+import numpy as np  # for bit packing and population counts
+
+from .agreements import get_unit_overlaps
+
+"""
+Table of the number of set bits in each byte value, for counting set bits with versions of NumPy that do not have np.bitwise_count
+"""
+popcount_table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def pack_bits(mask: np.ndarray):
+    """Packs the rows of a two-dimensional boolean array into rows of 64-bit words.
+
+    Args:
+        mask: A two-dimensional boolean NumPy array.
+
+    Returns:
+        A two-dimensional uint64 NumPy array with the same number of rows as the input and enough words in each row to hold its bits.
+    """
+    nrows, nbits = mask.shape
+    nwords = (nbits + 63) // 64
+    packed = np.zeros((nrows, nwords * 8), dtype=np.uint8)
+    packed[:, : (nbits + 7) // 8] = np.packbits(mask, axis=1, bitorder="little")
+    return packed.view(np.uint64)
+
+
+def pack_bits_into(packed: np.ndarray, mask: np.ndarray, bit_offset: int):
+    """Packs the rows of a two-dimensional boolean array into the rows of an array of bytes, starting at the given bit offset,
+    so that a bitset can be assembled from the column blocks of a larger mask.
+
+    Args:
+        packed: A two-dimensional uint8 NumPy array with the same number of rows as the mask, whose bits are set in place.
+        mask: A two-dimensional boolean NumPy array.
+        bit_offset: The index of the bit in each row of the packed array at which the first column of the mask starts.
+    """
+    shift = bit_offset % 8
+    padded = np.zeros((mask.shape[0], shift + mask.shape[1]), dtype=bool)
+    padded[:, shift:] = mask
+    packed_mask = np.packbits(padded, axis=1, bitorder="little")
+    start = bit_offset // 8
+    packed[:, start : start + packed_mask.shape[1]] |= packed_mask
+    return
+
+
+def popcount(words: np.ndarray):
+    """Counts the set bits in each row of an array of 64-bit words.
+
+    Args:
+        words: A uint64 NumPy array.
+
+    Returns:
+        An int NumPy array of the total number of set bits along the last axis of the input.
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=int)
+    # Otherwise, look up the bit counts of the individual bytes of the words:
+    return popcount_table[np.ascontiguousarray(words).view(np.uint8)].sum(axis=-1, dtype=int)
+
+
+def pairwise_popcount(words: np.ndarray, chunk_size: int = 1 << 24):
+    """Counts the set bits shared by every pair of rows in an array of 64-bit words.
+
+    Args:
+        words: A two-dimensional uint64 NumPy array.
+        chunk_size: An optional maximum number of words to combine at a time.
+            The rows are processed in tiles, so that the bitwise AND of each tile of rows with the rows after it fits within this size.
+
+    Returns:
+        A square int NumPy array whose entry (i, j) is the number of bits set in both row i and row j of the input.
+    """
+    nrows, nwords = words.shape
+    counts = np.zeros((nrows, nrows), dtype=int)
+    rows_per_tile = max(1, chunk_size // max(nrows * nwords, 1))
+    # The counts are symmetric, so we only have to calculate each tile of rows from its first row onward:
+    for start in range(0, nrows, rows_per_tile):
+        end = min(start + rows_per_tile, nrows)
+        tile_counts = popcount(words[start:end, np.newaxis, :] & words[np.newaxis, start:, :])
+        counts[start:end, start:] = tile_counts
+        counts[start:, start:end] = tile_counts.T
+    return counts
+
+
+class ReadingBitsets:
+    """Class for a packed representation of the reading support of a collation's witnesses,
+    in which each witness's unambiguous readings and extant variation units are stored as bits in 64-bit words.
+
+    The agreements, disagreements, and shared extant variation units of every pair of witnesses
+    can then be counted with a bitwise AND and a population count over whole words.
+    Where a witness supports more than one reading in a variation unit, the disagreement counts are corrected with that unit's dense reading support,
+    so this representation is most efficient (but still exact) when ambiguous readings are rare.
+
+    Attributes:
+        unambiguous: A uint64 NumPy array with a row for each witness, whose bits indicate the reading columns that the witness supports unambiguously.
+        extant: A uint64 NumPy array with a row for each witness, whose bits indicate the variation units at which the witness is extant.
+        ambiguous_supports: A list of (unit extant mask, unit ambiguity mask, unit reading support mask) tuples of boolean NumPy arrays
+            for the variation units at which any witness supports more than one reading.
+    """
+
+    __slots__ = ["unambiguous", "extant", "ambiguous_supports"]
+
+    def __init__(
+        self,
+        reading_support: np.ndarray,
+        reading_offsets: np.ndarray,
+        extant_mask: np.ndarray,
+        unit_inds=None,
+        chunk_size: int = 1 << 24,
+    ):
+        """Constructs a new ReadingBitsets instance from a reading support array.
+
+        Args:
+            reading_support: A NumPy array with a row for each witness and a column for each substantive reading of each variation unit.
+            reading_offsets: A NumPy array of the column offsets of the variation units in the reading support array.
+            extant_mask: A boolean NumPy array with a row for each witness and a column for each variation unit.
+            unit_inds: An optional list of the indices of the variation units to include. If it is not specified, then all variation units are included.
+            chunk_size: An optional maximum number of entries of the reading support array to read at a time.
+                The reading support array is processed in blocks of variation units, so that it can be a memory-mapped array larger than memory.
+        """
+        if unit_inds is None:
+            unit_inds = range(len(reading_offsets) - 1)
+        unit_inds = np.asarray(unit_inds, dtype=int)
+        starts = reading_offsets[unit_inds]
+        widths = reading_offsets[unit_inds + 1] - starts
+        unit_offsets = np.concatenate([[0], np.cumsum(widths)]).astype(int)
+        # Gather the columns of the included variation units:
+        cols = np.arange(unit_offsets[-1]) + np.repeat(starts - unit_offsets[:-1], widths)
+        unit_extant = extant_mask[:, unit_inds]
+        nrows = reading_support.shape[0]
+        unambiguous = np.zeros((nrows, (len(cols) + 63) // 64 * 8), dtype=np.uint8)
+        self.extant = pack_bits(unit_extant)
+        self.ambiguous_supports = []
+        # Then process the variation units in blocks, so that only a block of the reading support array is read into memory at a time:
+        units_per_chunk = max(1, chunk_size // max(nrows * int(widths.max(initial=1)), 1))
+        for chunk_start in range(0, len(unit_inds), units_per_chunk):
+            chunk_end = min(chunk_start + units_per_chunk, len(unit_inds))
+            chunk_offsets = unit_offsets[chunk_start : chunk_end + 1] - unit_offsets[chunk_start]
+            # Mark the readings that each witness supports in this block:
+            supported = reading_support[:, cols[unit_offsets[chunk_start] : unit_offsets[chunk_end]]] > 0
+            # Count the readings each witness supports in each unit, using cumulative sums so that units without readings are counted correctly:
+            cumulative_counts = np.zeros((nrows, supported.shape[1] + 1), dtype=int)
+            np.cumsum(supported, axis=1, out=cumulative_counts[:, 1:])
+            nsupported = cumulative_counts[:, chunk_offsets[1:]] - cumulative_counts[:, chunk_offsets[:-1]]
+            # A reading is supported unambiguously if it is the only one the witness supports in its unit:
+            col_units = np.repeat(np.arange(chunk_end - chunk_start), widths[chunk_start:chunk_end])
+            pack_bits_into(unambiguous, supported & (nsupported == 1)[:, col_units], unit_offsets[chunk_start])
+            # Keep (copies of) the dense support of only the units with ambiguous readings, so that the rest of the block can be freed:
+            ambiguous = nsupported > 1
+            for k in np.flatnonzero(ambiguous.any(axis=0)):
+                self.ambiguous_supports.append(
+                    (
+                        unit_extant[:, chunk_start + k],
+                        ambiguous[:, k].copy(),
+                        supported[:, chunk_offsets[k] : chunk_offsets[k + 1]].copy(),
+                    )
+                )
+        self.unambiguous = unambiguous.view(np.uint64)
+
+    def shared_extant_counts(self):
+        """Returns a matrix of the number of variation units at which both witnesses in each pair are extant.
+
+        Returns:
+            A square int NumPy array with a row and column for each witness.
+        """
+        return pairwise_popcount(self.extant)
+
+    def agreement_counts(self):
+        """Returns a matrix of the number of variation units at which both witnesses in each pair unambiguously support the same reading.
+
+        Returns:
+            A square int NumPy array with a row and column for each witness.
+        """
+        return pairwise_popcount(self.unambiguous)
+
+    def disagreement_counts(self):
+        """Returns a matrix of the number of variation units at which both witnesses in each pair are extant but have no supported readings in common.
+
+        Returns:
+            A square int NumPy array with a row and column for each witness.
+        """
+        # Two extant witnesses have overlapping readings in a unit if they agree unambiguously there
+        # or if either of them is ambiguous there and they support a common reading:
+        overlaps = self.agreement_counts()
+        for unit_extant, unit_ambiguous, unit_supported in self.ambiguous_supports:
+            # Only the rows and columns of the witnesses that are ambiguous (and extant) in the unit need to be corrected:
+            rows = np.flatnonzero(unit_ambiguous & unit_extant)
+            row_overlaps = get_unit_overlaps(unit_supported[rows], unit_supported, unit_extant[rows], unit_extant)
+            # Add the overlaps to the rows and columns of the ambiguous witnesses, without counting pairs of ambiguous witnesses twice:
+            overlaps[rows, :] += row_overlaps
+            overlaps[:, rows] += row_overlaps.T
+            overlaps[np.ix_(rows, rows)] -= row_overlaps[:, rows]
+        return self.shared_extant_counts() - overlaps
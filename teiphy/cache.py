@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+from typing import List, Union
+import os
+from pathlib import Path
+import hashlib  # for computing cache keys
+import pickle  # for serializing collations
+import tempfile  # for writing cache files atomically
+import time  # to time calculations for users
+
+from . import __version__
+from .collation import Collation
+
+"""
+Version of the cache file format; this should be incremented whenever the internal state of a Collation changes,
+so that cache files written by older versions are not loaded (cache keys also include the installed version of teiphy,
+so cache files are never shared between releases)
+"""
+cache_format_version = 1
+
+
+class CollationCache:
+    """Class for storing fully constructed Collation instances on disk, so that repeated conversions of the same input can skip parsing.
+
+    Each cached Collation is stored in its own file, named after a digest of the installed teiphy version, the input collation, the dates file, and the Collation constructor options.
+    When the total size of the cache files exceeds the maximum size, the least recently used files are deleted.
+
+    Cache files are loaded with pickle, which can run arbitrary code, so the cache directory must be a trusted location that only the user can write to.
+
+    Attributes:
+        cache_dir: The directory in which cache files are stored.
+        max_size: The maximum total size of the cache files in bytes.
+        verbose: A boolean flag indicating whether or not to print timing and debugging details for the user.
+    """
+
+    def __init__(self, cache_dir: Union[Path, str], max_size: int = 1 << 30, verbose: bool = False):
+        """Constructs a new CollationCache in the given directory, creating the directory if it does not exist.
+
+        Args:
+            cache_dir: The directory in which cache files are stored.
+            max_size: An optional maximum total size of the cache files in bytes (1 GiB by default).
+            verbose: An optional flag indicating whether or not to print timing and debugging details for the user.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.verbose = verbose
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_key(
+        self,
+        input_addr: Union[Path, str],
+        manuscript_suffixes: List[str] = [],
+        trivial_reading_types: List[str] = [],
+        missing_reading_types: List[str] = [],
+        fill_corrector_lacunae: bool = False,
+        fragmentary_threshold: float = None,
+        fill_correctors_threshold: float = None,
+        dates_file: Union[Path, str] = None,
+    ):
+        """Computes the cache key for a Collation constructed from the given input and options.
+
+        Args:
+            input_addr: The path to the TEI XML collation file.
+            manuscript_suffixes: An optional list of suffixes used to distinguish manuscript subwitnesses from their base witnesses.
+            trivial_reading_types: An optional set of reading types whose readings should be collapsed under the previous substantive reading.
+            missing_reading_types: An optional set of reading types whose readings should be treated as missing data.
+            fill_corrector_lacunae: An optional flag indicating whether or not to fill "lacunae" in witnesses with type "corrector".
+            fragmentary_threshold: An optional float representing the proportion such that all witnesses extant at fewer than this proportion of variation units are filtered out of the collation.
+            fill_correctors_threshold: An optional float representing the proportion such that all correctors extant at fewer than this proportion of variation units are not filled in.
+            dates_file: An optional path to a CSV file containing witness IDs, minimum dates, and maximum dates.
+
+        Returns:
+            A hexadecimal digest string.
+        """
+        digest = hashlib.sha256()
+        digest.update(b"teiphy collation cache %d\0" % cache_format_version)
+        digest.update(__version__.encode("utf-8") + b"\0")
+        # Add the contents of the input file and the dates file (if there is one):
+        for file_addr in [input_addr, dates_file]:
+            if file_addr is None:
+                digest.update(b"\0")
+                continue
+            with open(file_addr, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+        # Then add the constructor options (sorting the ones that are treated as sets):
+        options = [
+            list(manuscript_suffixes),
+            sorted(set(trivial_reading_types)),
+            sorted(set(missing_reading_types)),
+            bool(fill_corrector_lacunae),
+            fragmentary_threshold,
+            fill_correctors_threshold,
+        ]
+        digest.update(repr(options).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_path(self, key: str):
+        """Returns the path of the cache file for the given key.
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            The path of the cache file.
+        """
+        return self.cache_dir / ("%s.pickle" % key)
+
+    def load(self, key: str):
+        """Loads the Collation cached under the given key, if there is one.
+
+        Args:
+            key: A cache key.
+
+        Returns:
+            The cached Collation, or None if no (readable) cache file exists for this key.
+        """
+        cache_path = self.get_path(key)
+        if not cache_path.exists():
+            if self.verbose:
+                print("No cached collation found for key %s." % key)
+            return None
+        t0 = time.time()
+        try:
+            with open(cache_path, "rb") as f:
+                collation = pickle.load(f)
+        except Exception as err:
+            # If the cache file is corrupted or was written by an incompatible version, then discard it:
+            if self.verbose:
+                print("Discarding unreadable cache file %s: %s" % (str(cache_path), err))
+            cache_path.unlink(missing_ok=True)
+            return None
+        if not isinstance(collation, Collation):
+            cache_path.unlink(missing_ok=True)
+            return None
+        # Mark this file as recently used:
+        os.utime(cache_path)
+        t1 = time.time()
+        if self.verbose:
+            print("Loaded cached collation from %s in %0.4fs." % (str(cache_path), t1 - t0))
+        return collation
+
+    def store(self, key: str, collation: Collation):
+        """Stores the given Collation under the given key, and then evicts the least recently used cache files if the cache is too large.
+
+        Args:
+            key: A cache key.
+            collation: The Collation to store.
+        """
+        t0 = time.time()
+        cache_path = self.get_path(key)
+        # Write to a temporary file first, so that a concurrent run never sees a partially written cache file:
+        fd, tmp_addr = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(collation, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_addr, cache_path)
+        except BaseException:
+            Path(tmp_addr).unlink(missing_ok=True)
+            raise
+        t1 = time.time()
+        if self.verbose:
+            print("Stored collation in cache file %s in %0.4fs." % (str(cache_path), t1 - t0))
+        self.evict(keep=cache_path)
+        return
+
+    def evict(self, keep: Path = None):
+        """Deletes the least recently used cache files until the total size of the cache is at most its maximum size.
+
+        Args:
+            keep: An optional path to a cache file that should not be deleted (e.g., the one that was just written).
+        """
+        entries = []
+        total_size = 0
+        for cache_path in self.cache_dir.glob("*.pickle"):
+            try:
+                stat = cache_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, cache_path))
+            total_size += stat.st_size
+        # Delete files in order from least to most recently used:
+        entries.sort(key=lambda entry: entry[0])
+        for mtime, size, cache_path in entries:
+            if total_size <= self.max_size:
+                break
+            if keep is not None and cache_path == keep:
+                continue
+            cache_path.unlink(missing_ok=True)
+            total_size -= size
+            if self.verbose:
+                print("Evicted cache file %s." % str(cache_path))
+        return
@@ -3,10 +3,15 @@
 from enum import Enum
 from typing import List, Union
 import os
+import copy  # for deriving reconfigured collations
 from pathlib import Path
 from datetime import datetime  # for calculating the current year (for dating and tree height purposes)
 import math  # for special functions
 import time  # to time calculations for users
+import tempfile  # for scratch files backing memory-mapped arrays
+import mmap  # for recognizing arrays that own their memory maps
+from concurrent.futures import ProcessPoolExecutor  # for parsing variation units in parallel
+from collections import deque  # for queueing chunks of variation units being parsed in parallel
 import string  # for easy retrieval of character ranges
 from lxml import etree as et  # for reading TEI XML inputs
 import numpy as np  # for random number sampling and collation matrix outputs
@@ -18,13 +23,89 @@ from tqdm import tqdm  # for progress bars
 from .common import xml_ns, tei_ns
 from .format import Format
 from .witness import Witness
+from .reading import Reading
 from .variation_unit import VariationUnit
+from .siglum_index import SiglumIndex
+from .siglum_resolver import SiglumResolver
+from .symbol_table import SymbolTable
+from .reading_support import ReadingSupportView
+from .bitsets import ReadingBitsets
+from .agreements import (
+    get_unit_columns,
+    get_unit_sums,
+    shared_extant_counts,
+    information_weighted_agreements,
+    mutual_information,
+    AgreementCounts,
+)
 
 
 class ParsingException(Exception):
     pass
 
 
+def parse_app_chunk(app_strs: List[bytes], verbose: bool = False):
+    """Given a list of serialized app elements, parses them into VariationUnit instances.
+    This function is defined at the module level so that it can be run in a worker process.
+
+    Args:
+        app_strs: A list of byte strings, each containing a serialized app element.
+        verbose: An optional flag indicating whether or not to print status updates.
+
+    Returns:
+        A list of VariationUnit instances for the given app elements, in the same order.
+    """
+    parser = et.XMLParser(remove_comments=True)
+    return [VariationUnit(et.fromstring(app_str, parser), verbose) for app_str in app_strs]
+
+
+def parse_collation_file(file_addr: Union[Path, str], manuscript_suffixes: List[str] = [], verbose: bool = False):
+    """Given the address of one of several TEI XML collation files, streams it into a partial Collation
+    containing only the data parsed directly from the file (i.e., its origin date range, witness list, variation units, index of witness sigla,
+    and weight, intrinsic odds, and transcriptional change categories).
+    This function is defined at the module level so that it can be run in a worker process.
+
+    Args:
+        file_addr: A string representing the path to a TEI XML collation file.
+        manuscript_suffixes: An optional list of suffixes used to distinguish manuscript subwitnesses from their base witnesses.
+        verbose: An optional flag indicating whether or not to print timing and debugging details for the user.
+
+    Returns:
+        A partial Collation instance for the file. If the file does not contain a listWit element, then its witness list will be empty.
+    """
+    part = Collation.__new__(Collation)
+    part.manuscript_suffixes = manuscript_suffixes
+    part.verbose = verbose
+    part.workers = 1
+    part.variation_units = []
+    part.set_witnesses([])
+    xml = part.iterparse(file_addr, require_list_wit=False)
+    part.parse_weights(xml)
+    part.parse_intrinsic_odds(xml)
+    part.parse_transcriptional_rates(xml)
+    return part
+
+
+def index_slice(inds: np.ndarray):
+    """Returns a slice equivalent to the given indices, if they are evenly spaced in increasing order.
+    NumPy arrays indexed with a slice return a view of the same data, whereas arrays indexed with a list of indices return a copy.
+
+    Args:
+        inds: A one-dimensional int NumPy array of indices.
+
+    Returns:
+        A slice selecting the same indices, or None if there is no such slice.
+    """
+    if len(inds) == 0:
+        return slice(0, 0)
+    if len(inds) == 1:
+        return slice(int(inds[0]), int(inds[0]) + 1)
+    steps = np.diff(inds)
+    if steps[0] <= 0 or not np.all(steps == steps[0]):
+        return None
+    return slice(int(inds[0]), int(inds[-1]) + 1, int(steps[0]))
+
+
 class WitnessDateException(Exception):
     pass
 
@@ -55,6 +136,7 @@ class TableType(str, Enum):
     mean_mi = "mean-mi"
     nexus = "nexus"
     long = "long"
+    coverage = "coverage"
 
 
 class SplitMissingType(str, Enum):
@@ -79,15 +161,63 @@ class Collation:
         fill_corrector_lacunae: A boolean flag indicating whether or not to fill "lacunae" in witnesses with type "corrector".
         fragmentary_threshold: A float representing the proportion such that all witnesses extant at fewer than this proportion of variation units are filtered out of the collation.
         fill_correctors_threshold: A float representing the proportion such that all correctors extant at fewer than this proportion of variation units are not filled in.
+        workers: The number of worker processes to use for parsing variation units.
+        packed: A boolean flag indicating whether or not to count agreements, disagreements, and shared extant variation units between witnesses
+            over packed bitsets of their readings (see the get_reading_bitsets method).
+        scratch_dir: The directory in which to store the reading_support array as a memory-mapped file, or None if it is stored in memory.
+        memory_budget: The approximate number of bytes of memory to use at a time for witness-to-witness matrix outputs, or None if they are computed all at once
+            (see the get_witness_matrix method).
+        support_dtype: The name of the NumPy data type in which to store the reading_support array, or None if the most compact exact type is chosen automatically.
         witnesses: A list of Witness instances contained in this Collation.
-        witness_index_by_id: A dictionary mapping base witness ID strings to their int indices in the witnesses list.
+        witness_symbols: A SymbolTable assigning each witness the int index of its row in the reading support array.
+        witness_index_by_id: A dictionary mapping base witness ID strings to their int indices in the witnesses list (i.e., the index of the witness_symbols table).
+        siglum_index: A SiglumIndex of the distinct witness sigla in the collation, the variation units in which they occur, and their base witnesses.
+        siglum_resolver: A SiglumResolver that resolves witness sigla to their base sigla and memoizes the results (see the get_base_wit method).
         variation_units: A list of VariationUnit instances contained in this Collation.
-        readings_by_witness: A dictionary mapping base witness ID strings to lists of reading support coefficients for all units (with at least two substantive readings).
-        substantive_variation_unit_ids: A list of ID strings for variation units with two or more substantive readings.
-        substantive_variation_unit_reading_tuples: A list of (variation unit ID, reading ID) tuples for substantive readings.
+        reading_support: A NumPy array with a row for each witness in the witnesses list and a column for each substantive reading of each variation unit,
+            containing the witness's support coefficient for that reading.
+            Unless the support_dtype option is specified, it is stored as uint8 if all coefficients are whole numbers,
+            as float32 if they can all be represented exactly in single precision, and as float64 otherwise.
+        reading_offsets: A NumPy array of the column offsets of the variation units in the reading_support array;
+            the columns of the variation unit at index j span from reading_offsets[j] up to (but not including) reading_offsets[j + 1].
+        extant_mask: A boolean NumPy array with a row for each witness and a column for each variation unit, indicating whether the witness supports any reading in that unit.
+        readings_by_witness: A read-only dictionary-like view mapping base witness ID strings to lists of reading support coefficients for all units,
+            materialized from the reading_support array.
+        variation_unit_symbols: A SymbolTable assigning each variation unit with substantive readings the int index of its column in the extant_mask array.
+        variation_unit_ids: A list of ID strings for the variation units in the variation_unit_symbols table, in order.
+        reading_symbols: A SymbolTable interning the distinct ID strings of the substantive readings of all variation units.
+        reading_symbol_ids: An int NumPy array with an entry for each column of the reading_support array,
+            containing the ID of the corresponding substantive reading's ID string in the reading_symbols table.
+        substantive_readings_by_variation_unit_id: A dictionary mapping variation unit ID strings to lists of the ID strings of their substantive readings,
+            materialized from the reading_symbol_ids array on first use.
+        substantive_variation_unit_reading_tuples: A list of (variation unit ID, reading ID) tuples for substantive readings,
+            materialized from the reading_symbol_ids array on first use.
+        reading_support_buffer: An array whose leading rows hold the reading_support array, with spare rows for witnesses added with add_witness (or None).
+        extant_mask_buffer: An array whose leading rows hold the extant_mask array, with spare rows for witnesses added with add_witness (or None).
+        rows_shared: A boolean flag indicating whether the reading_support and extant_mask arrays may share data with a view of this Collation,
+            in which case their rows are copied rather than shifted in place when a witness is removed.
+        derived_views: A dictionary mapping keys to views derived from the reading support structures (e.g., unit masks and the substantive readings of each unit),
+            which are computed once on first use and discarded whenever the reading support structures change (see the invalidate_derived_views method).
         verbose: A boolean flag indicating whether or not to print timing and debugging details for the user.
     """
 
+    # The number of app elements to send to each worker process at a time when streaming a collation in parallel:
+    stream_chunk_size = 256
+    # The maximum number of chunks of app elements per worker process that can be waiting to be parsed (or collected) at a time when streaming a collation in parallel:
+    stream_chunks_per_worker = 2
+    # The maximum number of entries of the reading support array to copy or read into memory at a time:
+    array_chunk_size = 1 << 24
+    # The names of the derived views that depend on the witness list (or on the readings' witness sigla),
+    # which must be discarded when witnesses are added or removed:
+    witness_dependent_views = [
+        "witness_rows_by_siglum",
+        "substantive_readings",
+        "reading_bitsets",
+        "agreement_counts",
+        "ext_matrix",
+        "missing_reading_support",
+    ]
+
     def __init__(
         self,
         xml: et.ElementTree,
@@ -99,6 +229,11 @@ class Collation:
         fill_correctors_threshold: float = None,
         dates_file: Union[Path, str] = None,
         verbose: bool = False,
+        workers: int = 1,
+        packed: bool = False,
+        scratch_dir: Union[Path, str] = None,
+        support_dtype: str = None,
+        memory_budget: int = None,
     ):
         """Constructs a new Collation instance with the given settings.
 
@@ -112,6 +247,113 @@ class Collation:
             fill_correctors_threshold: An optional float representing the proportion such that all correctors extant at fewer than this proportion of variation units are not filled in.
             dates_file: An optional path to a CSV file containing witness IDs, minimum dates, and maximum dates. If specified, then for all witnesses in the first column, any existing date ranges for them in the TEI XML collation will be ignored.
             verbose: An optional flag indicating whether or not to print timing and debugging details for the user.
+            workers: An optional number of worker processes to use for parsing variation units. If it is greater than 1, then the app elements are split into chunks that are parsed in parallel.
+            packed: An optional flag indicating whether or not to count agreements, disagreements, and shared extant variation units between witnesses
+                over packed bitsets of their readings, rather than with matrix products of their reading support.
+                This uses less memory for large collations with few ambiguous readings.
+            scratch_dir: An optional directory in which to store the reading support array as a memory-mapped file, for collations too large to fit in memory.
+                If it is specified, then the array is written to and read from disk in chunks.
+                This is independent of the packed option: distance and similarity matrices are computed over packed bitsets only if that option is also set.
+            support_dtype: An optional name of a NumPy data type in which to store the reading support array (e.g., "float64").
+                If it is not specified, then the most compact type that represents all of the reading support coefficients exactly is chosen after parsing.
+            memory_budget: An optional approximate number of bytes of memory to use at a time for witness-to-witness matrix outputs, for collations with too many witnesses
+                for their matrices to be computed all at once. If it is specified, then these matrices are computed in tiles of witness pairs that fit within it,
+                and if the scratch_dir option is also specified, then the finished tiles are written to a memory-mapped file there.
+        """
+        self.set_options(
+            manuscript_suffixes,
+            trivial_reading_types,
+            missing_reading_types,
+            fill_corrector_lacunae,
+            fragmentary_threshold,
+            fill_correctors_threshold,
+            verbose,
+            workers,
+            packed,
+            scratch_dir,
+            support_dtype,
+            memory_budget,
+        )
+        # Now parse the XML tree to populate these data structures:
+        if self.verbose:
+            print("Initializing collation...")
+        t0 = time.time()
+        self.parse_origin_date_range(xml)
+        self.parse_sigla(xml)
+        self.parse_list_wit(xml)
+        self.populate(xml, dates_file, t0)
+
+    @classmethod
+    def from_path(cls, file_addr: Union[Path, str], stream: bool = False, **kwargs):
+        """Constructs a new Collation instance from the TEI XML collation file at the given address.
+
+        Args:
+            file_addr: A string representing the path to a TEI XML collation file.
+            stream: An optional flag indicating whether to parse the file incrementally.
+                If this flag is set, then each app element is discarded as soon as its VariationUnit has been constructed,
+                so that the memory needed to parse the collation grows with the largest app element rather than with the whole document.
+            **kwargs: Keyword arguments for the Collation constructor.
+
+        Returns:
+            A Collation instance for the collation in the given file.
+        """
+        if not stream:
+            parser = et.XMLParser(remove_comments=True)
+            xml = et.parse(file_addr, parser=parser)
+            return cls(xml, **kwargs)
+        dates_file = kwargs.pop("dates_file", None)
+        collation = cls.__new__(cls)
+        collation.set_options(**kwargs)
+        if collation.verbose:
+            print("Initializing collation...")
+        t0 = time.time()
+        # Stream the variation units from the file, keeping only the parts of the tree outside of app elements:
+        xml = collation.iterparse(file_addr)
+        collation.populate(xml, dates_file, t0, parse_apps=False)
+        return collation
+
+    @classmethod
+    def from_paths(cls, file_addrs: List[Union[Path, str]], merge_list_wits: bool = False, **kwargs):
+        """Constructs a new Collation instance from several TEI XML collation files (e.g., one for each chapter of a book).
+        The variation units of the files are concatenated in the given order.
+        Each file is streamed (see the from_path method), and if the workers option is greater than 1, then the files are parsed in parallel.
+
+        Args:
+            file_addrs: A list of strings representing the paths to TEI XML collation files.
+            merge_list_wits: An optional flag indicating how to handle differences between the listWit elements of the files.
+                If it is set, then the witness lists are merged; otherwise, a ParsingException is raised if they differ.
+            **kwargs: Keyword arguments for the Collation constructor.
+
+        Returns:
+            A Collation instance for all of the collation files.
+        """
+        dates_file = kwargs.pop("dates_file", None)
+        collation = cls.__new__(cls)
+        collation.set_options(**kwargs)
+        if collation.verbose:
+            print("Initializing collation...")
+        t0 = time.time()
+        collation.parse_files(list(file_addrs), merge_list_wits)
+        collation.populate(None, dates_file, t0, parse_categories=False, parse_apps=False)
+        return collation
+
+    def set_options(
+        self,
+        manuscript_suffixes: List[str] = [],
+        trivial_reading_types: List[str] = [],
+        missing_reading_types: List[str] = [],
+        fill_corrector_lacunae: bool = False,
+        fragmentary_threshold: float = None,
+        fill_correctors_threshold: float = None,
+        verbose: bool = False,
+        workers: int = 1,
+        packed: bool = False,
+        scratch_dir: Union[Path, str] = None,
+        support_dtype: str = None,
+        memory_budget: int = None,
+    ):
+        """Sets the options of this Collation and initializes its (empty) data structures.
+        The arguments are the same as those of the Collation constructor.
         """
         self.manuscript_suffixes = manuscript_suffixes
         self.trivial_reading_types = set(trivial_reading_types)
@@ -120,13 +362,29 @@ class Collation:
         self.fragmentary_threshold = fragmentary_threshold
         self.fill_correctors_threshold = fill_correctors_threshold
         self.verbose = verbose
+        self.workers = workers if workers is not None else 1
+        self.packed = packed
+        self.scratch_dir = scratch_dir
+        self.support_dtype = support_dtype
+        self.memory_budget = memory_budget
         self.witnesses = []
-        self.witness_index_by_id = {}
+        self.unfiltered_witnesses = []
+        self.witness_symbols = SymbolTable()
+        self.witness_index_by_id = self.witness_symbols.index_by_symbol
+        self.siglum_index = SiglumIndex()
+        self.siglum_resolver = SiglumResolver(self.manuscript_suffixes, [])
         self.variation_units = []
-        self.readings_by_witness = {}
-        self.variation_unit_ids = []
-        self.substantive_variation_unit_reading_tuples = []
-        self.substantive_readings_by_variation_unit_id = {}
+        self.reading_support = np.zeros((0, 0), dtype=float)
+        self.reading_offsets = np.zeros(1, dtype=int)
+        self.extant_mask = np.zeros((0, 0), dtype=bool)
+        self.reading_support_buffer = None
+        self.extant_mask_buffer = None
+        self.rows_shared = False
+        self.derived_views = {}
+        self.variation_unit_symbols = SymbolTable()
+        self.variation_unit_ids = self.variation_unit_symbols.symbols
+        self.reading_symbols = SymbolTable()
+        self.reading_symbol_ids = np.zeros(0, dtype=int)
         self.weight_categories = []
         self.weights_by_id = {}
         self.intrinsic_categories = []
@@ -134,12 +392,29 @@ class Collation:
         self.transcriptional_categories = []
         self.transcriptional_rates_by_id = {}
         self.origin_date_range = []
-        # Now parse the XML tree to populate these data structures:
-        if self.verbose:
-            print("Initializing collation...")
-        t0 = time.time()
-        self.parse_origin_date_range(xml)
-        self.parse_list_wit(xml)
+        return
+
+    def populate(
+        self,
+        xml: et.ElementTree,
+        dates_file: Union[Path, str] = None,
+        t0: float = None,
+        parse_categories: bool = True,
+        parse_apps: bool = True,
+    ):
+        """Once the origin date bounds, witness list, and index of witness sigla of this Collation have been parsed,
+        validates them, parses the rest of the given XML tree, and populates the reading support structures.
+
+        Args:
+            xml: An lxml.etree.ElementTree representing an XML tree rooted at a TEI element (or, if its variation units were streamed, the rest of the tree outside of its app elements).
+                If the categories and variation units have already been parsed from several collation files, then this may be None.
+            dates_file: An optional path to a CSV file containing witness IDs, minimum dates, and maximum dates.
+            t0: An optional time at which the initialization of this Collation started, for reporting the total time to the user.
+            parse_categories: An optional flag indicating whether or not to parse the weight, intrinsic odds, and transcriptional change categories from the XML tree.
+            parse_apps: An optional flag indicating whether or not to parse the variation units from the app elements of the XML tree.
+        """
+        if t0 is None:
+            t0 = time.time()
         self.validate_wits(xml)
         # If a dates file was specified, then update the witness date ranges manually:
         if dates_file is not None:
@@ -150,18 +425,602 @@ class Collation:
             self.update_origin_date_range_from_witness_date_ranges()
         else:
             self.update_witness_date_ranges_from_origin_date_range()
-        self.parse_weights(xml)
-        self.parse_intrinsic_odds(xml)
-        self.parse_transcriptional_rates(xml)
-        self.parse_apps(xml)
+        if parse_categories:
+            self.parse_weights(xml)
+            self.parse_intrinsic_odds(xml)
+            self.parse_transcriptional_rates(xml)
+        if parse_apps:
+            self.parse_apps(xml)
         self.validate_intrinsic_relations()
+        # Keep the full witness list, in case the collation is reconfigured with a different fragmentary threshold later:
+        self.unfiltered_witnesses = self.witnesses
         self.parse_readings_by_witness()
         # If a threshold of readings for fragmentary witnesses is specified, then filter the witness list using the dictionary mapping witness IDs to readings:
         if self.fragmentary_threshold is not None:
             self.filter_fragmentary_witnesses(xml)
         t1 = time.time()
         if self.verbose:
+            print(
+                "Resolved witness sigla to base sigla with %d memo hits and %d misses."
+                % (self.siglum_resolver.hits, self.siglum_resolver.misses)
+            )
             print("Total time to initialize collation: %0.4fs." % (t1 - t0))
+        return
+
+    def parse_files(self, file_addrs: List[Union[Path, str]], merge_list_wits: bool = False):
+        """Given the addresses of several TEI XML collation files, streams each of them (in parallel, if this Collation has more than one worker),
+        and populates this Collation's origin date bounds, list of witnesses, list of variation units, index of witness sigla,
+        and weight, intrinsic odds, and transcriptional change categories from their combined contents.
+        The witness lists of all files that contain a listWit element must be the same, unless they are to be merged.
+
+        Args:
+            file_addrs: A list of strings representing the paths to TEI XML collation files.
+            merge_list_wits: An optional flag indicating whether to merge the witness lists of the files.
+                If it is set, then the witness list consists of all distinct witnesses in the files, in order of first appearance;
+                otherwise, a ParsingException is raised if the witness lists differ.
+        """
+        if self.verbose:
+            print("Parsing %d collation files..." % len(file_addrs))
+        t0 = time.time()
+        # Each file is streamed separately, so no file's XML tree is held in memory alongside another's:
+        n = len(file_addrs)
+        if self.workers > 1 and n > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, n)) as executor:
+                parts = list(
+                    executor.map(parse_collation_file, file_addrs, [self.manuscript_suffixes] * n, [self.verbose] * n)
+                )
+        else:
+            parts = [
+                parse_collation_file(file_addr, self.manuscript_suffixes, self.verbose) for file_addr in file_addrs
+            ]
+        # Combine the parts in the given order:
+        self.origin_date_range = [None, None]
+        self.variation_units = []
+        self.siglum_index = SiglumIndex()
+        self.weight_categories = []
+        self.weights_by_id = {}
+        self.intrinsic_categories = []
+        self.intrinsic_odds_by_id = {}
+        self.transcriptional_categories = []
+        self.transcriptional_rates_by_id = {}
+        witnesses = []
+        witness_by_id = {}
+        list_wit_file_addr = None
+        for file_addr, part in zip(file_addrs, parts):
+            # Use the first origin date range specified in any of the files:
+            if self.origin_date_range == [None, None]:
+                self.origin_date_range = part.origin_date_range
+            # Check this file's witness list against the ones we have seen so far:
+            if len(part.witnesses) > 0:
+                if list_wit_file_addr is None:
+                    list_wit_file_addr = file_addr
+                elif not merge_list_wits and [(wit.id, wit.type, wit.date_range) for wit in part.witnesses] != [
+                    (wit.id, wit.type, wit.date_range) for wit in witnesses
+                ]:
+                    msg = ""
+                    msg += "The listWit elements in the collation files %s and %s are not consistent.\n" % (
+                        str(list_wit_file_addr),
+                        str(file_addr),
+                    )
+                    msg += "Make sure that all collation files list the same witnesses, or merge their witness lists."
+                    raise ParsingException(msg)
+                for wit in part.witnesses:
+                    if wit.id not in witness_by_id:
+                        witness_by_id[wit.id] = wit
+                        witnesses.append(wit)
+            # Add this file's sigla to the index of sigla:
+            self.siglum_index.update(part.siglum_index)
+            self.variation_units.extend(part.variation_units)
+            # Add any categories that we have not seen yet:
+            for category in part.weight_categories:
+                if category not in self.weights_by_id:
+                    self.weight_categories.append(category)
+                    self.weights_by_id[category] = part.weights_by_id[category]
+            for category in part.intrinsic_categories:
+                if category not in self.intrinsic_odds_by_id:
+                    self.intrinsic_categories.append(category)
+                    self.intrinsic_odds_by_id[category] = part.intrinsic_odds_by_id[category]
+            for category in part.transcriptional_categories:
+                if category not in self.transcriptional_rates_by_id:
+                    self.transcriptional_categories.append(category)
+                    self.transcriptional_rates_by_id[category] = part.transcriptional_rates_by_id[category]
+        # If none of the files has a listWit element, then raise an exception listing all sigla in the files:
+        if list_wit_file_addr is None:
+            self.raise_missing_list_wit()
+        self.set_witnesses(witnesses)
+        t1 = time.time()
+        if self.verbose:
+            print(
+                "Finished parsing %d variation units and %d witnesses from %d collation files in %0.4fs."
+                % (len(self.variation_units), len(self.witnesses), n, t1 - t0)
+            )
+        return
+
+    def iterparse(self, file_addr: Union[Path, str], require_list_wit: bool = True):
+        """Given the address of a TEI XML collation file, incrementally parses it,
+        populating this Collation's origin date bounds and list of witnesses from its teiHeader element as soon as it has been read
+        and populating its list of variation units from its app elements one at a time, discarding each app element once it has been processed.
+        App elements nested in other app elements are processed (in document order) once the outermost app element containing them is complete,
+        so that the variation units are in the same order as they would be if the whole tree were parsed first.
+
+        Args:
+            file_addr: A string representing the path to a TEI XML collation file.
+            require_list_wit: An optional flag indicating whether or not to raise a ParsingException if the collation does not contain a listWit element.
+                If it is not set, then the witness list is left empty in this case.
+
+        Returns:
+            An lxml.etree.ElementTree containing everything in the collation outside of its app elements.
+        """
+        if self.verbose:
+            print("Streaming collation from %s..." % str(file_addr))
+        t0 = time.time()
+        header_tag = "{%s}teiHeader" % tei_ns
+        app_tag = "{%s}app" % tei_ns
+        header_parsed = False
+        list_wit_parsed = False
+        self.siglum_index = SiglumIndex()
+        # If we are parsing variation units in parallel, then serialized app elements are queued in chunks for the worker processes;
+        # only a bounded number of chunks are in flight at a time, and the parsed chunks are collected in document order as we go:
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        max_in_flight = self.stream_chunks_per_worker * self.workers
+        futures = deque()
+        app_strs = []
+        # The number of app elements that have been started but not finished (i.e., the depth of app elements nested in one another):
+        app_depth = 0
+        try:
+            context = et.iterparse(
+                str(file_addr), events=("start", "end"), tag=(header_tag, app_tag), remove_comments=True
+            )
+            for event, elem in context:
+                # The teiHeader precedes all app elements, so parse the origin date range and witness list from it as soon as it is complete:
+                if elem.tag == header_tag:
+                    if event == "start":
+                        continue
+                    header_parsed = True
+                    self.parse_origin_date_range(elem.getroottree())
+                    if len(elem.xpath(".//tei:listWit", namespaces={"tei": tei_ns})) > 0:
+                        self.parse_list_wit(elem.getroottree())
+                        list_wit_parsed = True
+                    continue
+                # Otherwise, this is an app element; app elements nested in it are only processed once it is complete,
+                # since their contents are also part of its variation unit:
+                if event == "start":
+                    app_depth += 1
+                    continue
+                app_depth -= 1
+                if app_depth > 0:
+                    continue
+                # Index the sigla and construct the variation units of this app element and of any app elements nested in it, in document order:
+                for app in elem.iter(app_tag):
+                    self.siglum_index.index_app(app)
+                    if executor is not None:
+                        app_strs.append(et.tostring(app, with_tail=False))
+                        if len(app_strs) == self.stream_chunk_size:
+                            # If too many chunks are in flight, then wait for the earliest one before submitting another:
+                            while len(futures) >= max_in_flight:
+                                self.variation_units.extend(futures.popleft().result())
+                            futures.append(executor.submit(parse_app_chunk, app_strs, self.verbose))
+                            app_strs = []
+                    else:
+                        vu = VariationUnit(app, self.verbose)
+                        # The readings keep their own elements until their text is needed, so drop the attributes of these elements, which are not needed for their text:
+                        for rdg in vu.readings:
+                            rdg.trim()
+                        self.variation_units.append(vu)
+                # Then discard the app element, since we will not need it again
+                # (the elements of the readings are unlinked from the tree, but they are kept until the readings release them):
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    parent.remove(elem)
+            # Collect the remaining variation units parsed by the worker processes in document order:
+            if executor is not None:
+                if len(app_strs) > 0:
+                    futures.append(executor.submit(parse_app_chunk, app_strs, self.verbose))
+                while len(futures) > 0:
+                    self.variation_units.extend(futures.popleft().result())
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        xml = context.root.getroottree()
+        # If the collation has no teiHeader or no listWit element in its teiHeader, then fall back on the rest of the tree:
+        if not header_parsed:
+            self.parse_origin_date_range(xml)
+        if not list_wit_parsed:
+            if require_list_wit or len(xml.xpath("/tei:TEI//tei:listWit", namespaces={"tei": tei_ns})) > 0:
+                self.parse_list_wit(xml)
+        t1 = time.time()
+        if self.verbose:
+            print("Finished streaming %d variation units in %0.4fs." % (len(self.variation_units), t1 - t0))
+        return xml
+
+    def reconfigure(self, **kwargs):
+        """Derives a new Collation from this one with different options for interpreting its readings,
+        reusing the witnesses and variation units already parsed for this Collation rather than parsing the XML again.
+        Only the reading support structures (and the witness list, if the fragmentary threshold changes) are recomputed.
+        This Collation is left unchanged.
+
+        Args:
+            **kwargs: New values for any of the manuscript_suffixes, trivial_reading_types, missing_reading_types, fill_corrector_lacunae,
+                fragmentary_threshold, fill_correctors_threshold, verbose, packed, support_dtype, and memory_budget options of the Collation constructor.
+                Any options that are not specified keep their values from this Collation.
+
+        Returns:
+            A new Collation instance with the given options.
+        """
+        options = [
+            "manuscript_suffixes",
+            "trivial_reading_types",
+            "missing_reading_types",
+            "fill_corrector_lacunae",
+            "fragmentary_threshold",
+            "fill_correctors_threshold",
+            "verbose",
+            "packed",
+            "support_dtype",
+            "memory_budget",
+        ]
+        for key in kwargs:
+            if key not in options:
+                raise TypeError("reconfigure() got an unexpected keyword argument '%s'" % key)
+        if kwargs.get("verbose", self.verbose):
+            print("Reconfiguring collation...")
+        t0 = time.time()
+        # The parsed witnesses, variation units, and categories are shared with the new collation:
+        collation = copy.copy(self)
+        for key, value in kwargs.items():
+            if key in ["trivial_reading_types", "missing_reading_types"]:
+                value = set(value)
+            setattr(collation, key, value)
+        collation.set_witnesses(self.unfiltered_witnesses)
+        collation.unfiltered_witnesses = collation.witnesses
+        # The new collation's reading support arrays are rebuilt below, so no view shares their data:
+        collation.rows_shared = False
+        # If the manuscript suffixes have changed, then the sigla may resolve to different base witnesses, so check them again:
+        if "manuscript_suffixes" in kwargs:
+            collation.validate_wits(None)
+        collation.parse_readings_by_witness()
+        if collation.fragmentary_threshold is not None:
+            collation.filter_fragmentary_witnesses(None)
+        t1 = time.time()
+        if collation.verbose:
+            print("Total time to reconfigure collation: %0.4fs." % (t1 - t0))
+        return collation
+
+    def view(self, witnesses: List[str] = None, units: Union[List[str], slice] = None):
+        """Returns a Collation restricted to a subset of this Collation's witnesses and variation units, without parsing the collation again.
+        The returned Collation supports all of the same output and matrix methods.
+        Its reading support arrays are views of this Collation's arrays (sharing their data) whenever the selected witnesses and the columns of the selected units
+        are evenly spaced (e.g., when a contiguous range of units is selected); otherwise, the selected entries are copied a chunk at a time.
+        Adding or removing witnesses on either Collation leaves the other unchanged:
+        the returned Collation copies its arrays before changing them, and if they share data with this Collation's arrays,
+        then this Collation is marked so that it copies its own arrays (rather than shifting their rows in place) the next time it removes a witness.
+
+        Args:
+            witnesses: An optional list of IDs of the witnesses to include. If it is not specified, then all witnesses are included.
+            units: An optional list of IDs of the variation units to include or a slice of the list of variation unit IDs.
+                If it is not specified, then all variation units are included.
+                In either case, the witnesses and variation units keep their order in this Collation.
+
+        Returns:
+            A new Collation instance for the given witnesses and variation units.
+        """
+        if self.verbose:
+            print("Creating view of collation...")
+        t0 = time.time()
+        # Get the indices of the selected witnesses and variation units, making sure they are all recognized:
+        if witnesses is None:
+            wit_inds = np.arange(len(self.witnesses))
+        else:
+            for wit_id in witnesses:
+                if wit_id not in self.witness_index_by_id:
+                    raise ValueError("Witness %s is not in the collation." % wit_id)
+            wit_inds = np.array(sorted(set(self.witness_index_by_id[wit_id] for wit_id in witnesses)), dtype=int)
+        if units is None:
+            unit_inds = np.arange(len(self.variation_unit_ids))
+        elif isinstance(units, slice):
+            unit_inds = np.arange(len(self.variation_unit_ids))[units]
+        else:
+            unit_index_by_id = self.get_variation_unit_index_by_id()
+            for vu_id in units:
+                if vu_id not in unit_index_by_id:
+                    raise ValueError("Variation unit %s is not in the collation." % vu_id)
+            unit_inds = np.array(sorted(set(unit_index_by_id[vu_id] for vu_id in units)), dtype=int)
+        indexed_variation_units = self.get_indexed_variation_units()
+        collation = copy.copy(self)
+        # Restrict the witness list:
+        collation.witnesses = [self.witnesses[i] for i in wit_inds]
+        collation.unfiltered_witnesses = collation.witnesses
+        collation.index_witnesses()
+        # Then restrict the variation units:
+        collation.variation_unit_symbols = SymbolTable([self.variation_unit_ids[j] for j in unit_inds])
+        collation.variation_unit_ids = collation.variation_unit_symbols.symbols
+        collation.variation_units = [indexed_variation_units[j] for j in unit_inds]
+        # Then select the rows and columns of the reading support arrays:
+        starts = self.reading_offsets[unit_inds]
+        widths = self.reading_offsets[unit_inds + 1] - starts
+        collation.reading_offsets = np.concatenate([[0], np.cumsum(widths, dtype=int)]).astype(int)
+        col_inds = np.arange(collation.reading_offsets[-1]) + np.repeat(starts - collation.reading_offsets[:-1], widths)
+        # The substantive readings keep their IDs in the shared reading symbol table:
+        collation.reading_symbol_ids = self.reading_symbol_ids[col_inds]
+        collation.reading_support = self.get_subarray(self.reading_support, wit_inds, col_inds)
+        collation.extant_mask = self.get_subarray(self.extant_mask, wit_inds, unit_inds)
+        collation.reading_support_buffer = None
+        collation.extant_mask_buffer = None
+        collation.rows_shared = False
+        # If the new collation's arrays share data with this collation's arrays, then this collation must not modify their rows in place from now on:
+        if np.may_share_memory(collation.reading_support, self.reading_support) or np.may_share_memory(
+            collation.extant_mask, self.extant_mask
+        ):
+            self.rows_shared = True
+        collation.invalidate_derived_views()
+        t1 = time.time()
+        if self.verbose:
+            print(
+                "Created view of %d witnesses and %d variation units (%s) in %0.4fs."
+                % (
+                    len(collation.witnesses),
+                    len(collation.variation_unit_ids),
+                    "shared" if np.shares_memory(collation.reading_support, self.reading_support) else "copied",
+                    t1 - t0,
+                )
+            )
+        return collation
+
+    def get_subarray(self, array: np.ndarray, row_inds: np.ndarray, col_inds: np.ndarray):
+        """Returns the entries of the given two-dimensional array in the given rows and columns.
+        If the row and column indices can both be expressed as slices, then the result is a view of the array;
+        otherwise, the entries are copied into a new array allocated with the allocate_array method, a chunk of rows at a time.
+
+        Args:
+            array: A two-dimensional NumPy array (or memory-mapped array).
+            row_inds: A one-dimensional int NumPy array of the indices of the rows to select.
+            col_inds: A one-dimensional int NumPy array of the indices of the columns to select.
+
+        Returns:
+            A NumPy array with a row for each selected row and a column for each selected column.
+        """
+        row_slice = index_slice(row_inds)
+        col_slice = index_slice(col_inds)
+        if row_slice is not None and col_slice is not None:
+            return array[row_slice, col_slice]
+        subarray = self.allocate_array((len(row_inds), len(col_inds)), dtype=array.dtype)
+        col_key = col_slice if col_slice is not None else col_inds
+        rows_per_chunk = self.get_rows_per_chunk(array.shape[1])
+        for start in range(0, len(row_inds), rows_per_chunk):
+            subarray[start : start + rows_per_chunk] = array[row_inds[start : start + rows_per_chunk]][:, col_key]
+        return subarray
+
+    def owns_rows(self, array: np.ndarray, buffer: np.ndarray = None):
+        """Returns whether the given array holds its own data (or the leading rows of the given buffer),
+        so that its rows can be modified in place without affecting any other array.
+        This is never the case if this Collation's arrays may share data with a view of it (see the rows_shared attribute).
+
+        Args:
+            array: A two-dimensional NumPy array (or memory-mapped array).
+            buffer: An optional array whose leading rows may be the given array.
+
+        Returns:
+            A boolean value.
+        """
+        if self.rows_shared:
+            return False
+        if array.base is None or (isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap)):
+            return True
+        return buffer is not None and array.base is buffer and array.ctypes.data == buffer.ctypes.data
+
+    def append_row(self, array: np.ndarray, buffer: np.ndarray, row: np.ndarray):
+        """Appends a row to a two-dimensional array, writing it into the next spare row of the buffer that holds the array if there is one.
+        Otherwise, the array is copied into a new buffer (allocated with the allocate_array method) with spare rows,
+        so that appending rows one at a time takes amortized time proportional to the length of a row.
+
+        Args:
+            array: A two-dimensional NumPy array (or memory-mapped array).
+            buffer: The array whose leading rows hold the given array, or None.
+            row: A one-dimensional NumPy array with an entry for each column of the array.
+
+        Returns:
+            The array with the row appended, as a view of the leading rows of its buffer.
+            The buffer.
+        """
+        nrows = array.shape[0]
+        if not (
+            buffer is not None
+            and array.base is buffer
+            and array.ctypes.data == buffer.ctypes.data
+            and buffer.shape[0] > nrows
+            and buffer.dtype == array.dtype
+        ):
+            # Grow the buffer geometrically, so that the cost of copying the rows is amortized over the rows added:
+            buffer = self.allocate_array((nrows + nrows // 4 + 1, array.shape[1]), dtype=array.dtype)
+            rows_per_chunk = self.get_rows_per_chunk(array.shape[1])
+            for start in range(0, nrows, rows_per_chunk):
+                stop = min(start + rows_per_chunk, nrows)
+                buffer[start:stop] = array[start:stop]
+        buffer[nrows] = row
+        return buffer[: nrows + 1], buffer
+
+    def remove_row(self, array: np.ndarray, buffer: np.ndarray, row_ind: int):
+        """Removes a row from a two-dimensional array, shifting the rows after it up in place if the array holds its own data.
+        Otherwise, the remaining rows are copied into a new array (allocated with the allocate_array method).
+
+        Args:
+            array: A two-dimensional NumPy array (or memory-mapped array).
+            buffer: The array whose leading rows hold the given array, or None.
+            row_ind: The index of the row to remove.
+
+        Returns:
+            The array without the row.
+            The array whose leading rows hold it, whose last row is now spare, or None.
+        """
+        nrows = array.shape[0]
+        if not self.owns_rows(array, buffer):
+            return self.take_rows(array, [i for i in range(nrows) if i != row_ind]), None
+        # Shift the rows a chunk at a time, from the first to the last, so that no row is overwritten before it is moved:
+        rows_per_chunk = self.get_rows_per_chunk(array.shape[1])
+        for start in range(row_ind, nrows - 1, rows_per_chunk):
+            stop = min(start + rows_per_chunk, nrows - 1)
+            array[start:stop] = array[start + 1 : stop + 1]
+        if array.base is None or isinstance(array.base, mmap.mmap):
+            buffer = array
+        return buffer[: nrows - 1], buffer
+
+    def add_witness(self, wit: Witness, readings: dict):
+        """Adds a new witness to the end of this Collation's witness list and updates its reading support arrays in place,
+        so that a new transcription can be included without parsing the collation again.
+        The cost is proportional to the length of the new witness's row of the reading support array (amortized over the witnesses added),
+        and only the derived views that depend on the witness list are discarded.
+        The witness's ID is also added to the witness sigla of its readings, so that it is kept if this Collation is reconfigured.
+        Since the variation units and readings may be shared with other Collations derived from this one (e.g., with the reconfigure or view methods),
+        the ones that change are copied first, and the other Collations are left unchanged.
+
+        As in the constructor, the new witness's lacunae are filled if it is a corrector and the fill_corrector_lacunae option is set,
+        using the readings of the witnesses before it in its chain of correctors, including any that were filtered out as fragmentary.
+        If the new witness is fragmentary according to the fragmentary_threshold option, then it is kept in the unfiltered witness list
+        but left out of the filtered witness list and the reading support arrays.
+
+        Args:
+            wit: A Witness whose ID is not already in the collation.
+            readings: A dictionary mapping the IDs of the variation units where the witness is extant to the ID of the reading it supports there
+                (or to a list of IDs, if it supports more than one). The witness is treated as lacunose at all other variation units.
+        """
+        if self.verbose:
+            print("Adding witness %s..." % wit.id)
+        t0 = time.time()
+        if wit.id in set(w.id for w in self.unfiltered_witnesses):
+            raise ValueError("Witness %s is already in the collation." % wit.id)
+        unit_index_by_id = self.get_variation_unit_index_by_id()
+        indexed_variation_units = self.get_indexed_variation_units()
+        offsets = self.reading_offsets
+        nunits = len(self.variation_unit_ids)
+        # Populate the witness's row of the reading support array one variation unit at a time,
+        # collecting copies of the variation units whose readings gain the witness's siglum:
+        row = np.zeros(int(offsets[-1]), dtype=float)
+        updated_variation_units = {}
+        for vu_id, rdg_ids in readings.items():
+            if vu_id not in unit_index_by_id:
+                raise ValueError("Variation unit %s is not in the collation." % vu_id)
+            j = unit_index_by_id[vu_id]
+            vu = copy.copy(indexed_variation_units[j])
+            vu.readings = list(vu.readings)
+            rdg_ids = [rdg_ids] if isinstance(rdg_ids, str) else rdg_ids
+            _, reading_id_to_index = self.get_substantive_reading_indices(vu)
+            for rdg_id in rdg_ids:
+                m = next((m for m, rdg in enumerate(vu.readings) if rdg.id == rdg_id), None)
+                if m is None:
+                    raise ValueError("Reading %s is not in variation unit %s." % (rdg_id, vu_id))
+                rdg = copy.copy(vu.readings[m])
+                rdg.wits = rdg.wits + (wit.id,)
+                vu.readings[m] = rdg
+                if rdg.type in self.missing_reading_types:
+                    continue
+                rdg_support = self.get_reading_support_vector(rdg, reading_id_to_index, offsets[j + 1] - offsets[j])
+                row[offsets[j] : offsets[j + 1]] = np.minimum(row[offsets[j] : offsets[j + 1]] + rdg_support, 1)
+            updated_variation_units[vu_id] = vu
+        # Then replace the updated variation units (matched by ID) in a copy of the variation unit list, and add the witness's siglum to a copy of the siglum index:
+        if len(updated_variation_units) > 0:
+            self.variation_units = [updated_variation_units.get(vu.id, vu) for vu in self.variation_units]
+            self.derived_views.pop("indexed_variation_units", None)
+            self.siglum_index = self.siglum_index.copy()
+            for vu_id in updated_variation_units:
+                self.siglum_index.add(wit.id, vu_id)
+        # A witness is extant at a variation unit if it supports any reading there:
+        cumulative_counts = np.concatenate([[0], np.cumsum(row > 0)])
+        extant = cumulative_counts[offsets[1:]] - cumulative_counts[offsets[:-1]] > 0
+        # If this witness is a corrector, then fill its lacunae with the readings of the closest witness before it in its chain of correctors that is extant:
+        if (
+            self.fill_corrector_lacunae
+            and wit.type == "corrector"
+            and len(self.unfiltered_witnesses) > 0
+            and (
+                self.fill_correctors_threshold is None
+                or np.count_nonzero(extant) / max(nunits, 1) >= self.fill_correctors_threshold
+            )
+        ):
+            # As in the constructor, the chain runs back through the unfiltered witness list, since the correctors are filled before fragmentary witnesses are filtered out:
+            chain_start = len(self.unfiltered_witnesses) - 1
+            while chain_start > 0 and self.unfiltered_witnesses[chain_start].type == "corrector":
+                chain_start -= 1
+            chain_ids = [w.id for w in self.unfiltered_witnesses[chain_start:]]
+            if all(wit_id in self.witness_index_by_id for wit_id in chain_ids):
+                # The rows of correctors already filled hold the readings of their own sources, so it suffices to search the rows of the chain as they are:
+                chain_rows = [self.witness_index_by_id[wit_id] for wit_id in chain_ids]
+                chain_support = self.reading_support[chain_rows]
+                chain_extant = self.extant_mask[chain_rows]
+            else:
+                # If any witness in the chain has been filtered out as fragmentary, then its row is gone,
+                # so recompute the unfilled rows of the whole chain from the readings of the variation units:
+                chain_support, chain_extant = self.get_unfilled_witness_rows(chain_ids)
+            chain_extant = np.vstack([chain_extant, extant])
+            chain_inds = np.arange(chain_extant.shape[0])[:, np.newaxis]
+            source_inds = np.maximum.accumulate(np.where(chain_extant | (chain_inds == 0), chain_inds, 0), axis=0)[-1]
+            col_units = np.repeat(np.arange(nunits), np.diff(offsets))
+            chain_support = np.vstack([chain_support, row])
+            row = chain_support[source_inds[col_units], np.arange(len(col_units))]
+            extant = chain_extant[source_inds, np.arange(nunits)]
+        self.unfiltered_witnesses = self.unfiltered_witnesses + [wit]
+        # Reset the resolver for witness sigla, since the set of base witnesses has changed:
+        self.reset_siglum_resolver(self.unfiltered_witnesses)
+        # If the witness is fragmentary, then it is filtered out, as it would be in the constructor:
+        if (
+            self.fragmentary_threshold is not None
+            and np.count_nonzero(extant) / max(nunits, 1) < self.fragmentary_threshold
+        ):
+            if self.verbose:
+                print("Filtered out fragmentary witness %s." % wit.id)
+            return
+        # If the witness's reading support coefficients cannot be stored exactly in the current data type, then upcast the array:
+        if self.support_dtype is None:
+            dtype = np.promote_types(self.reading_support.dtype, self.get_compact_support_dtype(row))
+            if dtype != self.reading_support.dtype:
+                self.reading_support = self.take_rows(
+                    self.reading_support, range(self.reading_support.shape[0]), dtype=dtype
+                )
+        self.reading_support, self.reading_support_buffer = self.append_row(
+            self.reading_support, self.reading_support_buffer, row
+        )
+        self.extant_mask, self.extant_mask_buffer = self.append_row(self.extant_mask, self.extant_mask_buffer, extant)
+        self.witnesses = self.witnesses + [wit]
+        self.index_witnesses()
+        self.invalidate_witness_views()
+        t1 = time.time()
+        if self.verbose:
+            print("Added witness %s in %0.4fs." % (wit.id, t1 - t0))
+        return
+
+    def remove_witness(self, wit_id: str):
+        """Removes a witness from this Collation and updates its reading support arrays in place.
+        The rows of the witnesses after it are shifted up without reallocating the arrays,
+        unless the arrays do not hold their own data or a view of this Collation may share them (see the view method),
+        in which case the remaining rows are copied into new arrays and the other Collation is left unchanged.
+        Only the derived views that depend on the witness list are discarded.
+
+        Args:
+            wit_id: The ID of a witness in the collation.
+        """
+        if self.verbose:
+            print("Removing witness %s..." % wit_id)
+        t0 = time.time()
+        if wit_id not in set(w.id for w in self.unfiltered_witnesses):
+            raise ValueError("Witness %s is not in the collation." % wit_id)
+        self.unfiltered_witnesses = [w for w in self.unfiltered_witnesses if w.id != wit_id]
+        self.reset_siglum_resolver(self.unfiltered_witnesses)
+        # If the witness was already filtered out as fragmentary, then its row is not in the reading support arrays:
+        if wit_id in self.witness_index_by_id:
+            i = self.witness_index_by_id[wit_id]
+            self.reading_support, self.reading_support_buffer = self.remove_row(
+                self.reading_support, self.reading_support_buffer, i
+            )
+            self.extant_mask, self.extant_mask_buffer = self.remove_row(self.extant_mask, self.extant_mask_buffer, i)
+            # If the rows were copied, then no view shares the new arrays:
+            self.rows_shared = False
+            self.witnesses = self.witnesses[:i] + self.witnesses[i + 1 :]
+            self.index_witnesses()
+            self.invalidate_witness_views()
+        t1 = time.time()
+        if self.verbose:
+            print("Removed witness %s in %0.4fs." % (wit_id, t1 - t0))
+        return
 
     def parse_origin_date_range(self, xml: et.ElementTree):
         """Given an XML tree for a collation, populates this Collation's list of origin date bounds.
@@ -199,26 +1058,49 @@ class Collation:
 
         Args:
             wit: A string representing a witness siglum, potentially including suffixes to be stripped.
+
+        Returns:
+            The resulting base siglum.
         """
-        base_wit = wit
-        # If our starting siglum corresponds to a siglum in the witness list, then just return it:
-        if base_wit in self.witness_index_by_id:
-            return base_wit
-        # Otherwise, strip any suffixes we find until the siglum corresponds to a base witness in the list
-        # or no more suffixes can be stripped:
-        suffix_found = True
-        while suffix_found:
-            suffix_found = False
-            for suffix in self.manuscript_suffixes:
-                if base_wit.endswith(suffix):
-                    suffix_found = True
-                    base_wit = base_wit[: -len(suffix)]
-                    break  # stop looking for other suffixes
-            # If the siglum stripped of this suffix now corresponds to a siglum in the witness list, then return it:
-            if base_wit in self.witness_index_by_id:
-                return base_wit
-        # If we get here, then all possible manuscript suffixes have been stripped, and the resulting siglum does not correspond to a siglum in the witness list:
-        return base_wit
+        # The suffixes are matched using a resolver compiled from the suffix list and the witness list,
+        # which also memoizes the sigla it has already resolved:
+        return self.siglum_resolver.resolve(wit)
+
+    def get_witness_rows_by_siglum(self):
+        """Returns a dictionary interning each distinct witness siglum in the siglum index of this Collation as the row of its base witness in the reading support array,
+        so that the witnesses of each reading can be located without resolving their sigla again.
+        The readings themselves keep their sigla, since they are shared with collations derived from this one, whose witness lists may differ.
+
+        Returns:
+            A dictionary mapping witness sigla to the int indices of their base witnesses in the witnesses list, or to -1 for sigla whose base witnesses are not in the list.
+            It is computed once and shared by all subsequent calls until the derived views of this Collation are invalidated.
+        """
+        return self.get_derived_view(
+            "witness_rows_by_siglum",
+            lambda: {
+                siglum: self.witness_index_by_id.get(base_siglum, -1)
+                for siglum, base_siglum in self.siglum_index.resolve(self.siglum_resolver).items()
+            },
+        )
+
+    def parse_sigla(self, xml: et.ElementTree):
+        """Given an XML tree for a collation, populates the index of the witness sigla in its app elements.
+        This index is built in a single pass over the collation, so that the methods that need every siglum in the collation (or its base witness)
+        do not have to scan the collation or resolve the siglum again.
+
+        Args:
+            xml: An lxml.etree.ElementTree representing an XML tree rooted at a TEI element.
+        """
+        if self.verbose:
+            print("Indexing witness sigla...")
+        t0 = time.time()
+        self.siglum_index = SiglumIndex()
+        for app in xml.xpath("//tei:app", namespaces={"tei": tei_ns}):
+            self.siglum_index.index_app(app)
+        t1 = time.time()
+        if self.verbose:
+            print("Finished indexing %d distinct witness sigla in %0.4fs." % (len(self.siglum_index), t1 - t0))
+        return
 
     def parse_list_wit(self, xml: et.ElementTree):
         """Given an XML tree for a collation, populates its list of witnesses from its listWit element.
@@ -230,41 +1112,62 @@ class Collation:
         if self.verbose:
             print("Parsing witness list...")
         t0 = time.time()
-        self.witnesses = []
-        self.witness_index_by_id = {}
         list_wits = xml.xpath("/tei:TEI//tei:listWit", namespaces={"tei": tei_ns})
         if len(list_wits) == 0:
             # There is no listWit element: collect all distinct witness sigla in the collation and raise a ParsingException listing them:
-            distinct_sigla = set()
-            sigla = []
-            # Proceed for each rdg, rdgGrp, or witDetail element:
-            for rdg in xml.xpath("//tei:rdg|//tei:rdgGrp|//tei:witDetail", namespaces={"tei": tei_ns}):
-                wit_str = rdg.get("wit") if rdg.get("wit") is not None else ""
-                wits = wit_str.split()
-                for wit in wits:
-                    siglum = wit.strip("#")  # remove the URI prefix, if there is one
-                    if siglum not in distinct_sigla:
-                        distinct_sigla.add(siglum)
-                        sigla.append(siglum)
-            sigla.sort()
-            msg = ""
-            msg += "An explicit listWit element must be included in the TEI XML collation.\n"
-            msg += "The following sigla occur in the collation and should be included as the @xml:id or @n attributes of witness elements under the listWit element:\n"
-            msg += ", ".join(sigla)
-            raise ParsingException(msg)
+            self.raise_missing_list_wit()
         # Otherwise, take the first listWit element as the list of all witnesses and process it:
         list_wit = list_wits[0]
-        for witness in list_wit.xpath("./tei:witness", namespaces={"tei": tei_ns}):
-            wit = Witness(witness, self.verbose)
-            self.witness_index_by_id[wit.id] = len(self.witnesses)
-            self.witnesses.append(wit)
+        self.set_witnesses(
+            [Witness(witness, self.verbose) for witness in list_wit.xpath("./tei:witness", namespaces={"tei": tei_ns})]
+        )
         t1 = time.time()
         if self.verbose:
             print("Finished processing %d witnesses in %0.4fs." % (len(self.witnesses), t1 - t0))
         return
 
+    def raise_missing_list_wit(self):
+        """Raises a ParsingException indicating that the collation has no listWit element and listing all distinct witness sigla encountered in the collation."""
+        sigla = sorted(self.siglum_index)
+        msg = ""
+        msg += "An explicit listWit element must be included in the TEI XML collation.\n"
+        msg += "The following sigla occur in the collation and should be included as the @xml:id or @n attributes of witness elements under the listWit element:\n"
+        msg += ", ".join(sigla)
+        raise ParsingException(msg)
+
+    def set_witnesses(self, witnesses: List[Witness]):
+        """Populates this Collation's list of witnesses and the dictionary mapping their IDs to their indices,
+        and resets the resolver for witness sigla accordingly.
+
+        Args:
+            witnesses: A list of Witness instances.
+        """
+        self.witnesses = list(witnesses)
+        self.index_witnesses()
+        self.reset_siglum_resolver(self.witnesses)
+        return
+
+    def index_witnesses(self):
+        """Populates the table assigning the witnesses in the witnesses list the int indices of their rows in the reading support array,
+        along with the dictionary mapping their IDs to these indices.
+        This must be called whenever the witnesses list changes."""
+        self.witness_symbols = SymbolTable([wit.id for wit in self.witnesses])
+        self.witness_index_by_id = self.witness_symbols.index_by_symbol
+        return
+
+    def reset_siglum_resolver(self, witnesses: List[Witness]):
+        """Replaces the resolver for witness sigla with a new one for the given base witnesses and the current manuscript suffixes.
+        The resolver is replaced rather than updated in place, since it may be shared with other Collations derived from this one (e.g., with the reconfigure or view methods).
+        Witnesses filtered out as fragmentary are still valid base witnesses for sigla, so the unfiltered witness list should be used.
+
+        Args:
+            witnesses: A list of Witness instances.
+        """
+        self.siglum_resolver = SiglumResolver(self.manuscript_suffixes, [wit.id for wit in witnesses])
+        return
+
     def validate_wits(self, xml: et.ElementTree):
-        """Given an XML tree for a collation, checks if any witness sigla listed in a rdg, rdgGrp, or witDetail element,
+        """Given an XML tree for a collation, checks if any witness sigla listed in a lem, rdg, rdgGrp, or witDetail element,
         once stripped of ignored suffixes, is not found in the witness list.
         A warning will be issued for each distinct siglum like this.
         This method also checks if the upper bound of any witness's date is earlier than the lower bound on the collated work's date of origin
@@ -277,21 +1180,15 @@ class Collation:
             print("Validating witness list against collation...")
         t0 = time.time()
         # There is no listWit element: collect all distinct witness sigla in the collation and raise an exception listing them:
-        distinct_extra_sigla = set()
-        extra_sigla = []
-        # Proceed for each rdg, rdgGrp, or witDetail element:
-        for rdg in xml.xpath("//tei:rdg|//tei:rdgGrp|//tei:witDetail", namespaces={"tei": tei_ns}):
-            wit_str = rdg.get("wit") if rdg.get("wit") is not None else ""
-            wits = wit_str.split()
-            for wit in wits:
-                siglum = wit.strip("#")  # remove the URI prefix, if there is one
-                base_siglum = self.get_base_wit(siglum)
-                if base_siglum not in self.witness_index_by_id:
-                    if base_siglum not in distinct_extra_sigla:
-                        distinct_extra_sigla.add(base_siglum)
-                        extra_sigla.append(base_siglum)
+        # Proceed for each distinct siglum in the collation, using the base siglum to which the siglum index resolves it:
+        extra_sigla = sorted(
+            set(
+                base_siglum
+                for base_siglum in self.siglum_index.resolve(self.siglum_resolver).values()
+                if base_siglum not in self.witness_index_by_id
+            )
+        )
         if len(extra_sigla) > 0:
-            extra_sigla.sort()
             msg = ""
             msg += "WARNING: The following sigla occur in the collation that do not have corresponding witness entries in the listWit:\n"
             msg += ", ".join(extra_sigla)
@@ -558,194 +1455,829 @@ class Collation:
         if self.verbose:
             print("Parsing variation units...")
         t0 = time.time()
-        for a in xml.xpath('//tei:app', namespaces={'tei': tei_ns}):
-            vu = VariationUnit(a, self.verbose)
-            self.variation_units.append(vu)
+        apps = xml.xpath('//tei:app', namespaces={'tei': tei_ns})
+        if self.workers > 1 and len(apps) > 1:
+            # Split the app elements into chunks (a few per worker, to balance the load),
+            # and parse each chunk in a worker process; the map method returns the results in the original order:
+            chunk_size = math.ceil(len(apps) / (4 * self.workers))
+            app_strs = [et.tostring(a, with_tail=False) for a in apps]
+            chunks = [app_strs[i : i + chunk_size] for i in range(0, len(app_strs), chunk_size)]
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for vus in executor.map(parse_app_chunk, chunks, [self.verbose] * len(chunks)):
+                    self.variation_units.extend(vus)
+        else:
+            for a in apps:
+                vu = VariationUnit(a, self.verbose)
+                self.variation_units.append(vu)
         t1 = time.time()
         if self.verbose:
             print("Finished processing %d variation units in %0.4fs." % (len(self.variation_units), t1 - t0))
         return
 
-    def get_readings_by_witness_for_unit(self, vu: VariationUnit):
-        """Returns a dictionary mapping witness IDs to a list of their reading coefficients for a given variation unit.
+    @property
+    def readings_by_witness(self):
+        """A read-only dictionary-like view mapping base witness ID strings to lists of their reading support lists for all variation units.
+        This is provided for compatibility; the reading support coefficients are stored in the reading_support array."""
+        return ReadingSupportView(self)
+
+    def get_witness_reading_support(self, wit_ind: int):
+        """Returns the reading support lists of the witness at the given index for all variation units.
+
+        Args:
+            wit_ind: The index of a witness in the witnesses list.
+
+        Returns:
+            A list containing a list of the witness's reading support coefficients (as floats) for each variation unit.
+        """
+        support = self.reading_support[wit_ind].astype(float).tolist()
+        offsets = self.reading_offsets.tolist()
+        return [support[offsets[j] : offsets[j + 1]] for j in range(len(offsets) - 1)]
+
+    def allocate_array(self, shape, dtype=float):
+        """Returns a new zero-filled array of the given shape and type for the reading support structures of this Collation.
+        If this Collation has a scratch directory, then the array is memory-mapped to a temporary file in that directory,
+        which is deleted once the array is no longer in use.
+
+        Args:
+            shape: A tuple of array dimensions.
+            dtype: An optional NumPy data type for the array.
+
+        Returns:
+            A NumPy array (or memory-mapped array) of zeros.
+        """
+        # Empty files cannot be memory-mapped, and there is no point in storing an empty array on disk anyway:
+        if self.scratch_dir is None or math.prod(shape) == 0:
+            return np.zeros(shape, dtype=dtype)
+        Path(self.scratch_dir).mkdir(parents=True, exist_ok=True)
+        return np.memmap(tempfile.TemporaryFile(dir=self.scratch_dir), dtype=dtype, mode="w+", shape=shape)
+
+    def get_rows_per_chunk(self, ncols: int):
+        """Returns the number of rows of an array with the given number of columns to copy or read into memory at a time.
+
+        Args:
+            ncols: The number of columns in the array.
+
+        Returns:
+            A positive int.
+        """
+        return max(1, self.array_chunk_size // max(ncols, 1))
+
+    def take_rows(self, array: np.ndarray, row_inds, dtype=None):
+        """Copies the given rows of an array into a new array allocated with the allocate_array method, a chunk of rows at a time.
+
+        Args:
+            array: A two-dimensional NumPy array (or memory-mapped array).
+            row_inds: A list of the indices of the rows to copy.
+            dtype: An optional NumPy data type for the new array. If it is not specified, then the data type of the input array is used.
+
+        Returns:
+            A new array containing the given rows.
+        """
+        row_inds = np.asarray(row_inds, dtype=int)
+        taken = self.allocate_array((len(row_inds), array.shape[1]), dtype=dtype if dtype is not None else array.dtype)
+        rows_per_chunk = self.get_rows_per_chunk(array.shape[1])
+        for start in range(0, len(row_inds), rows_per_chunk):
+            taken[start : start + rows_per_chunk] = array[row_inds[start : start + rows_per_chunk]]
+        return taken
+
+    def get_witness_block_size(self):
+        """Returns the number of witnesses in each block of rows and columns of a witness-to-witness matrix that is computed in tiles.
+        Each tile is computed with a handful of temporary arrays of its size, so the tiles are kept small enough for them to fit within half of the memory budget.
+
+        Returns:
+            A positive int, which is the number of witnesses in this Collation if it has no memory budget.
+        """
+        if self.memory_budget is None:
+            return max(len(self.witnesses), 1)
+        # Allow for 8 tile-sized arrays of 8-byte entries:
+        return max(1, math.isqrt(self.memory_budget // 128))
+
+    def get_tile_chunk_size(self):
+        """Returns the maximum number of entries of the reading support array to read into memory at a time for each tile of a witness-to-witness matrix.
+        The entries are converted to a few temporary arrays of floats, so they are kept few enough for these to fit within the other half of the memory budget.
+
+        Returns:
+            A positive int.
+        """
+        if self.memory_budget is None:
+            return self.array_chunk_size
+        return max(1, min(self.array_chunk_size, self.memory_budget // 64))
+
+    def get_witness_matrix(self, compute_tile, dtype=float):
+        """Assembles a symmetric witness-to-witness matrix from tiles computed for pairs of blocks of witnesses,
+        so that the memory needed to compute it is bounded by the memory budget of this Collation rather than the number of witnesses.
+        Only the tiles on and above the diagonal are computed, and the tiles above the diagonal are mirrored below it.
+        The finished tiles are written to a new array allocated with the allocate_array method,
+        so if this Collation has a scratch directory, then the matrix is stored in a memory-mapped file there.
+
+        Args:
+            compute_tile: A function that takes a slice of the witnesses for the rows of a tile and a slice of the witnesses for its columns
+                (or None, if they are the same as its rows) and returns the tile as a NumPy array.
+            dtype: An optional NumPy data type for the matrix.
+
+        Returns:
+            A NumPy array (or memory-mapped array) with a row and column for each witness.
+        """
+        return self.get_witness_matrices(lambda row_block, col_block: (compute_tile(row_block, col_block),), [dtype])[0]
+
+    def get_witness_matrices(self, compute_tiles, dtypes):
+        """Assembles several symmetric witness-to-witness matrices from tiles computed together for pairs of blocks of witnesses,
+        so that matrices that are computed from the same intermediate counts only have to be tiled once (see the get_witness_matrix method).
+
+        Args:
+            compute_tiles: A function that takes a slice of the witnesses for the rows of a tile and a slice of the witnesses for its columns
+                (or None, if they are the same as its rows) and returns a tuple of the corresponding tiles of each matrix as NumPy arrays.
+            dtypes: A list of the NumPy data types of the matrices.
+
+        Returns:
+            A tuple of NumPy arrays (or memory-mapped arrays) with a row and column for each witness.
+        """
+        nwits = len(self.witnesses)
+        block_size = self.get_witness_block_size()
+        # If the whole matrix fits in a single tile, then there is nothing to assemble:
+        if block_size >= nwits:
+            return tuple(compute_tiles(slice(0, nwits), None))
+        if self.verbose:
+            print("Computing witness matrix in tiles of %d witnesses..." % block_size)
+        t0 = time.time()
+        matrices = tuple(self.allocate_array((nwits, nwits), dtype=dtype) for dtype in dtypes)
+        ntiles = 0
+        for row_start in range(0, nwits, block_size):
+            row_block = slice(row_start, min(row_start + block_size, nwits))
+            for matrix, tile in zip(matrices, compute_tiles(row_block, None)):
+                matrix[row_block, row_block] = tile
+            ntiles += 1
+            for col_start in range(row_block.stop, nwits, block_size):
+                col_block = slice(col_start, min(col_start + block_size, nwits))
+                for matrix, tile in zip(matrices, compute_tiles(row_block, col_block)):
+                    matrix[row_block, col_block] = tile
+                    matrix[col_block, row_block] = tile.T
+                ntiles += 1
+        t1 = time.time()
+        if self.verbose:
+            print("Computed %d tiles of a matrix for %d witnesses in %0.4fs." % (ntiles, nwits, t1 - t0))
+        return matrices
+
+    def get_proportion_matrix(self, matrix: np.ndarray, ext_matrix: np.ndarray):
+        """Divides every value in a witness-to-witness matrix by the corresponding entry in the matrix of shared extant variation units, a chunk of rows at a time.
+
+        Args:
+            matrix: A NumPy array (or memory-mapped array) with a row and column for each witness.
+            ext_matrix: A NumPy array (or memory-mapped array) of the number of variation units shared by each pair of witnesses.
+
+        Returns:
+            A new float array allocated with the allocate_array method.
+        """
+        # Division by 0 can occur if two witnesses have no overlapping units; leave their proportion as 0.0:
+        proportion_matrix = self.allocate_array(matrix.shape, dtype=float)
+        rows_per_chunk = self.get_rows_per_chunk(matrix.shape[1])
+        for start in range(0, matrix.shape[0], rows_per_chunk):
+            rows = slice(start, start + rows_per_chunk)
+            np.divide(matrix[rows], ext_matrix[rows], out=proportion_matrix[rows], where=(ext_matrix[rows] != 0))
+        return proportion_matrix
+
+    def set_scratch_dir(self, scratch_dir: Union[Path, str]):
+        """Moves the reading support array of this Collation to a memory-mapped file in the given scratch directory
+        (or back into memory, if the scratch directory is None).
+
+        Args:
+            scratch_dir: A directory in which to store the reading support array, or None.
+        """
+        self.scratch_dir = scratch_dir
+        self.reading_support = self.take_rows(self.reading_support, range(self.reading_support.shape[0]))
+        self.invalidate_derived_views()
+        return
+
+    def get_compact_support_dtype(self, array: np.ndarray = None):
+        """Returns the most compact NumPy data type that represents every entry of the reading support array exactly.
+
+        Args:
+            array: An optional array of reading support coefficients to check instead of the reading support array (e.g., a new row for it).
+
+        Returns:
+            uint8 if every reading support coefficient is a whole number (as it is unless certainty degrees are used),
+            float32 if every coefficient can be represented exactly in single precision (e.g., 0.5 or 0.25), and float64 otherwise.
+        """
+        if array is None:
+            array = self.reading_support
+        array = np.atleast_2d(array)
+        fits_uint8 = True
+        fits_float32 = True
+        nrows, ncols = array.shape
+        rows_per_chunk = self.get_rows_per_chunk(ncols)
+        for start in range(0, nrows, rows_per_chunk):
+            chunk = np.asarray(array[start : start + rows_per_chunk], dtype=float)
+            fits_uint8 = fits_uint8 and bool(np.all((chunk == np.round(chunk)) & (chunk >= 0) & (chunk <= 255)))
+            fits_float32 = fits_float32 and bool(np.all(chunk.astype(np.float32) == chunk))
+            if not fits_float32:
+                break
+        if fits_uint8:
+            return np.dtype(np.uint8)
+        if fits_float32:
+            return np.dtype(np.float32)
+        return np.dtype(float)
+
+    def compact_reading_support(self):
+        """Converts the reading support array to the data type given by the support_dtype option,
+        or to the most compact data type that represents all of its entries exactly, if that option is not specified.
+        Computations that need floating-point values (e.g., normalizing reading support) upcast the entries they use.
+        """
+        t0 = time.time()
+        if self.support_dtype is not None:
+            dtype = np.dtype(self.support_dtype)
+        else:
+            dtype = self.get_compact_support_dtype()
+        if dtype != self.reading_support.dtype:
+            self.reading_support = self.take_rows(
+                self.reading_support, range(self.reading_support.shape[0]), dtype=dtype
+            )
+        t1 = time.time()
+        if self.verbose:
+            print(
+                "Stored reading support array as %s (%d bytes) in %0.4fs."
+                % (str(dtype), self.reading_support.nbytes, t1 - t0)
+            )
+        return
+
+    def get_substantive_reading_indices(self, vu: VariationUnit):
+        """Returns the IDs of the substantive readings of a given variation unit and a map from its reading IDs to the indices of their parent substantive readings.
 
         Args:
             vu: A VariationUnit to be processed.
 
         Returns:
-            A dictionary mapping witness ID strings to a list of their coefficients for all substantive readings in this VariationUnit.
+            A list of the IDs of the substantive readings in this VariationUnit.
+            A dictionary mapping the IDs of substantive and trivial readings to the indices of their substantive readings in this list.
         """
-        # In a first pass, populate lists of substantive (variation unit ID, reading ID) tuples and reading labels
-        # and a map from reading IDs to the indices of their parent substantive reading in this unit:
+        substantive_reading_ids = []
         reading_id_to_index = {}
-        self.substantive_readings_by_variation_unit_id[vu.id] = []
         for rdg in vu.readings:
             # If this reading is missing (e.g., lacunose or inapplicable due to an overlapping variant) or targets another reading, then skip it:
             if rdg.type in self.missing_reading_types or len(rdg.certainties) > 0:
                 continue
             # If this reading is trivial, then map it to the last substantive index:
             if rdg.type in self.trivial_reading_types:
-                reading_id_to_index[rdg.id] = len(self.substantive_readings_by_variation_unit_id[vu.id]) - 1
+                reading_id_to_index[rdg.id] = len(substantive_reading_ids) - 1
                 continue
             # Otherwise, the reading is substantive: add it to the map and update the last substantive index:
-            self.substantive_readings_by_variation_unit_id[vu.id].append(rdg.id)
-            self.substantive_variation_unit_reading_tuples.append(tuple([vu.id, rdg.id]))
-            reading_id_to_index[rdg.id] = len(self.substantive_readings_by_variation_unit_id[vu.id]) - 1
-        # If the list of substantive readings only contains one entry, then this variation unit is not informative;
-        # return an empty dictionary and add nothing to the list of substantive reading labels:
+            substantive_reading_ids.append(rdg.id)
+            reading_id_to_index[rdg.id] = len(substantive_reading_ids) - 1
+        return substantive_reading_ids, reading_id_to_index
+
+    def get_reading_support_vector(self, rdg: Reading, reading_id_to_index: dict, nreadings: int):
+        """Returns the vector of support coefficients that a witness to a given (non-missing) reading has for the substantive readings of its variation unit.
+
+        Args:
+            rdg: A Reading whose type is not a missing reading type.
+            reading_id_to_index: A dictionary mapping reading IDs to the indices of their substantive readings, as returned by get_substantive_reading_indices.
+            nreadings: The number of substantive readings in the variation unit.
+
+        Returns:
+            A NumPy array with an entry for each substantive reading in the variation unit.
+        """
+        # Initialize the vector indicating support for this reading (or its disambiguations):
+        rdg_support = np.zeros(nreadings, dtype=float)
+        # If this reading is trivial, then it will contain an entry for the index of its parent substantive reading:
+        if rdg.type in self.trivial_reading_types:
+            rdg_support[reading_id_to_index[rdg.id]] = 1
+        # Otherwise, if this reading has one or more nonzero certainty degrees,
+        # then set the entries for these readings to their degrees:
+        elif sum(rdg.certainties.values()) > 0:
+            for t in rdg.certainties:
+                # Skip any reading whose ID is unrecognized in this unit:
+                if t in reading_id_to_index:
+                    rdg_support[reading_id_to_index[t]] = rdg.certainties[t]
+        # Otherwise, if this reading has one or more targets (i.e., if it is an ambiguous reading),
+        # then set the entries for each of its targets to 1:
+        elif len(rdg.targets) > 0:
+            for t in rdg.targets:
+                # Skip any reading whose ID is unrecognized in this unit:
+                if t in reading_id_to_index:
+                    rdg_support[reading_id_to_index[t]] = 1
+        # Otherwise, this reading is itself substantive; set the entry for the index of this reading to 1:
+        else:
+            rdg_support[reading_id_to_index[rdg.id]] = 1
+        return rdg_support
+
+    def get_reading_support_for_unit(
+        self, vu: VariationUnit, substantive_reading_ids: List[str] = None, reading_id_to_index: dict = None
+    ):
+        """Returns an array of the reading support coefficients of all witnesses for a given variation unit.
+
+        Args:
+            vu: A VariationUnit to be processed.
+            substantive_reading_ids: An optional list of the IDs of the substantive readings in this VariationUnit, as returned by get_substantive_reading_indices.
+            reading_id_to_index: An optional dictionary mapping reading IDs to the indices of their substantive readings, as returned by get_substantive_reading_indices.
+                If either this or the list of substantive reading IDs is not specified, then both are computed here.
+
+        Returns:
+            A NumPy array with a row for each witness in the witnesses list and a column for each substantive reading in this VariationUnit.
+        """
+        # In a first pass, populate a list of substantive reading IDs
+        # and a map from reading IDs to the indices of their parent substantive reading in this unit:
+        if substantive_reading_ids is None or reading_id_to_index is None:
+            substantive_reading_ids, reading_id_to_index = self.get_substantive_reading_indices(vu)
+        nreadings = len(substantive_reading_ids)
         if self.verbose:
-            print(
-                "Variation unit %s has %d substantive readings."
-                % (vu.id, len(self.substantive_readings_by_variation_unit_id[vu.id]))
-            )
-        readings_by_witness_for_unit = {}
-        # Initialize the output dictionary with empty sets for all base witnesses:
-        for wit in self.witnesses:
-            readings_by_witness_for_unit[wit.id] = [0] * len(self.substantive_readings_by_variation_unit_id[vu.id])
-        # In a second pass, assign each base witness a set containing the readings it supports in this unit:
+            print("Variation unit %s has %d substantive readings." % (vu.id, nreadings))
+        # Initialize the output array with zeroes for all base witnesses:
+        unit_support = np.zeros((len(self.witnesses), nreadings), dtype=float)
+        witness_rows_by_siglum = self.get_witness_rows_by_siglum()
+        # In a second pass, assign each base witness the readings it supports in this unit:
         for rdg in vu.readings:
-            # Initialize the dictionary indicating support for this reading (or its disambiguations):
-            rdg_support = [0] * len(self.substantive_readings_by_variation_unit_id[vu.id])
-            # If this is a missing reading (e.g., a lacuna or an overlap), then we can skip it, as its corresponding set will be empty:
+            # If this is a missing reading (e.g., a lacuna or an overlap), then we can skip it, as its corresponding support will be empty:
             if rdg.type in self.missing_reading_types:
                 continue
-            # Otherwise, if this reading is trivial, then it will contain an entry for the index of its parent substantive reading:
-            elif rdg.type in self.trivial_reading_types:
-                rdg_support[reading_id_to_index[rdg.id]] = 1
-            # Otherwise, if this reading has one or more nonzero certainty degrees,
-            # then set the entries for these readings to their degrees:
-            elif sum(rdg.certainties.values()) > 0:
-                for t in rdg.certainties:
-                    # Skip any reading whose ID is unrecognized in this unit:
-                    if t in reading_id_to_index:
-                        rdg_support[reading_id_to_index[t]] = rdg.certainties[t]
-            # Otherwise, if this reading has one or more targets (i.e., if it is an ambiguous reading),
-            # then set the entries for each of its targets to 1:
-            elif len(rdg.targets) > 0:
-                for t in rdg.targets:
-                    # Skip any reading whose ID is unrecognized in this unit:
-                    if t in reading_id_to_index:
-                        rdg_support[reading_id_to_index[t]] = 1
-            # Otherwise, this reading is itself substantive; set the entry for the index of this reading to 1:
-            else:
-                rdg_support[reading_id_to_index[rdg.id]] = 1
-            # Proceed for each witness siglum in the support for this reading:
+            rdg_support = self.get_reading_support_vector(rdg, reading_id_to_index, nreadings)
+            # Proceed for each witness siglum in the support for this reading, collecting the row indices of their base witnesses:
+            wit_inds = []
             for wit in rdg.wits:
-                # Is this siglum a base siglum?
-                base_wit = self.get_base_wit(wit)
-                if base_wit not in self.witness_index_by_id:
-                    # If it is not, then it is probably just because we've encountered a corrector or some other secondary witness not included in the witness list;
+                wit_ind = witness_rows_by_siglum.get(wit, -1)
+                if wit_ind < 0:
+                    # If its base siglum is not in the witness list, then it is probably just because we've encountered a corrector or some other secondary witness not included in the witness list;
                     # report this if we're in verbose mode and move on:
                     if self.verbose:
                         print(
                             "Skipping unknown witness siglum %s (base siglum %s) in variation unit %s, reading %s..."
-                            % (wit, base_wit, vu.id, rdg.id)
+                            % (wit, self.siglum_index.resolve(self.siglum_resolver).get(wit), vu.id, rdg.id)
                         )
                     continue
-                # If we've found a base siglum, then add this reading's contribution to the base witness's reading set for this unit;
-                # normally the existing set will be empty, but if we reduce two suffixed sigla to the same base witness,
-                # then that witness may attest to multiple readings in the same unit:
-                readings_by_witness_for_unit[base_wit] = [
-                    (min(readings_by_witness_for_unit[base_wit][i] + rdg_support[i], 1))
-                    for i in range(len(rdg_support))
-                ]
-        return readings_by_witness_for_unit
+                wit_inds.append(wit_ind)
+            # Then add this reading's contribution to the base witnesses' rows for this unit;
+            # normally the existing rows will be empty, but if we reduce two suffixed sigla to the same base witness,
+            # then that witness may attest to multiple readings in the same unit.
+            # If the same base witness occurs more than once in this reading, then its contributions have to be added one at a time:
+            if len(set(wit_inds)) == len(wit_inds):
+                unit_support[wit_inds] = np.minimum(unit_support[wit_inds] + rdg_support, 1)
+            else:
+                for wit_ind in wit_inds:
+                    unit_support[wit_ind] = np.minimum(unit_support[wit_ind] + rdg_support, 1)
+        return unit_support
+
+    def get_unfilled_witness_rows(self, wit_ids: List[str]):
+        """Recomputes the rows of the reading support array and the extant mask for the given base witnesses from the readings of the variation units,
+        as they are before any corrector lacunae are filled.
+        The witnesses need not be in the witness list, so this can recover the rows of witnesses that have been filtered out as fragmentary.
+
+        Args:
+            wit_ids: A list of base witness ID strings.
+
+        Returns:
+            A float NumPy array with a row for each of the given witnesses and a column for each substantive reading of each variation unit.
+            A boolean NumPy array with a row for each of the given witnesses and a column for each variation unit.
+        """
+        row_by_id = {wit_id: i for i, wit_id in enumerate(wit_ids)}
+        offsets = self.reading_offsets
+        support = np.zeros((len(wit_ids), int(offsets[-1])), dtype=float)
+        # Only the variation units in which the sigla of these witnesses occur have to be visited:
+        base_by_siglum = self.siglum_index.resolve(self.siglum_resolver)
+        unit_index_by_id = self.get_variation_unit_index_by_id()
+        unit_inds = set()
+        for siglum, base_siglum in base_by_siglum.items():
+            if base_siglum in row_by_id:
+                unit_inds.update(
+                    unit_index_by_id[vu_id]
+                    for vu_id in self.siglum_index.unit_ids_by_siglum[siglum]
+                    if vu_id in unit_index_by_id
+                )
+        indexed_variation_units = self.get_indexed_variation_units()
+        for j in sorted(unit_inds):
+            vu = indexed_variation_units[j]
+            _, reading_id_to_index = self.get_substantive_reading_indices(vu)
+            for rdg in vu.readings:
+                if rdg.type in self.missing_reading_types:
+                    continue
+                rows = [row_by_id[base_by_siglum[wit]] for wit in rdg.wits if base_by_siglum.get(wit) in row_by_id]
+                if len(rows) == 0:
+                    continue
+                rdg_support = self.get_reading_support_vector(rdg, reading_id_to_index, offsets[j + 1] - offsets[j])
+                for i in rows:
+                    support[i, offsets[j] : offsets[j + 1]] = np.minimum(
+                        support[i, offsets[j] : offsets[j + 1]] + rdg_support, 1
+                    )
+        # A witness is extant at a variation unit if it supports any reading there:
+        cumulative_counts = np.zeros((len(wit_ids), support.shape[1] + 1), dtype=int)
+        np.cumsum(support > 0, axis=1, out=cumulative_counts[:, 1:])
+        extant = cumulative_counts[:, offsets[1:]] - cumulative_counts[:, offsets[:-1]] > 0
+        return support, extant
+
+    def get_readings_by_witness_for_unit(self, vu: VariationUnit):
+        """Returns a dictionary mapping witness IDs to a list of their reading coefficients for a given variation unit.
+
+        Args:
+            vu: A VariationUnit to be processed.
+
+        Returns:
+            A dictionary mapping witness ID strings to a list of their coefficients for all substantive readings in this VariationUnit.
+        """
+        unit_support = self.get_reading_support_for_unit(vu)
+        return {wit.id: unit_support[i].tolist() for i, wit in enumerate(self.witnesses)}
 
     def parse_readings_by_witness(self):
-        """Populates the internal dictionary mapping witness IDs to a list of their reading support sets for all variation units, and then fills the empty reading support sets for witnesses of type "corrector" with the entries of the previous witness."""
+        """Populates the internal array of reading support coefficients of all witnesses for all variation units, along with its column offsets and extant mask,
+        and then fills the lacunae of witnesses of type "corrector" with the entries of the previous witness."""
         if self.verbose:
-            print("Populating internal dictionary of witness readings...")
+            print("Populating internal array of witness readings...")
         t0 = time.time()
-        # Initialize the data structures to be populated here:
-        self.readings_by_witness = {}
-        self.variation_unit_ids = []
-        for wit in self.witnesses:
-            self.readings_by_witness[wit.id] = []
+        # The witness list may have changed since the derived views were computed (e.g., if this Collation was reconfigured), so discard them:
+        self.invalidate_derived_views()
+        # Initialize the data structures to be populated here;
+        # the variation units and their substantive readings are identified by int IDs, and their ID strings are stored once in symbol tables:
+        self.variation_unit_symbols = SymbolTable()
+        self.variation_unit_ids = self.variation_unit_symbols.symbols
+        self.reading_symbols = SymbolTable()
+        reading_symbol_ids = []
+        unit_supports = []
+        unit_widths = []
+        unit_extant_masks = []
+        # If the reading support array is to be stored on disk, then write the columns of each unit to a scratch file as they are computed,
+        # rather than keeping all of the units' arrays in memory until they are concatenated:
+        column_file = None
+        if self.scratch_dir is not None:
+            Path(self.scratch_dir).mkdir(parents=True, exist_ok=True)
+            column_file = tempfile.TemporaryFile(dir=self.scratch_dir)
         # Populate them for each variation unit:
         for vu in self.variation_units:
-            readings_by_witness_for_unit = self.get_readings_by_witness_for_unit(vu)
-            if len(readings_by_witness_for_unit) > 0:
-                self.variation_unit_ids.append(vu.id)
-            for wit in readings_by_witness_for_unit:
-                self.readings_by_witness[wit].append(readings_by_witness_for_unit[wit])
+            # If there are no witnesses, then there is nothing to record for this unit:
+            if len(self.witnesses) == 0:
+                continue
+            substantive_reading_ids, reading_id_to_index = self.get_substantive_reading_indices(vu)
+            unit_support = self.get_reading_support_for_unit(vu, substantive_reading_ids, reading_id_to_index)
+            self.variation_unit_symbols.add(vu.id)
+            reading_symbol_ids.extend([self.reading_symbols.intern(rdg_id) for rdg_id in substantive_reading_ids])
+            unit_widths.append(unit_support.shape[1])
+            unit_extant_masks.append(unit_support.any(axis=1))
+            if column_file is not None:
+                column_file.write(np.ascontiguousarray(unit_support.T, dtype=float).tobytes())
+            else:
+                unit_supports.append(unit_support)
+        # Then concatenate the arrays for the units into one array and record where each unit's columns start:
+        self.reading_offsets = np.concatenate([[0], np.cumsum(unit_widths, dtype=int)]).astype(int)
+        self.reading_symbol_ids = np.array(reading_symbol_ids, dtype=int)
+        nwits = len(self.witnesses)
+        ncols = int(self.reading_offsets[-1])
+        if len(unit_extant_masks) > 0:
+            self.extant_mask = np.stack(unit_extant_masks, axis=1)
+        else:
+            self.extant_mask = np.zeros((nwits, 0), dtype=bool)
+        if column_file is not None:
+            # The scratch file holds the transpose of the reading support array, so copy it into the array a block of columns at a time:
+            self.reading_support = self.allocate_array((nwits, ncols))
+            column_file.flush()
+            if nwits > 0 and ncols > 0:
+                columns = np.memmap(column_file, dtype=float, mode="r", shape=(ncols, nwits))
+                cols_per_chunk = self.get_rows_per_chunk(nwits)
+                for start in range(0, ncols, cols_per_chunk):
+                    self.reading_support[:, start : start + cols_per_chunk] = columns[start : start + cols_per_chunk].T
+                del columns
+            column_file.close()
+        elif len(unit_supports) > 0:
+            self.reading_support = np.concatenate(unit_supports, axis=1)
+        else:
+            self.reading_support = np.zeros((nwits, 0), dtype=float)
         # Optionally, fill the lacunae of the correctors:
         if self.fill_corrector_lacunae:
-            filled_readings = []
-            for i, wit in enumerate(self.witnesses):
-                # If this is the first witness, then it shouldn't be a corrector (since there is no previous witness against which to compare it):
-                if i == 0:
-                    filled_readings = list(self.readings_by_witness[wit.id])
-                    continue
-                # Otherwise, if this witness is not a corrector, then skip it:
-                if wit.type != "corrector":
-                    filled_readings = list(self.readings_by_witness[wit.id])
-                    continue
-                # Otherwise, add this corrector's extant readings to the filled readings list:
-                for j in range(len(self.readings_by_witness[wit.id])):
-                    if sum(self.readings_by_witness[wit.id][j]) != 0:
-                        filled_readings[j] = list(self.readings_by_witness[wit.id][j])
-                # If a threshold of extant readings is specified, then check if this corrector meets it, and skip it if not:
-                if self.fill_correctors_threshold is not None:
-                    # If there is a threshold, then first check the proportion of variation units at which this witness is not lacunose:
-                    proportion_extant = sum(
-                        [
-                            1
-                            for j in range(len(self.readings_by_witness[wit.id]))
-                            if sum(self.readings_by_witness[wit.id][j]) != 0
-                        ]
-                    ) / len(self.readings_by_witness[wit.id])
-                    # If this corrector does not exceed the threshold, then don't fill it,
-                    # but do update the running set of readings for the previous corrector and first hand:
-                    if proportion_extant < self.fill_correctors_threshold:
-                        continue
-                # Otherwise, fill every lacuna in this corrector based on the filled readings list:
-                for j in range(len(self.readings_by_witness[wit.id])):
-                    if sum(self.readings_by_witness[wit.id][j]) == 0:
-                        self.readings_by_witness[wit.id][j] = list(filled_readings[j])
+            self.fill_correctors()
+        # Then store the array in a compact data type:
+        self.compact_reading_support()
+        self.invalidate_derived_views()
         t1 = time.time()
         if self.verbose:
             print(
-                "Populated dictionary for %d witnesses over %d substantive variation units in %0.4fs."
+                "Populated array for %d witnesses over %d substantive variation units in %0.4fs."
                 % (len(self.witnesses), len(self.variation_unit_ids), t1 - t0)
             )
+            if isinstance(self.reading_support, np.memmap):
+                print("Stored array in a memory-mapped file in scratch directory %s." % str(self.scratch_dir))
+        return
+
+    def fill_correctors(self):
+        """Fills the lacunae of witnesses of type "corrector" in the reading support array with the readings of the previous witness.
+
+        Each corrector follows a chain of correctors back to the first witness before it that is not a corrector (e.g., the first hand).
+        At each variation unit where a corrector is lacunose, it is assigned the reading of the closest witness before it in its chain that is extant there,
+        or the reading of the first witness in its chain if none of them are.
+        If a threshold for filling correctors is specified, then correctors extant at fewer than this proportion of variation units are not filled in,
+        although their own readings are still used to fill the correctors after them.
+        """
+        nwits, nunits = self.extant_mask.shape
+        if nwits == 0 or nunits == 0:
+            return
+        # The first witness shouldn't be a corrector (since there is no previous witness against which to compare it),
+        # so every chain starts with the first witness or a witness that is not a corrector:
+        is_chain_start = np.array([i == 0 or wit.type != "corrector" for i, wit in enumerate(self.witnesses)])
+        # Only fill the correctors that meet the threshold of extant readings, if there is one
+        # (this must be computed before any lacunae are filled in):
+        filled = ~is_chain_start
+        if self.fill_correctors_threshold is not None:
+            proportions_extant = np.count_nonzero(self.extant_mask, axis=1) / nunits
+            filled &= proportions_extant >= self.fill_correctors_threshold
+        filled_inds = np.flatnonzero(filled)
+        # Witness indices are stored in the smallest integer type that can hold them,
+        # and the source witnesses are found for a chunk of variation units at a time, so that no witness-by-unit index array is allocated in full:
+        index_dtype = np.min_scalar_type(nwits - 1)
+        wit_inds = np.arange(nwits, dtype=index_dtype)[:, np.newaxis]
+        units_per_chunk = self.get_rows_per_chunk(nwits)
+        for unit_start in range(0, nunits, units_per_chunk):
+            units = slice(unit_start, min(unit_start + units_per_chunk, nunits))
+            # For every witness and variation unit in this chunk, find the closest witness at or before it in its chain that is extant there
+            # (or the start of the chain) by taking a running maximum of the indices of the witnesses that qualify:
+            source_inds = np.where(self.extant_mask[:, units] | is_chain_start[:, np.newaxis], wit_inds, 0).astype(
+                index_dtype, copy=False
+            )
+            np.maximum.accumulate(source_inds, axis=0, out=source_inds)
+            # Then gather each filled corrector's support for each reading in this chunk from the source witness for its unit
+            # (which is the corrector itself wherever it is extant), a chunk of correctors at a time.
+            # A source witness is either extant at the unit or the start of its chain, so its own support is never overwritten here:
+            col_start = self.reading_offsets[units.start]
+            col_stop = self.reading_offsets[units.stop]
+            col_units = np.repeat(
+                np.arange(units.stop - units.start), np.diff(self.reading_offsets[units.start : units.stop + 1])
+            )
+            cols = np.arange(col_start, col_stop)[np.newaxis, :]
+            rows_per_chunk = self.get_rows_per_chunk(col_stop - col_start)
+            for start in range(0, len(filled_inds), rows_per_chunk):
+                chunk_inds = filled_inds[start : start + rows_per_chunk]
+                self.reading_support[chunk_inds, col_start:col_stop] = self.reading_support[
+                    source_inds[chunk_inds][:, col_units], cols
+                ]
+            self.extant_mask[filled_inds, units] = self.extant_mask[
+                source_inds[filled_inds], np.arange(units.start, units.stop)[np.newaxis, :]
+            ]
         return
 
-    def filter_fragmentary_witnesses(self, xml):
-        """Filters the original witness list and readings by witness dictionary to exclude witnesses whose proportions of extant passages fall below the fragmentary readings threshold."""
-        if self.verbose:
-            print(
-                "Filtering fragmentary witnesses (extant in < %f of all variation units) out of internal witness list and dictionary of witness readings..."
-                % self.fragmentary_threshold
-            )
-        t0 = time.time()
-        fragmentary_witness_set = set()
-        # Proceed for each witness in order:
-        for wit in self.witnesses:
-            wit_id = wit.id
-            # We count the number of variation units at which this witness has an extant (i.e., non-missing) reading:
-            extant_reading_count = 0
-            total_reading_count = len(self.readings_by_witness[wit.id])
-            # Proceed through all reading support lists:
-            for rdg_support in self.readings_by_witness[wit_id]:
-                # If the current reading support list is not all zeroes, then increment this witness's count of extant readings:
-                if sum(rdg_support) != 0:
-                    extant_reading_count += 1
-            # If the proportion of extant readings falls below the threshold, then add this witness to the list of fragmentary witnesses:
-            if extant_reading_count / total_reading_count < self.fragmentary_threshold:
-                fragmentary_witness_set.add(wit_id)
-        # Then filter the witness list to exclude the fragmentary witnesses:
-        filtered_witnesses = [wit for wit in self.witnesses if wit.id not in fragmentary_witness_set]
-        self.witnesses = filtered_witnesses
-        # Then remove the entries for the fragmentary witnesses from the witnesses-to-readings dictionary:
-        for wit_id in fragmentary_witness_set:
-            del self.readings_by_witness[wit_id]
-        t1 = time.time()
-        if self.verbose:
-            print(
-                "Filtered out %d fragmentary witness(es) (%s) in %0.4fs."
-                % (len(fragmentary_witness_set), str(list(fragmentary_witness_set)), t1 - t0)
-            )
-        return
+    def get_proportions_extant(self):
+        """Returns the proportion of variation units at which each witness is extant (i.e., has a non-missing reading).
+
+        Returns:
+            A NumPy array of floats between 0 and 1, with an entry for each witness in the witnesses list.
+        """
+        return np.count_nonzero(self.extant_mask, axis=1) / max(len(self.variation_unit_ids), 1)
+
+    def filter_fragmentary_witnesses(self, xml):
+        """Filters the original witness list and reading support array to exclude witnesses whose proportions of extant passages fall below the fragmentary readings threshold."""
+        if self.verbose:
+            print(
+                "Filtering fragmentary witnesses (extant in < %f of all variation units) out of internal witness list and array of witness readings..."
+                % self.fragmentary_threshold
+            )
+        t0 = time.time()
+        # A witness is fragmentary if the proportion of variation units at which it is extant falls below the threshold:
+        is_kept = self.get_proportions_extant() >= self.fragmentary_threshold
+        fragmentary_witness_set = set(self.witnesses[i].id for i in np.flatnonzero(~is_kept))
+        kept_wit_inds = np.flatnonzero(is_kept)
+        # Then filter the witness list and the rows of the reading support arrays to exclude the fragmentary witnesses:
+        self.witnesses = [self.witnesses[i] for i in kept_wit_inds]
+        self.reading_support = self.take_rows(self.reading_support, kept_wit_inds)
+        self.extant_mask = self.extant_mask[kept_wit_inds]
+        # The rows of these arrays have moved, so rebuild the dictionary mapping witness IDs to their indices
+        # (the siglum resolver keeps its witness IDs, since the filtered witnesses are still valid base witnesses for sigla):
+        self.index_witnesses()
+        self.invalidate_derived_views()
+        t1 = time.time()
+        if self.verbose:
+            print(
+                "Filtered out %d fragmentary witness(es) (%s) in %0.4fs."
+                % (len(fragmentary_witness_set), str(list(fragmentary_witness_set)), t1 - t0)
+            )
+        return
+
+    def get_coverage(self, thresholds: List[float] = None):
+        """Returns the number and proportion of variation units at which each witness is extant,
+        along with the number of witnesses that would remain in the collation for each of a grid of fragmentary thresholds.
+        This can be used to choose a fragmentary threshold without constructing the collation once for each candidate threshold.
+        Note that if this Collation was constructed with a fragmentary threshold, then the witnesses already filtered out are not included.
+
+        Args:
+            thresholds: An optional list of candidate fragmentary thresholds between 0 and 1.
+                If it is not specified, then the thresholds from 0 to 1 in steps of 0.05 are used.
+
+        Returns:
+            A NumPy array of the number of variation units at which each witness is extant.
+            A NumPy array of the proportion of variation units at which each witness is extant.
+            A NumPy array of the candidate thresholds.
+            A NumPy array of the number of witnesses extant at no fewer than each threshold's proportion of variation units.
+        """
+        if thresholds is None:
+            thresholds = np.linspace(0.0, 1.0, 21)
+        thresholds = np.asarray(thresholds, dtype=float)
+        extant_counts = np.count_nonzero(self.extant_mask, axis=1)
+        proportions_extant = self.get_proportions_extant()
+        # A witness remains at a threshold if its proportion is not below it, so count the witnesses below each threshold in the sorted proportions:
+        sorted_proportions = np.sort(proportions_extant)
+        remaining_counts = len(sorted_proportions) - np.searchsorted(sorted_proportions, thresholds, side="left")
+        return extant_counts, proportions_extant, thresholds, remaining_counts
+
+    def to_coverage_table(self, thresholds: List[float] = None):
+        """Returns a table of the coverage of the witnesses in this Collation.
+        Each witness has a row containing the number and proportion of variation units at which it is extant,
+        followed by a column for each of a grid of fragmentary thresholds, containing 1 if the witness would remain in the collation at that threshold and 0 otherwise.
+        A final row contains the number of witnesses that would remain at each threshold.
+
+        Args:
+            thresholds: An optional list of candidate fragmentary thresholds between 0 and 1.
+                If it is not specified, then the thresholds from 0 to 1 in steps of 0.05 are used.
+
+        Returns:
+            A Pandas DataFrame with a row for each witness and a final row for the number of remaining witnesses.
+        """
+        extant_counts, proportions_extant, thresholds, remaining_counts = self.get_coverage(thresholds)
+        row_labels = [wit.id for wit in self.witnesses] + ["remaining"]
+        columns = {
+            "extant": pd.array(extant_counts.tolist() + [None], dtype="Int64"),
+            "proportion": proportions_extant.tolist() + [None],
+        }
+        is_remaining = proportions_extant[:, np.newaxis] >= thresholds[np.newaxis, :]
+        for k, threshold in enumerate(thresholds):
+            columns["%g" % threshold] = pd.array(
+                is_remaining[:, k].astype(int).tolist() + [int(remaining_counts[k])], dtype="Int64"
+            )
+        return pd.DataFrame(columns, index=row_labels)
+
+    def invalidate_derived_views(self):
+        """Discards all views derived from the reading support structures of this Collation, so that they are recomputed on their next use.
+        This must be called whenever the witness list, variation units, or reading support array of this Collation are modified.
+        """
+        # Replace the dictionary rather than clearing it, in case it is shared with a Collation copied from this one:
+        self.derived_views = {}
+        return
+
+    def get_derived_view(self, key, compute):
+        """Returns the derived view stored under the given key, computing it and storing it first if it has not been computed since the last invalidation.
+
+        Args:
+            key: A hashable key identifying the view.
+            compute: A function with no arguments that computes the view.
+
+        Returns:
+            The derived view. It is shared between all callers, so it should not be modified.
+        """
+        if key not in self.derived_views:
+            self.derived_views[key] = compute()
+        return self.derived_views[key]
+
+    def invalidate_witness_views(self):
+        """Discards the derived views of this Collation that depend on its witness list, keeping those that depend only on its variation units."""
+        for key in list(self.derived_views):
+            name = key[0] if isinstance(key, tuple) else key
+            if name in self.witness_dependent_views:
+                del self.derived_views[key]
+        return
+
+    def get_variation_unit_index_by_id(self):
+        """Returns a dictionary mapping the IDs of the variation units to their indices in the variation_unit_ids list.
+
+        Returns:
+            A dictionary mapping variation unit ID strings to int indices.
+        """
+        return self.variation_unit_symbols.index_by_symbol
+
+    def get_indexed_variation_units(self):
+        """Returns a list of the variation units in the variation_unit_ids list, in order, matched to their IDs.
+        A variation unit's index need not be its position in the variation units list, since some variation units may not have been indexed
+        (e.g., if the collation has no witnesses).
+
+        Returns:
+            A list of VariationUnits, with an entry for each variation unit index.
+            It is computed once and shared by all subsequent calls until the derived views of this Collation are invalidated.
+        """
+
+        def compute():
+            variation_unit_by_id = {vu.id: vu for vu in self.variation_units}
+            return [variation_unit_by_id[vu_id] for vu_id in self.variation_unit_ids]
+
+        return self.get_derived_view("indexed_variation_units", compute)
+
+    def get_nstates(self):
+        """Returns the number of substantive readings at each variation unit.
+
+        Returns:
+            An int NumPy array with an entry for each variation unit.
+        """
+        return self.get_derived_view("nstates", lambda: np.diff(self.reading_offsets))
+
+    def get_max_nstates(self):
+        """Returns the maximum number of substantive readings at any variation unit (or 0 if there are no variation units).
+
+        Returns:
+            An int.
+        """
+        return self.get_derived_view(
+            "max_nstates", lambda: int(self.get_nstates().max()) if len(self.variation_unit_ids) > 0 else 0
+        )
+
+    def get_substantive_variation_unit_mask(self, drop_constant: bool = False):
+        """Returns a mask indicating which variation units are substantive.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to exclude variation units with one substantive reading.
+                Default value is False.
+
+        Returns:
+            A boolean NumPy array with an entry for each variation unit.
+        """
+        if not drop_constant:
+            return self.get_derived_view(
+                ("substantive_variation_unit_mask", False), lambda: np.ones(len(self.variation_unit_ids), dtype=bool)
+            )
+        return self.get_derived_view(("substantive_variation_unit_mask", True), lambda: self.get_nstates() > 1)
+
+    def get_substantive_variation_unit_inds(self, drop_constant: bool = False):
+        """Returns the indices of the substantive variation units, in order.
+
+        These indices, like the row indices of witnesses and the column indices of readings in the reading support array,
+        serve as the integer identifiers of variation units in inner loops, so that ID strings only have to be looked up when output is written.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to exclude variation units with one substantive reading.
+                Default value is False.
+
+        Returns:
+            A list of int indices into the list of variation unit IDs.
+        """
+        return self.get_derived_view(
+            ("substantive_variation_unit_inds", drop_constant),
+            lambda: np.flatnonzero(self.get_substantive_variation_unit_mask(drop_constant)).tolist(),
+        )
+
+    def get_substantive_variation_unit_ids(self, drop_constant: bool = False):
+        """Returns the IDs of the substantive variation units, in order.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to exclude variation units with one substantive reading.
+                Default value is False.
+
+        Returns:
+            A list of variation unit ID strings.
+        """
+        return self.get_derived_view(
+            ("substantive_variation_unit_ids", drop_constant),
+            lambda: [self.variation_unit_ids[j] for j in self.get_substantive_variation_unit_inds(drop_constant)],
+        )
+
+    def get_substantive_reading_ids(self, vu_ind: int):
+        """Returns the ID strings of the substantive readings of the variation unit at the given index, in the order of their columns in the reading support array.
+        These are looked up in the reading symbol table, so they should only be needed when output is written.
+
+        Args:
+            vu_ind: The index of a variation unit in the variation_unit_ids list.
+
+        Returns:
+            A list of reading ID strings.
+        """
+        symbols = self.reading_symbols.symbols
+        start = int(self.reading_offsets[vu_ind])
+        stop = int(self.reading_offsets[vu_ind + 1])
+        return [symbols[r] for r in self.reading_symbol_ids[start:stop].tolist()]
+
+    @property
+    def substantive_readings_by_variation_unit_id(self):
+        """A dictionary mapping variation unit ID strings to lists of the ID strings of their substantive readings.
+        This is provided for compatibility; it is materialized from the reading_symbol_ids array on first use."""
+        return self.get_derived_view(
+            "substantive_readings_by_variation_unit_id",
+            lambda: {vu_id: self.get_substantive_reading_ids(j) for j, vu_id in enumerate(self.variation_unit_ids)},
+        )
+
+    @property
+    def substantive_variation_unit_reading_tuples(self):
+        """A list of (variation unit ID, reading ID) tuples for substantive readings, in the order of their columns in the reading support array.
+        This is provided for compatibility; it is materialized from the reading_symbol_ids array on first use."""
+        return self.get_derived_view(
+            "substantive_variation_unit_reading_tuples",
+            lambda: [
+                (vu_id, rdg_id)
+                for j, vu_id in enumerate(self.variation_unit_ids)
+                for rdg_id in self.get_substantive_reading_ids(j)
+            ],
+        )
+
+    def get_substantive_readings(self):
+        """Returns the substantive Readings of each variation unit, in the order of their columns in the reading support array.
+
+        Returns:
+            A list with an entry for each variation unit in the variation_unit_ids list,
+            consisting of the list of its substantive Readings; the reading at index k for the variation unit at index j
+            corresponds to column reading_offsets[j] + k of the reading support array.
+        """
+
+        def compute():
+            substantive_readings = []
+            reading_index_by_symbol = self.reading_symbols.index_by_symbol
+            reading_symbol_ids = self.reading_symbol_ids.tolist()
+            offsets = self.reading_offsets.tolist()
+            for j, vu in enumerate(self.get_indexed_variation_units()):
+                # The substantive readings are in the same order as the readings they come from, so match up their symbol IDs in a single pass:
+                c = offsets[j]
+                readings = []
+                for rdg in vu.readings:
+                    if c < offsets[j + 1] and reading_index_by_symbol.get(rdg.id) == reading_symbol_ids[c]:
+                        readings.append(rdg)
+                        c += 1
+                substantive_readings.append(readings)
+            return substantive_readings
+
+        return self.get_derived_view("substantive_readings", compute)
 
     def get_nexus_symbols(self):
         """Returns a list of one-character symbols needed to represent the states of all substantive readings in NEXUS.
@@ -765,9 +2297,8 @@ class Collation:
         # If there are no witnesses, then no symbols are needed at all:
         if len(self.witnesses) == 0:
             return []
-        wit_id = self.witnesses[0].id
-        for rdg_support in self.readings_by_witness[wit_id]:
-            nsymbols = max(nsymbols, len(rdg_support))
+        if len(self.variation_unit_ids) > 0:
+            nsymbols = self.get_max_nstates()
         nexus_symbols = possible_symbols[:nsymbols]
         return nexus_symbols
 
@@ -804,15 +2335,9 @@ class Collation:
                 MrBayes does not presently support a local clock model, so it will default to a strict clock model if a local clock model is specified.
         """
         # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        substantive_variation_unit_ids = self.get_substantive_variation_unit_ids(drop_constant)
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
+        substantive_readings = self.get_substantive_readings()
         # Start by calculating the values we will be using here:
         ntax = len(self.witnesses)
         nchar = len(substantive_variation_unit_ids)
@@ -845,18 +2370,14 @@ class Collation:
             if char_state_labels:
                 f.write("\tCharStateLabels")
                 vu_ind = 1
-                for vu in self.variation_units:
-                    if vu.id not in substantive_variation_unit_ids_set:
-                        continue
+                for j in substantive_variation_unit_inds:
+                    vu = self.get_indexed_variation_units()[j]
                     if vu_ind == 1:
                         f.write("\n\t\t%d %s /" % (vu_ind, slugify(vu.id, lowercase=False, separator='_')))
                     else:
                         f.write(",\n\t\t%d %s /" % (vu_ind, slugify(vu.id, lowercase=False, separator='_')))
                     rdg_ind = 0
-                    for rdg in vu.readings:
-                        key = tuple([vu.id, rdg.id])
-                        if key not in substantive_variation_unit_reading_tuples_set:
-                            continue
+                    for rdg in substantive_readings[j]:
                         ascii_rdg_text = slugify(
                             rdg.text, lowercase=False, separator='_', replacements=[['η', 'h'], ['ω', 'w']]
                         )
@@ -869,18 +2390,19 @@ class Collation:
                 f.write(";\n")
             # Write the matrix subblock:
             f.write("\tMatrix")
+            offsets = self.reading_offsets.tolist()
             with tqdm(total=len(self.witnesses)) as pbar:
                 for i, wit in enumerate(self.witnesses):
+                    support = self.reading_support[i].tolist()
+                    extant = self.extant_mask[i].tolist()
                     taxlabel = taxlabels[i]
                     if frequency:
                         sequence = "\n\t\t" + taxlabel
-                        for j, vu_id in enumerate(self.variation_unit_ids):
-                            if vu_id not in substantive_variation_unit_ids_set:
-                                continue
-                            rdg_support = self.readings_by_witness[wit.id][j]
+                        for j in substantive_variation_unit_inds:
+                            rdg_support = support[offsets[j] : offsets[j + 1]]
                             sequence += "\n\t\t\t"
                             # If this reading is lacunose in this witness, then use the missing character:
-                            if sum(rdg_support) == 0:
+                            if not extant[j]:
                                 sequence += missing_symbol
                                 continue
                             # Otherwise, print out its frequencies for different readings in parentheses:
@@ -894,12 +2416,10 @@ class Collation:
                         sequence = "\n\t\t" + taxlabel
                         # Add enough space after this label ensure that all sequences are nicely aligned:
                         sequence += " " * (max_taxlabel_length - len(taxlabel) + 1)
-                        for j, vu_id in enumerate(self.variation_unit_ids):
-                            if vu_id not in substantive_variation_unit_ids_set:
-                                continue
-                            rdg_support = self.readings_by_witness[wit.id][j]
+                        for j in substantive_variation_unit_inds:
+                            rdg_support = support[offsets[j] : offsets[j + 1]]
                             # If this reading is lacunose in this witness, then use the missing character:
-                            if sum(rdg_support) == 0:
+                            if not extant[j]:
                                 sequence += missing_symbol
                                 continue
                             rdg_inds = [
@@ -1032,9 +2552,8 @@ class Collation:
         # If there are no witnesses, then no symbols are needed at all:
         if len(self.witnesses) == 0:
             return []
-        wit_id = self.witnesses[0].id
-        for rdg_support in self.readings_by_witness[wit_id]:
-            nsymbols = max(nsymbols, len(rdg_support))
+        if len(self.variation_unit_ids) > 0:
+            nsymbols = self.get_max_nstates()
         hennig86_symbols = possible_symbols[:nsymbols]
         return hennig86_symbols
 
@@ -1047,15 +2566,8 @@ class Collation:
             drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
         """
         # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        substantive_variation_unit_ids = self.get_substantive_variation_unit_ids(drop_constant)
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
         # Start by calculating the values we will be using here:
         ntax = len(self.witnesses)
         nchar = len(substantive_variation_unit_ids)
@@ -1083,17 +2595,18 @@ class Collation:
             # Write the dimensions:
             f.write("%d %d\n" % (nchar, ntax))
             # Now write the matrix:
+            offsets = self.reading_offsets.tolist()
             with tqdm(total=len(self.witnesses)) as pbar:
                 for i, wit in enumerate(self.witnesses):
+                    support = self.reading_support[i].tolist()
+                    extant = self.extant_mask[i].tolist()
                     taxlabel = taxlabels[i]
                     # Add enough space after this label ensure that all sequences are nicely aligned:
                     sequence = taxlabel + (" " * (max_taxlabel_length - len(taxlabel) + 1))
-                    for j, vu_id in enumerate(self.variation_unit_ids):
-                        if vu_id not in substantive_variation_unit_ids_set:
-                            continue
-                        rdg_support = self.readings_by_witness[wit.id][j]
+                    for j in substantive_variation_unit_inds:
+                        rdg_support = support[offsets[j] : offsets[j + 1]]
                         # If this reading is lacunose in this witness, then use the missing character:
-                        if sum(rdg_support) == 0:
+                        if not extant[j]:
                             sequence += missing_symbol
                             continue
                         rdg_inds = [
@@ -1126,9 +2639,8 @@ class Collation:
         # If there are no witnesses, then no symbols are needed at all:
         if len(self.witnesses) == 0:
             return []
-        wit_id = self.witnesses[0].id
-        for rdg_support in self.readings_by_witness[wit_id]:
-            nsymbols = max(nsymbols, len(rdg_support))
+        if len(self.variation_unit_ids) > 0:
+            nsymbols = self.get_max_nstates()
         phylip_symbols = possible_symbols[:nsymbols]
         return phylip_symbols
 
@@ -1141,15 +2653,8 @@ class Collation:
             drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
         """
         # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        substantive_variation_unit_ids = self.get_substantive_variation_unit_ids(drop_constant)
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
         # Start by calculating the values we will be using here:
         ntax = len(self.witnesses)
         nchar = len(substantive_variation_unit_ids)
@@ -1170,16 +2675,17 @@ class Collation:
             # Write the dimensions:
             f.write("%d %d\n" % (ntax, nchar))
             # Now write the matrix:
+            offsets = self.reading_offsets.tolist()
             for i, wit in enumerate(self.witnesses):
+                support = self.reading_support[i].tolist()
+                extant = self.extant_mask[i].tolist()
                 taxlabel = taxlabels[i]
                 # Add enough space after this label ensure that all sequences are nicely aligned:
                 sequence = taxlabel + (" " * (max_taxlabel_length - len(taxlabel))) + "\t"
-                for j, vu_id in enumerate(self.variation_unit_ids):
-                    if vu_id not in substantive_variation_unit_ids_set:
-                        continue
-                    rdg_support = self.readings_by_witness[wit.id][j]
+                for j in substantive_variation_unit_inds:
+                    rdg_support = support[offsets[j] : offsets[j + 1]]
                     # If this reading is lacunose in this witness, then use the missing character:
-                    if sum(rdg_support) == 0:
+                    if not extant[j]:
                         sequence += missing_symbol
                         continue
                     rdg_inds = [
@@ -1210,9 +2716,8 @@ class Collation:
         # If there are no witnesses, then no symbols are needed at all:
         if len(self.witnesses) == 0:
             return []
-        wit_id = self.witnesses[0].id
-        for rdg_support in self.readings_by_witness[wit_id]:
-            nsymbols = max(nsymbols, len(rdg_support))
+        if len(self.variation_unit_ids) > 0:
+            nsymbols = self.get_max_nstates()
         fasta_symbols = possible_symbols[:nsymbols]
         return fasta_symbols
 
@@ -1225,15 +2730,8 @@ class Collation:
             drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
         """
         # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        substantive_variation_unit_ids = self.get_substantive_variation_unit_ids(drop_constant)
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
         # Start by calculating the values we will be using here:
         ntax = len(self.witnesses)
         nchar = len(substantive_variation_unit_ids)
@@ -1252,17 +2750,18 @@ class Collation:
         Path(file_addr).parent.mkdir(parents=True, exist_ok=True)
         with open(file_addr, "w", encoding="ascii") as f:
             # Now write the matrix:
+            offsets = self.reading_offsets.tolist()
             with tqdm(total=len(self.witnesses)) as pbar:
                 for i, wit in enumerate(self.witnesses):
+                    support = self.reading_support[i].tolist()
+                    extant = self.extant_mask[i].tolist()
                     taxlabel = taxlabels[i]
                     # Add enough space after this label ensure that all sequences are nicely aligned:
                     sequence = ">%s\n" % taxlabel
-                    for j, vu_id in enumerate(self.variation_unit_ids):
-                        if vu_id not in substantive_variation_unit_ids_set:
-                            continue
-                        rdg_support = self.readings_by_witness[wit.id][j]
+                    for j in substantive_variation_unit_inds:
+                        rdg_support = support[offsets[j] : offsets[j + 1]]
                         # If this reading is lacunose in this witness, then use the missing character:
-                        if sum(rdg_support) == 0:
+                        if not extant[j]:
                             sequence += missing_symbol
                             continue
                         rdg_inds = [
@@ -1294,9 +2793,8 @@ class Collation:
         # If there are no witnesses, then no symbols are needed at all:
         if len(self.witnesses) == 0:
             return []
-        wit_id = self.witnesses[0].id
-        for rdg_support in self.readings_by_witness[wit_id]:
-            nsymbols = max(nsymbols, len(rdg_support))
+        if len(self.variation_unit_ids) > 0:
+            nsymbols = self.get_max_nstates()
         beast_symbols = possible_symbols[:nsymbols]
         return beast_symbols
 
@@ -1404,20 +2902,17 @@ class Collation:
         Returns:
             A string containing comma-separated code mappings.
         """
-        vu = self.variation_units[vu_ind]
-        vu_id = vu.id
+        nstates = int(self.get_nstates()[vu_ind])
         code_map = {}
-        for k in range(len(self.substantive_readings_by_variation_unit_id[vu.id])):
+        for k in range(nstates):
             code_map[symbols[k]] = str(k)
         # If this site is a singleton site, then add a code mapping for the dummy state:
-        if len(self.substantive_readings_by_variation_unit_id[vu.id]) == 1:
+        if nstates == 1:
             code_map[symbols[1]] = str(1)
         # Then add a mapping for the missing state, including a dummy state if this is a singleton site:
-        code_map[missing_symbol] = " ".join(
-            str(k) for k in range(len(self.substantive_readings_by_variation_unit_id[vu.id]))
-        )
+        code_map[missing_symbol] = " ".join(str(k) for k in range(nstates))
         # If this site is a singleton site, then add the dummy state to the missing state mapping:
-        if len(self.substantive_readings_by_variation_unit_id[vu.id]) == 1:
+        if nstates == 1:
             code_map[missing_symbol] = code_map[missing_symbol] + " " + str(1)
         # Then combine all of the mappings into a single string:
         code_map_string = ", ".join([code + "=" + code_map[code] for code in code_map])
@@ -1434,15 +2929,12 @@ class Collation:
         Returns:
             A string containing space-separated equilibrium frequencies.
         """
-        vu = self.variation_units[vu_ind]
-        vu_id = vu.id
+        nstates = int(self.get_nstates()[vu_ind])
         # If this unit is a singleton, then return the string "0.5 0.5":
-        if len(self.substantive_readings_by_variation_unit_id[vu_id]) == 1:
+        if nstates == 1:
             return "0.5 0.5"
         # Otherwise, set the equilibrium frequencies according to a uniform distribution:
-        equilibrium_frequencies = [1.0 / len(self.substantive_readings_by_variation_unit_id[vu_id])] * len(
-            self.substantive_readings_by_variation_unit_id[vu_id]
-        )
+        equilibrium_frequencies = [1.0 / nstates] * nstates
         equilibrium_frequencies_string = " ".join([str(w) for w in equilibrium_frequencies])
         return equilibrium_frequencies_string
 
@@ -1458,23 +2950,23 @@ class Collation:
         Returns:
             A string containing space-separated root frequencies.
         """
-        vu = self.variation_units[vu_ind]
-        vu_id = vu.id
+        vu = self.get_indexed_variation_units()[vu_ind]
+        nstates = int(self.get_nstates()[vu_ind])
         intrinsic_relations = vu.intrinsic_relations
         intrinsic_odds_by_id = self.intrinsic_odds_by_id
         # If this unit is a singleton, then return the string "1 0":
-        if len(self.substantive_readings_by_variation_unit_id[vu_id]) == 1:
+        if nstates == 1:
             return "1 0"
         # If this unit has no intrinsic odds, then assume a uniform distribution over all readings:
         if len(intrinsic_relations) == 0:
-            root_frequencies = [1.0 / len(self.substantive_readings_by_variation_unit_id[vu_id])] * len(
-                self.substantive_readings_by_variation_unit_id[vu_id]
-            )
+            root_frequencies = [1.0 / nstates] * nstates
             root_frequencies_string = " ".join([str(w) for w in root_frequencies])
             return root_frequencies_string
-        # We will populate the root frequencies based on the intrinsic odds of the readings:
+        # We will populate the root frequencies based on the intrinsic odds of the readings,
+        # which are keyed by the ID strings of the readings:
+        substantive_reading_ids = self.get_substantive_reading_ids(vu_ind)
         root_frequencies_by_id = {}
-        for rdg_id in self.substantive_readings_by_variation_unit_id[vu_id]:
+        for rdg_id in substantive_reading_ids:
             root_frequencies_by_id[rdg_id] = 0
         # First, construct an adjacency list for efficient edge iteration:
         neighbors_by_source = {}
@@ -1516,9 +3008,7 @@ class Collation:
         for starting_node in starting_nodes:
             update_root_frequencies(starting_node)
         # Then produce a normalized vector of root frequencies that corresponds to a probability distribution:
-        root_frequencies = [
-            root_frequencies_by_id[rdg_id] for rdg_id in self.substantive_readings_by_variation_unit_id[vu_id]
-        ]
+        root_frequencies = [root_frequencies_by_id[rdg_id] for rdg_id in substantive_reading_ids]
         total_frequencies = sum(root_frequencies)
         for k in range(len(root_frequencies)):
             root_frequencies[k] = root_frequencies[k] / total_frequencies
@@ -1542,17 +3032,10 @@ class Collation:
             ancestral_logger: An AncestralLogger option indicating which class of logger (if any) to use for ancestral states.
             seed: A seed for random number generation (for setting initial values of unspecified transcriptional rates).
         """
-        # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        # Populate sets of substantive variation unit IDs and substantive variant reading tuples:
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        # Populate a list of sites that will correspond to columns of the sequence alignment
+        # and a set of substantive variant reading tuples:
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
+        substantive_readings = self.get_substantive_readings()
         # First, calculate the values we will be using for the main template:
         taxlabels = [slugify(wit.id, lowercase=False, separator='_') for wit in self.witnesses]
         missing_symbol = '?'
@@ -1576,13 +3059,13 @@ class Collation:
                 witness_object["max_date"] = wit.date_range[1]
                 # Populate its sequence from its entries in the witness's readings dictionary:
                 sequence = ""
-                for j, rdg_support in enumerate(self.readings_by_witness[wit.id]):
-                    vu_id = self.variation_unit_ids[j]
-                    # Skip any variation units deemed non-substantive:
-                    if vu_id not in substantive_variation_unit_ids:
-                        continue
+                extant = self.extant_mask[i].tolist()
+                witness_reading_support = self.get_witness_reading_support(i)
+                # Skip any variation units deemed non-substantive:
+                for j in substantive_variation_unit_inds:
+                    rdg_support = witness_reading_support[j]
                     # If this witness has a certainty of 0 for all readings, then it is a gap; assign a likelihood of 1 to each reading:
-                    if sum(rdg_support) == 0:
+                    if not extant[j]:
                         for k, w in enumerate(rdg_support):
                             sequence += "1"
                             if k < len(rdg_support) - 1:
@@ -1593,10 +3076,10 @@ class Collation:
                                 else:
                                     # If this site is a singleton site, then add a dummy state:
                                     sequence += ", 0; "
-                    # Otherwise, read the probabilities as they are given:
+                    # Otherwise, read the probabilities as they are given (writing whole-number coefficients without a decimal point):
                     else:
                         for k, w in enumerate(rdg_support):
-                            sequence += str(w)
+                            sequence += str(int(w)) if w.is_integer() else str(w)
                             if k < len(rdg_support) - 1:
                                 sequence += ", "
                             else:
@@ -1612,41 +3095,33 @@ class Collation:
                 witness_objects.append(witness_object)
                 pbar.update(1)
         # Then proceed to variation units:
-        for j, vu in enumerate(self.variation_units):
-            if vu.id not in substantive_variation_unit_ids_set:
-                continue
+        nstates_by_unit = self.get_nstates().tolist()
+        for j in substantive_variation_unit_inds:
+            vu = self.get_indexed_variation_units()[j]
+            nstates = nstates_by_unit[j]
             variation_unit_object = {}
             # Copy the one-based index of this variation unit:
             variation_unit_object["index"] = j + 1
             # Copy the ID of this variation unit:
             variation_unit_object["id"] = vu.id
             # Set a flag indicating if this variation unit is constant:
-            variation_unit_object["is_constant"] = (
-                True if len(self.substantive_readings_by_variation_unit_id[vu.id]) == 1 else False
-            )
+            variation_unit_object["is_constant"] = True if nstates == 1 else False
             # Copy this variation unit's number of substantive readings,
             # setting it to 2 if it is a singleton unit:
-            variation_unit_object["nstates"] = (
-                len(self.substantive_readings_by_variation_unit_id[vu.id])
-                if len(self.substantive_readings_by_variation_unit_id[vu.id]) > 1
-                else 2
-            )
+            variation_unit_object["nstates"] = nstates if nstates > 1 else 2
             # Then construct the code map for this unit:
             variation_unit_object["code_map"] = self.get_beast_code_map_for_unit(symbols, missing_symbol, j)
             # Then populate a comma-separated string of reading labels for this unit:
             rdg_texts = []
             vu_label = vu.id
-            for rdg in vu.readings:
-                key = tuple([vu.id, rdg.id])
-                if key not in substantive_variation_unit_reading_tuples_set:
-                    continue
+            for rdg in substantive_readings[j]:
                 rdg_text = slugify(rdg.text, lowercase=False, allow_unicode=True, separator='_')
                 # Replace any empty reading text with an omission marker:
                 if rdg_text == "":
                     rdg_text = "om."
                 rdg_texts.append(rdg_text)
             # If this site is a singleton site, then add a dummy reading for the dummy state:
-            if len(self.substantive_readings_by_variation_unit_id[vu.id]) == 1:
+            if nstates == 1:
                 rdg_texts.append("DUMMY")
             rdg_texts_string = ", ".join(rdg_texts)
             variation_unit_object["rdg_texts"] = rdg_texts_string
@@ -1662,21 +3137,22 @@ class Collation:
                 epoch_height_ranges.append((None, None))
                 rate_objects_by_epoch_height_range[(None, None)] = []
                 rate_objects = rate_objects_by_epoch_height_range[(None, None)]
-                if len(self.substantive_readings_by_variation_unit_id[vu.id]) == 1:
+                if nstates == 1:
                     # If this is a singleton site, then use an arbitrary 2x2 rate matrix:
                     rate_objects.append({"transcriptional_categories": ["default"], "expression": None})
                     rate_objects.append({"transcriptional_categories": ["default"], "expression": None})
                 else:
                     # If this is a site with multiple substantive readings, but no transcriptional relations list,
                     # then use a Lewis Mk substitution matrix with the appropriate number of states:
-                    for k_1, rdg_id_1 in enumerate(self.substantive_readings_by_variation_unit_id[vu.id]):
-                        for k_2, rdg_id_2 in enumerate(self.substantive_readings_by_variation_unit_id[vu.id]):
+                    for k_1 in range(nstates):
+                        for k_2 in range(nstates):
                             # Skip diagonal elements:
                             if k_1 == k_2:
                                 continue
                             rate_objects.append({"transcriptional_categories": ["default"], "expression": None})
             else:
-                # Otherwise, proceed for every date range:
+                # Otherwise, proceed for every date range, looking up the transcriptional relations by the ID strings of the readings:
+                substantive_reading_ids = self.get_substantive_reading_ids(j)
                 for date_range in vu.transcriptional_relations_by_date_range:
                     # Get the map of transcriptional relations for reference later:
                     transcriptional_relations = vu.transcriptional_relations_by_date_range[date_range]
@@ -1689,8 +3165,8 @@ class Collation:
                     rate_objects_by_epoch_height_range[epoch_height_range] = []
                     rate_objects = rate_objects_by_epoch_height_range[epoch_height_range]
                     # Then proceed for every pair of readings in this unit:
-                    for k_1, rdg_id_1 in enumerate(self.substantive_readings_by_variation_unit_id[vu.id]):
-                        for k_2, rdg_id_2 in enumerate(self.substantive_readings_by_variation_unit_id[vu.id]):
+                    for k_1, rdg_id_1 in enumerate(substantive_reading_ids):
+                        for k_2, rdg_id_2 in enumerate(substantive_reading_ids):
                             # Skip diagonal elements:
                             if k_1 == k_2:
                                 continue
@@ -1809,72 +3285,316 @@ class Collation:
             A list of witness ID strings.
         """
         # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
+        substantive_readings = self.get_substantive_readings()
         # Initialize the output array with the appropriate dimensions:
         reading_labels = []
-        for vu in self.variation_units:
-            if vu.id not in substantive_variation_unit_ids_set:
-                continue
-            for rdg in vu.readings:
-                key = tuple([vu.id, rdg.id])
-                if key in substantive_variation_unit_reading_tuples_set:
-                    reading_labels.append(vu.id + ", " + rdg.text)
+        for j in substantive_variation_unit_inds:
+            vu_id = self.variation_unit_ids[j]
+            for rdg in substantive_readings[j]:
+                reading_labels.append(vu_id + ", " + rdg.text)
         witness_labels = [wit.id for wit in self.witnesses]
         matrix = np.zeros((len(reading_labels), len(witness_labels)), dtype=float)
-        # For each variation unit, keep a record of the proportion of non-missing witnesses supporting the substantive variant readings:
-        support_proportions_by_unit = {}
-        for j, vu_id in enumerate(self.variation_unit_ids):
-            if vu_id not in substantive_variation_unit_ids_set:
-                continue
-            support_proportions = [0.0] * len(self.substantive_readings_by_variation_unit_id[vu_id])
-            for i, wit in enumerate(self.witnesses):
-                rdg_support = self.readings_by_witness[wit.id][j]
-                for l, w in enumerate(rdg_support):
-                    support_proportions[l] += w
-            norm = (
-                sum(support_proportions) if sum(support_proportions) > 0 else 1.0
-            )  # if this variation unit has no extant witnesses (e.g., if its only witnesses are fragmentary and we have excluded them), then assume a norm of 1 to avoid division by zero
-            for l in range(len(support_proportions)):
-                support_proportions[l] = support_proportions[l] / norm
-            support_proportions_by_unit[vu_id] = support_proportions
-        # Then populate it with the appropriate values:
-        col_ind = 0
-        with tqdm(total=len(self.witnesses)) as pbar:
-            for i, wit in enumerate(self.witnesses):
-                row_ind = 0
-                for j, vu_id in enumerate(self.variation_unit_ids):
-                    if vu_id not in substantive_variation_unit_ids_set:
-                        continue
-                    rdg_support = self.readings_by_witness[wit.id][j]
-                    # If this reading support vector sums to 0, then this is missing data; handle it as specified:
-                    if sum(rdg_support) == 0:
-                        if split_missing == SplitMissingType.uniform:
-                            for l in range(len(rdg_support)):
-                                matrix[row_ind, col_ind] = 1 / len(rdg_support)
-                                row_ind += 1
-                        elif split_missing == SplitMissingType.proportional:
-                            for l in range(len(rdg_support)):
-                                matrix[row_ind, col_ind] = support_proportions_by_unit[vu_id][l]
-                                row_ind += 1
-                        else:
-                            row_ind += len(rdg_support)
-                    # Otherwise, add its coefficients normally:
-                    else:
-                        for l in range(len(rdg_support)):
-                            matrix[row_ind, col_ind] = rdg_support[l]
-                            row_ind += 1
-                col_ind += 1
+        # Then populate it one variation unit at a time, copying the unit's columns of the reading support array into its rows:
+        offsets = self.reading_offsets.tolist()
+        row_ind = 0
+        with tqdm(total=len(substantive_variation_unit_inds)) as pbar:
+            for j in substantive_variation_unit_inds:
+                vu_id = self.variation_unit_ids[j]
+                nreadings = offsets[j + 1] - offsets[j]
+                unit_matrix = matrix[row_ind : row_ind + nreadings]
+                unit_matrix[:] = self.reading_support[:, offsets[j] : offsets[j + 1]].T
+                row_ind += nreadings
+                # If any witnesses are missing at this unit, then handle them as specified:
+                missing = ~self.extant_mask[:, j]
+                if nreadings > 0 and split_missing == SplitMissingType.uniform:
+                    unit_matrix[:, missing] = 1 / nreadings
+                elif nreadings > 0 and split_missing == SplitMissingType.proportional:
+                    # Split their contributions according to the proportion of non-missing witnesses supporting the substantive variant readings:
+                    support_proportions = unit_matrix.sum(axis=1)
+                    norm = (
+                        support_proportions.sum() if support_proportions.sum() > 0 else 1.0
+                    )  # if this variation unit has no extant witnesses (e.g., if its only witnesses are fragmentary and we have excluded them), then assume a norm of 1 to avoid division by zero
+                    unit_matrix[:, missing] = (support_proportions / norm)[:, np.newaxis]
                 pbar.update(1)
         return matrix, reading_labels, witness_labels
 
+    def get_reading_bitsets(self, drop_constant: bool = False):
+        """Returns a packed representation of the readings of the witnesses in this Collation,
+        with which agreements, disagreements, and shared extant variation units between witnesses can be counted over whole 64-bit words.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
+                Default value is False.
+
+        Returns:
+            A ReadingBitsets instance for the substantive variation units.
+            It is computed once and shared by all subsequent calls until the derived views of this Collation are invalidated.
+        """
+
+        def compute():
+            if self.verbose:
+                print("Packing witness readings into bitsets...")
+            t0 = time.time()
+            unit_inds = np.flatnonzero(self.get_substantive_variation_unit_mask(drop_constant))
+            bitsets = ReadingBitsets(
+                self.reading_support,
+                self.reading_offsets,
+                self.extant_mask,
+                unit_inds,
+                chunk_size=self.array_chunk_size,
+            )
+            t1 = time.time()
+            if self.verbose:
+                print(
+                    "Packed readings for %d witnesses over %d variation units (%d with ambiguous readings) in %0.4fs."
+                    % (len(self.witnesses), len(unit_inds), len(bitsets.ambiguous_supports), t1 - t0)
+                )
+            return bitsets
+
+        return self.get_derived_view(("reading_bitsets", drop_constant), compute)
+
+    def get_agreement_counts(self, drop_constant: bool = False):
+        """Returns the pairwise agreement, disagreement, and shared extant variation unit counts of the witnesses in this Collation,
+        computed with matrix multiplication over binary witness-by-reading support matrices.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
+                Default value is False.
+
+        Returns:
+            An AgreementCounts instance for the substantive variation units.
+            It is computed once and shared by all subsequent calls until the derived views of this Collation are invalidated.
+        """
+
+        def compute():
+            if self.verbose:
+                print("Counting agreements between witnesses...")
+            t0 = time.time()
+            unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
+            agreement_counts = AgreementCounts(
+                self.reading_support,
+                self.reading_offsets,
+                self.extant_mask,
+                unit_inds,
+                chunk_size=self.array_chunk_size,
+            )
+            t1 = time.time()
+            if self.verbose:
+                print(
+                    "Counted agreements for %d witnesses over %d variation units in %0.4fs."
+                    % (len(self.witnesses), len(unit_inds), t1 - t0)
+                )
+            return agreement_counts
+
+        return self.get_derived_view(("agreement_counts", drop_constant), compute)
+
+    def get_agreement_counts_tile(self, drop_constant: bool = False, row_block: slice = None, col_block: slice = None):
+        """Returns the pairwise agreement, disagreement, and shared extant variation unit counts of the witnesses in a tile of witness pairs,
+        reading the reading support array in blocks of variation units that fit within the memory budget of this Collation.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
+                Default value is False.
+            row_block (slice, optional): An optional slice of the witnesses for the rows of the tile. If it is not specified, then all witnesses are included.
+            col_block (slice, optional): An optional slice of the witnesses for the columns of the tile. If it is not specified, then it is the same as the row block.
+
+        Returns:
+            An AgreementCounts instance for the tile.
+        """
+        return AgreementCounts(
+            self.reading_support,
+            self.reading_offsets,
+            self.extant_mask,
+            self.get_substantive_variation_unit_inds(drop_constant),
+            chunk_size=self.get_tile_chunk_size(),
+            row_block=row_block,
+            col_block=col_block,
+        )
+
+    def get_tiled_agreement_matrix(self, count_tile, drop_constant: bool = False, show_ext: bool = False):
+        """Assembles a witness-to-witness matrix of counts from the AgreementCounts of tiles of witness pairs, within the memory budget of this Collation.
+        If the matrix of shared extant variation units is also needed and has not been computed yet, then it is assembled from the same tiles,
+        so that each tile's counts are only computed once, and it is stored as a derived view for the get_ext_matrix method to share.
+
+        Args:
+            count_tile: A function that takes an AgreementCounts instance for a tile and returns the tile of the matrix as a NumPy array.
+            drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
+                Default value is False.
+            show_ext (bool, optional): An optional flag indicating whether or not the matrix of shared extant variation units is also needed.
+                Default value is False.
+
+        Returns:
+            A NumPy array (or memory-mapped array) with a row and column for each witness.
+            A NumPy array (or memory-mapped array) of the number of variation units shared by each pair of witnesses, or None if show_ext is not set.
+        """
+        if not show_ext or ("ext_matrix", drop_constant) in self.derived_views:
+            matrix = self.get_witness_matrix(
+                lambda row_block, col_block: count_tile(
+                    self.get_agreement_counts_tile(drop_constant, row_block, col_block)
+                ),
+                dtype=int,
+            )
+            return matrix, self.get_ext_matrix(drop_constant=drop_constant) if show_ext else None
+
+        def compute_tiles(row_block, col_block):
+            agreement_counts = self.get_agreement_counts_tile(drop_constant, row_block, col_block)
+            return count_tile(agreement_counts), agreement_counts.shared_extant
+
+        matrix, ext_matrix = self.get_witness_matrices(compute_tiles, [int, int])
+        self.get_derived_view(("ext_matrix", drop_constant), lambda: ext_matrix)
+        return matrix, self.get_ext_matrix(drop_constant=drop_constant)
+
+    def get_missing_reading_support(self, drop_constant: bool = False, split_missing: SplitMissingType = None):
+        """Returns the normalized reading support that a witness missing at each substantive variation unit contributes, as specified by the split_missing option.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
+                Default value is False.
+            split_missing (SplitMissingType, optional): An option indicating whether or not to treat missing characters/variation units as having a contribution of 1 split over all states/readings.
+                If not specified, then missing data is ignored (i.e., all states are 0).
+                If "uniform", then the contribution of 1 is divided evenly over all substantive readings.
+                If "proportional", then the contribution of 1 is divided between the readings in proportion to their support among the witnesses that are not missing.
+
+        Returns:
+            A float NumPy array with an entry for each substantive reading of each substantive variation unit, or None if split_missing is not specified.
+            It is computed once and shared by all subsequent calls until the derived views of this Collation are invalidated.
+        """
+        if split_missing is None:
+            return None
+
+        def compute():
+            unit_inds, widths, unit_offsets, cols = get_unit_columns(
+                self.reading_offsets, self.get_substantive_variation_unit_inds(drop_constant)
+            )
+            col_units = np.repeat(np.arange(len(unit_inds)), widths)
+            if split_missing == SplitMissingType.uniform:
+                return 1 / widths[col_units]
+            # Otherwise, sum the support for each reading over all witnesses, reading the reading support array a block of columns at a time:
+            support_proportions = np.zeros(len(cols), dtype=float)
+            cols_per_chunk = max(1, self.array_chunk_size // max(len(self.witnesses), 1))
+            for chunk_start in range(0, len(cols), cols_per_chunk):
+                chunk_cols = cols[chunk_start : chunk_start + cols_per_chunk]
+                support_proportions[chunk_start : chunk_start + len(chunk_cols)] = self.reading_support[
+                    :, chunk_cols
+                ].sum(axis=0, dtype=float)
+            # Then normalize these sums within each unit
+            # (if a variation unit has no extant witnesses (e.g., if its only witnesses are fragmentary and we have excluded them), then assume a norm of 1 to avoid division by zero):
+            norms = get_unit_sums(support_proportions[np.newaxis, :], unit_offsets)[0]
+            norms[norms == 0] = 1.0
+            return support_proportions / norms[col_units]
+
+        return self.get_derived_view(("missing_reading_support", drop_constant, split_missing), compute)
+
+    def iter_normalized_reading_support(
+        self, drop_constant: bool = False, split_missing: SplitMissingType = None, row_block: slice = None
+    ):
+        """Yields the reading support of the witnesses in this Collation at the substantive variation units, normalized to sum to 1 in each unit,
+        in blocks of variation units, so that only a block of the reading support array is read into memory at a time.
+        Witnesses that are missing at a unit contribute nothing there, unless the split_missing option specifies otherwise.
+        If a block of witnesses is specified, then the blocks of variation units are sized for a tile of a witness-to-witness matrix (see the get_witness_matrix method),
+        so that they are the same for every block of witnesses.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
+                Default value is False.
+            split_missing (SplitMissingType, optional): An option indicating whether or not to treat missing characters/variation units as having a contribution of 1 split over all states/readings.
+                If not specified, then missing data is ignored (i.e., all states are 0).
+                If "uniform", then the contribution of 1 is divided evenly over all substantive readings.
+                If "proportional", then the contribution of 1 is divided between the readings in proportion to their support among the witnesses that are not missing.
+            row_block (slice, optional): An optional slice of the witnesses whose reading support should be yielded. If it is not specified, then all witnesses are included.
+
+        Yields:
+            An int NumPy array of the column offsets of the variation units in the block, ending with the number of columns.
+            A slice of the block's columns among the substantive readings of all substantive variation units.
+            A float NumPy array with a row for each witness (in the block of witnesses) and a column for each substantive reading in the block.
+        """
+        unit_inds, widths, unit_offsets, cols = get_unit_columns(
+            self.reading_offsets, self.get_substantive_variation_unit_inds(drop_constant)
+        )
+        missing_reading_support = self.get_missing_reading_support(drop_constant, split_missing)
+        if row_block is None:
+            row_block = slice(None)
+            nrows = len(self.witnesses)
+            chunk_size = self.array_chunk_size
+        else:
+            # Size the blocks of variation units for a tile's row and column blocks together:
+            nrows = 2 * self.get_witness_block_size()
+            chunk_size = self.get_tile_chunk_size()
+        units_per_chunk = max(1, chunk_size // max(nrows * int(widths.max(initial=1)), 1))
+        for chunk_start in range(0, len(unit_inds), units_per_chunk):
+            chunk_end = min(chunk_start + units_per_chunk, len(unit_inds))
+            start, end = unit_offsets[chunk_start], unit_offsets[chunk_end]
+            chunk_offsets = unit_offsets[chunk_start : chunk_end + 1] - start
+            col_units = np.repeat(np.arange(chunk_end - chunk_start), widths[chunk_start:chunk_end])
+            supports = self.reading_support[row_block][:, cols[start:end]].astype(float)
+            norms = get_unit_sums(supports, chunk_offsets)
+            # If a reading support vector sums to 0, then this is missing data; otherwise, the data is present, though it may be ambiguous:
+            missing = norms == 0
+            norms[missing] = 1.0
+            supports /= norms[:, col_units]
+            if missing_reading_support is not None:
+                supports = np.where(missing[:, col_units], missing_reading_support[start:end], supports)
+            yield chunk_offsets, slice(start, end), supports
+
+    def iter_normalized_reading_support_tile(
+        self,
+        drop_constant: bool = False,
+        split_missing: SplitMissingType = None,
+        row_block: slice = None,
+        col_block: slice = None,
+    ):
+        """Yields the normalized reading support of the witnesses in the row and column blocks of a tile of a witness-to-witness matrix,
+        in the same blocks of variation units (see the iter_normalized_reading_support method).
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
+                Default value is False.
+            split_missing (SplitMissingType, optional): An option indicating how missing witnesses contribute to the reading support,
+                as in the iter_normalized_reading_support method.
+            row_block (slice, optional): An optional slice of the witnesses for the rows of the tile. If it is not specified, then all witnesses are included.
+            col_block (slice, optional): An optional slice of the witnesses for the columns of the tile. If it is not specified, then it is the same as the row block.
+
+        Yields:
+            An int NumPy array of the column offsets of the variation units in the block, ending with the number of columns.
+            A slice of the block's columns among the substantive readings of all substantive variation units.
+            A float NumPy array with a row for each witness in the row block and a column for each substantive reading in the block.
+            A float NumPy array with a row for each witness in the column block and a column for each substantive reading in the block,
+            or None if the column block is the same as the row block.
+        """
+        row_chunks = self.iter_normalized_reading_support(drop_constant, split_missing, row_block)
+        if col_block is None:
+            for chunk_offsets, chunk_cols, supports in row_chunks:
+                yield chunk_offsets, chunk_cols, supports, None
+            return
+        col_chunks = self.iter_normalized_reading_support(drop_constant, split_missing, col_block)
+        for (chunk_offsets, chunk_cols, supports), (_, _, col_supports) in zip(row_chunks, col_chunks):
+            yield chunk_offsets, chunk_cols, supports, col_supports
+
+    def get_sampling_probabilities(self, drop_constant: bool = False, split_missing: SplitMissingType = None):
+        """Returns the probability of sampling each substantive reading at its variation unit from the witnesses in this Collation.
+        Where any witness is ambiguous, it contributes to its potential readings' sampling probabilities in proportion to its degrees of support for those readings.
+
+        Args:
+            drop_constant (bool, optional): An optional flag indicating whether to ignore variation units with one substantive reading.
+                Default value is False.
+            split_missing (SplitMissingType, optional): An option indicating how missing witnesses contribute to the sampling probabilities,
+                as in the iter_normalized_reading_support method.
+
+        Returns:
+            A float NumPy array with an entry for each substantive reading of each substantive variation unit.
+        """
+        unit_inds, widths, unit_offsets, cols = get_unit_columns(
+            self.reading_offsets, self.get_substantive_variation_unit_inds(drop_constant)
+        )
+        sampling_probabilities = np.zeros(len(cols), dtype=float)
+        for chunk_offsets, chunk_cols, supports in self.iter_normalized_reading_support(drop_constant, split_missing):
+            sampling_probabilities[chunk_cols] = supports.sum(axis=0)
+        # If a variation unit has no extant witnesses (e.g., if its only witnesses are fragmentary and we have excluded them), then assume a norm of 1 to avoid division by zero:
+        norms = get_unit_sums(sampling_probabilities[np.newaxis, :], unit_offsets)[0]
+        norms[norms == 0] = 1.0
+        return sampling_probabilities / norms[np.repeat(np.arange(len(unit_inds)), widths)]
+
     def get_ext_matrix(self, drop_constant: bool = False, split_missing: SplitMissingType = None):
         """Returns a NumPy matrix containing a row and column for each witness and the number of variation units shared by the row and column witnesses in each cell.
         Note that if the split_missing option is specified, all variation units are counted.
@@ -1889,50 +3609,50 @@ class Collation:
 
         Returns:
             A NumPy matrix with a row and column for each witness and the number of variation units shared by the row and column witnesses in each cell.
+            The counts are computed once (in tiles, if this Collation has a memory budget) and copied by all subsequent calls
+            until the derived views of this Collation are invalidated.
         """
-        # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        # Then initialize the output matrix:
-        witness_labels = [wit.id for wit in self.witnesses]
-        ext_matrix = ext_matrix = np.full((len(witness_labels), len(witness_labels)), 0, dtype=int)
         # If the split_missing option has been specified, then all entries in the matrix will be the number of substantive variation units,
         # so we can just fill the matrix with this value and return it:
         if split_missing is not None:
-            ext_matrix = ext_matrix = np.full(
-                (len(witness_labels), len(witness_labels)), len(substantive_variation_unit_ids), dtype=int
+            ext_matrix = np.full(
+                (len(self.witnesses), len(self.witnesses)),
+                len(self.get_substantive_variation_unit_inds(drop_constant)),
+                dtype=int,
             )
             return ext_matrix
-        # Otherwise, populate the matrix for all pairs of witnesses:
-        with tqdm(total=len(self.witnesses) ** 2) as pbar:
-            # Then calculate the mutual information contribution for each pair of witnesses:
-            for i, wit_1 in enumerate(witness_labels):
-                for j, wit_2 in enumerate(witness_labels):
-                    shared_ext_units = 0
-                    # The contribution to the entry for these witnesses will be identical regardless of the order in which they are specified,
-                    # so we only have to calculate it once:
-                    if i > j:
-                        pbar.update(1)
-                        continue
-                    # Otherwise, calculate the number of substantive variation units at which both of these witnesses are extant:
-                    for k, vu_id in enumerate(self.variation_unit_ids):
-                        if vu_id not in substantive_variation_unit_ids_set:
-                            continue
-                        wit_1_rdg_support = self.readings_by_witness[wit_1][k]
-                        wit_2_rdg_support = self.readings_by_witness[wit_2][k]
-                        if sum(wit_1_rdg_support) == 0.0 or sum(wit_2_rdg_support) == 0.0:
-                            continue
-                        shared_ext_units += 1
-                    ext_matrix[i][j] = shared_ext_units
-                    ext_matrix[j][i] = shared_ext_units
-                    pbar.update(1)
-        return ext_matrix
+
+        # Otherwise, count the shared extant variation units once, and share the result with every matrix output that needs it:
+        def compute():
+            # If a memory budget is set, then count them in tiles of witness pairs:
+            if self.memory_budget is not None:
+                unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
+                return self.get_witness_matrix(
+                    lambda row_block, col_block: shared_extant_counts(
+                        self.extant_mask,
+                        unit_inds,
+                        chunk_size=self.get_tile_chunk_size(),
+                        row_block=row_block,
+                        col_block=col_block,
+                    ),
+                    dtype=int,
+                )
+            # If the packed option is set, then count the shared extant variation units over bitsets:
+            if self.packed:
+                return self.get_reading_bitsets(drop_constant=drop_constant).shared_extant_counts()
+            # If the agreements between witnesses have already been counted, then they include the shared extant variation units:
+            if ("agreement_counts", drop_constant) in self.derived_views:
+                return self.get_agreement_counts(drop_constant=drop_constant).shared_extant_counts()
+            # Otherwise, count them as the product of the extant mask with its transpose:
+            return shared_extant_counts(
+                self.extant_mask,
+                self.get_substantive_variation_unit_inds(drop_constant),
+                chunk_size=self.array_chunk_size,
+            )
+
+        ext_matrix = self.get_derived_view(("ext_matrix", drop_constant), compute)
+        # Copy the shared matrix a chunk of rows at a time, so that a memory-mapped matrix is copied to a new scratch file rather than into memory:
+        return self.take_rows(ext_matrix, range(ext_matrix.shape[0]))
 
     def transform_matrix(self, matrix: np.ndarray, transform_matrix: TransformMatrixType = None):
         """Transforms a given matrix's columns based on the specified transform_matrix option.
@@ -1991,57 +3711,25 @@ class Collation:
             A NumPy distance matrix with a row and column for each witness.
             A list of witness ID strings.
         """
-        # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
-        # Initialize the output array with the appropriate dimensions:
         witness_labels = [wit.id for wit in self.witnesses]
-        matrix = np.full((len(witness_labels), len(witness_labels)), 0, dtype=int)  # ints of the form disagreements
-        with tqdm(total=len(self.witnesses) ** 2) as pbar:
-            for i, wit_1 in enumerate(witness_labels):
-                for j, wit_2 in enumerate(witness_labels):
-                    disagreements = 0
-                    # The contribution to the entry for these witnesses will be identical regardless of the order in which they are specified,
-                    # so we only have to calculate it once:
-                    if i > j:
-                        pbar.update(1)
-                        continue
-                    # Otherwise, calculate the number of units where both witnesses disagree:
-                    for k, vu_id in enumerate(self.variation_unit_ids):
-                        if vu_id not in substantive_variation_unit_ids_set:
-                            continue
-                        wit_1_rdg_support = self.readings_by_witness[wit_1][k]
-                        wit_2_rdg_support = self.readings_by_witness[wit_2][k]
-                        # If either witness is lacunose, then move on:
-                        if sum(wit_1_rdg_support) == 0.0 or sum(wit_2_rdg_support) == 0.0:
-                            continue
-                        # Otherwise, if the (potential) readings of the two witnesses do not overlap, then count them as disagreeing:
-                        if (
-                            sum([wit_1_rdg_support[l] * wit_2_rdg_support[l] for l in range(len(wit_1_rdg_support))])
-                            == 0.0
-                        ):
-                            disagreements += 1
-                    matrix[i, j] = disagreements
-                    matrix[j, i] = disagreements
-                    pbar.update(1)
-        # Initialize a matrix for shared extant variation units for witnesses, and populate it if the proportion or show_ext option is specified:
         ext_matrix = None
-        if proportion or show_ext:
+        # If a memory budget is set, then count the disagreements (and the shared extant variation units, if they are needed) in tiles of witness pairs:
+        if self.memory_budget is not None:
+            matrix, ext_matrix = self.get_tiled_agreement_matrix(
+                AgreementCounts.disagreement_counts, drop_constant=drop_constant, show_ext=(proportion or show_ext)
+            )
+        # If the packed option is set, then count the disagreements over bitsets:
+        elif self.packed:
+            matrix = self.get_reading_bitsets(drop_constant=drop_constant).disagreement_counts()
+        # Otherwise, count them with matrix products of the witnesses' reading support:
+        else:
+            matrix = self.get_agreement_counts(drop_constant=drop_constant).disagreement_counts()
+        # Populate the matrix of shared extant variation units for witnesses, if the proportion or show_ext option is specified and it has not been populated already:
+        if (proportion or show_ext) and ext_matrix is None:
             ext_matrix = self.get_ext_matrix(drop_constant=drop_constant)
         # If the proportion option is set, then divide every value in the matrix by the corresponding entry in the matrix of shared extant variation units:
         if proportion:
-            proportion_matrix = np.full((len(witness_labels), len(witness_labels)), 0.0, dtype=float)
-            np.divide(
-                matrix, ext_matrix, out=proportion_matrix, where=(ext_matrix != 0)
-            )  # division by 0 can occur if two witnesses have no overlapping units; leave their proportion as 0.0
-            matrix = proportion_matrix
+            matrix = self.get_proportion_matrix(matrix, ext_matrix)
         # Then transform the columns of the main matrix as specified:
         matrix = self.transform_matrix(matrix, transform_matrix)
         # If the show_ext option is set, then append the number of shared extant variation units after the matrix's values:
@@ -2079,54 +3767,25 @@ class Collation:
             A NumPy agreement matrix with a row and column for each witness.
             A list of witness ID strings.
         """
-        # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
-        # Initialize the output array with the appropriate dimensions:
         witness_labels = [wit.id for wit in self.witnesses]
-        matrix = np.full((len(witness_labels), len(witness_labels)), 0, dtype=int)  # ints of the form agreements
-        with tqdm(total=len(self.witnesses) ** 2) as pbar:
-            for i, wit_1 in enumerate(witness_labels):
-                for j, wit_2 in enumerate(witness_labels):
-                    agreements = 0
-                    # The contribution to the entry for these witnesses will be identical regardless of the order in which they are specified,
-                    # so we only have to calculate it once:
-                    if i > j:
-                        pbar.update(1)
-                        continue
-                    # Otherwise, calculate the number of units where both witnesses unambiguously agree:
-                    for k, vu_id in enumerate(self.variation_unit_ids):
-                        if vu_id not in substantive_variation_unit_ids_set:
-                            continue
-                        wit_1_rdg_support = self.readings_by_witness[wit_1][k]
-                        wit_2_rdg_support = self.readings_by_witness[wit_2][k]
-                        wit_1_rdg_inds = [l for l, w in enumerate(wit_1_rdg_support) if w > 0]
-                        wit_2_rdg_inds = [l for l, w in enumerate(wit_2_rdg_support) if w > 0]
-                        if len(wit_1_rdg_inds) != 1 or len(wit_2_rdg_inds) != 1:
-                            continue
-                        if wit_1_rdg_inds[0] == wit_2_rdg_inds[0]:
-                            agreements += 1
-                    matrix[i, j] = agreements
-                    matrix[j, i] = agreements
-                    pbar.update(1)
-        # Initialize a matrix for shared extant variation units for witnesses, and populate it if the proportion or show_ext option is specified:
         ext_matrix = None
-        if proportion or show_ext:
+        # If a memory budget is set, then count the agreements (and the shared extant variation units, if they are needed) in tiles of witness pairs:
+        if self.memory_budget is not None:
+            matrix, ext_matrix = self.get_tiled_agreement_matrix(
+                AgreementCounts.agreement_counts, drop_constant=drop_constant, show_ext=(proportion or show_ext)
+            )
+        # If the packed option is set, then count the agreements over bitsets:
+        elif self.packed:
+            matrix = self.get_reading_bitsets(drop_constant=drop_constant).agreement_counts()
+        # Otherwise, count them with matrix products of the witnesses' reading support:
+        else:
+            matrix = self.get_agreement_counts(drop_constant=drop_constant).agreement_counts()
+        # Populate the matrix of shared extant variation units for witnesses, if the proportion or show_ext option is specified and it has not been populated already:
+        if (proportion or show_ext) and ext_matrix is None:
             ext_matrix = self.get_ext_matrix(drop_constant=drop_constant)
         # If the proportion option is set, then divide every value in the matrix by the corresponding entry in the matrix of shared extant variation units:
         if proportion:
-            proportion_matrix = np.full((len(witness_labels), len(witness_labels)), 0.0, dtype=float)
-            np.divide(
-                matrix, ext_matrix, out=proportion_matrix, where=(ext_matrix != 0)
-            )  # division by 0 can occur if two witnesses have no overlapping units; leave their proportion as 0.0
-            matrix = proportion_matrix
+            matrix = self.get_proportion_matrix(matrix, ext_matrix)
         # Then transform the columns of the main matrix as specified:
         matrix = self.transform_matrix(matrix, transform_matrix)
         # If the show_ext option is set, then append the number of shared extant variation units after the matrix's values:
@@ -2174,123 +3833,42 @@ class Collation:
             A NumPy IDF-weighted agreement matrix with a row and column for each witness.
             A list of witness ID strings.
         """
-        # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
-        # Initialize the output array with the appropriate dimensions:
         witness_labels = [wit.id for wit in self.witnesses]
-        # If the split_missing option is "proportional", then for each variation unit, keep a record of the proportion of non-missing witnesses supporting the substantive variant readings:
-        support_proportions_by_unit = {}
-        if split_missing == SplitMissingType.proportional:
-            for k, vu_id in enumerate(self.variation_unit_ids):
-                # Skip this variation unit if it is a dropped constant site:
-                if vu_id not in substantive_variation_unit_ids_set:
-                    continue
-                support_proportions = [0.0] * len(self.substantive_readings_by_variation_unit_id[vu_id])
-                for i, wit in enumerate(witness_labels):
-                    rdg_support = self.readings_by_witness[wit][k]
-                    for l, w in enumerate(rdg_support):
-                        support_proportions[l] += w
-                norm = (
-                    sum(support_proportions) if sum(support_proportions) > 0 else 1.0
-                )  # if this variation unit has no extant witnesses (e.g., if its only witnesses are fragmentary and we have excluded them), then assume a norm of 1 to avoid division by zero
-                for l in range(len(support_proportions)):
-                    support_proportions[l] = support_proportions[l] / norm
-                support_proportions_by_unit[vu_id] = support_proportions
-        # Then populate data structures mapping each variation unit's ID to normalized reading support dictionaries
-        # and vectors of sampling probabilities for its substantive readings:
-        normalized_reading_support_dicts_by_vu_id = {}
-        sampling_probabilities_by_vu_id = {}
-        for k, vu_id in enumerate(self.variation_unit_ids):
-            # Skip this variation unit if it is a dropped constant site:
-            if vu_id not in substantive_variation_unit_ids_set:
-                continue
-            # Otherwise, populate normalized reading support vector dictionaries and sampling probability vectors in this unit:
-            normalized_reading_support_by_wit = {}
-            sampling_probabilities = [0.0] * len(self.substantive_readings_by_variation_unit_id[vu_id])
-            for i, wit in enumerate(witness_labels):
-                rdg_support = self.readings_by_witness[wit][k]
-                # Check if this reading support vector represents missing data:
-                norm = sum(rdg_support)
-                if norm == 0:
-                    # If this reading support vector sums to 0, then this is missing data; handle it as specified:
-                    if split_missing == SplitMissingType.uniform:
-                        rdg_support = [1 / len(rdg_support) for l in range(len(rdg_support))]
-                    elif split_missing == SplitMissingType.proportional:
-                        rdg_support = [support_proportions_by_unit[vu_id][l] for l in range(len(rdg_support))]
-                else:
-                    # Otherwise, the data is present, though it may be ambiguous; normalize the reading probabilities to sum to 1:
-                    rdg_support = [w / norm for l, w in enumerate(rdg_support)]
-                normalized_reading_support_by_wit[wit] = rdg_support
-                # Then add this witness's contributions to the readings' sampling probabilities:
-                for l, w in enumerate(normalized_reading_support_by_wit[wit]):
-                    sampling_probabilities[l] += w
-            norm = (
-                sum(sampling_probabilities) if sum(sampling_probabilities) > 0 else 1.0
-            )  # if this variation unit has no extant witnesses (e.g., if its only witnesses are fragmentary and we have excluded them), then assume a norm of 1 to avoid division by zero
-            # Otherwise, normalize the sampling probabilities so they sum to 1:
-            sampling_probabilities = [w / norm for w in sampling_probabilities]
-            normalized_reading_support_dicts_by_vu_id[vu_id] = normalized_reading_support_by_wit
-            sampling_probabilities_by_vu_id[vu_id] = sampling_probabilities
-        # Then populate the matrix with the total expected information content for agreements between each pair of witnesses:
-        matrix = np.full((len(witness_labels), len(witness_labels)), 0, dtype=float)
-        with tqdm(total=len(self.witnesses) ** 2) as pbar:
-            for i, wit_1 in enumerate(witness_labels):
-                for j, wit_2 in enumerate(witness_labels):
-                    total_information_content = 0.0
-                    # The contribution to the entry for these witnesses will be identical regardless of the order in which they are specified,
-                    # so we only have to calculate it once:
-                    if i > j:
-                        pbar.update(1)
-                        continue
-                    # Otherwise, calculate the expected information content of agreements between these witnesses in each substantive variation unit
-                    # based on the sampling probabilities of the substantive readings in the unit:
-                    for k, vu_id in enumerate(self.variation_unit_ids):
-                        if vu_id not in substantive_variation_unit_ids_set:
-                            continue
-                        wit_1_rdg_support = normalized_reading_support_dicts_by_vu_id[vu_id][wit_1]
-                        wit_2_rdg_support = normalized_reading_support_dicts_by_vu_id[vu_id][wit_2]
-                        sampling_probabilities = sampling_probabilities_by_vu_id[vu_id]
-                        # First, calculate the probability that these two witnesses agree:
-                        probability_of_agreement = sum(
-                            [wit_1_rdg_support[l] * wit_2_rdg_support[l] for l in range(len(sampling_probabilities))]
-                        )
-                        # If these witnesses do not agree at this variation unit, then this unit contributes nothing to their total score:
-                        if probability_of_agreement == 0.0:
-                            continue
-                        # Otherwise, calculate the expected information content (in bits) of their agreement given their agreement on that reading
-                        # (skipping readings with a sampling probability of 0):
-                        expected_information_content = sum(
-                            [
-                                -math.log2(sampling_probabilities[l])
-                                * (wit_1_rdg_support[l] * wit_2_rdg_support[l] / probability_of_agreement)
-                                for l in range(len(sampling_probabilities))
-                                if sampling_probabilities[l] > 0.0
-                            ]
-                        )
-                        # Then add this contribution to the total score for these two witnesses:
-                        total_information_content += expected_information_content
-                    matrix[i, j] = total_information_content
-                    matrix[j, i] = total_information_content
-                    pbar.update(1)
+        # Precompute the information content (in bits) of each substantive reading from its sampling probability
+        # (giving readings with a sampling probability of 0 no weight):
+        sampling_probabilities = self.get_sampling_probabilities(drop_constant, split_missing)
+        weights = np.zeros(len(sampling_probabilities), dtype=float)
+        sampled = sampling_probabilities > 0.0
+        weights[sampled] = -np.log2(sampling_probabilities[sampled])
+        # Then populate the matrix with the total expected information content for agreements between each pair of witnesses,
+        # one block of variation units at a time:
+        if self.memory_budget is None:
+            matrix = np.zeros((len(witness_labels), len(witness_labels)), dtype=float)
+            for chunk_offsets, chunk_cols, supports in self.iter_normalized_reading_support(
+                drop_constant, split_missing
+            ):
+                matrix += information_weighted_agreements(supports, chunk_offsets, weights[chunk_cols])
+        # If a memory budget is set, then do this for one tile of witness pairs at a time:
+        else:
+
+            def compute_tile(row_block, col_block):
+                nrows = row_block.stop - row_block.start
+                ncols = nrows if col_block is None else col_block.stop - col_block.start
+                tile = np.zeros((nrows, ncols), dtype=float)
+                for chunk_offsets, chunk_cols, supports, col_supports in self.iter_normalized_reading_support_tile(
+                    drop_constant, split_missing, row_block, col_block
+                ):
+                    tile += information_weighted_agreements(supports, chunk_offsets, weights[chunk_cols], col_supports)
+                return tile
+
+            matrix = self.get_witness_matrix(compute_tile)
         # Initialize a matrix for shared extant variation units for witnesses, and populate it if the proportion or show_ext option is specified:
         ext_matrix = None
         if proportion or show_ext:
             ext_matrix = self.get_ext_matrix(drop_constant=drop_constant, split_missing=split_missing)
         # If the proportion option is set, then divide every value in the matrix by the corresponding entry in the matrix of shared extant variation units:
         if proportion:
-            proportion_matrix = np.full((len(witness_labels), len(witness_labels)), 0.0, dtype=float)
-            np.divide(
-                matrix, ext_matrix, out=proportion_matrix, where=(ext_matrix != 0)
-            )  # division by 0 can occur if two witnesses have no overlapping units; leave their proportion as 0.0
-            matrix = proportion_matrix
+            matrix = self.get_proportion_matrix(matrix, ext_matrix)
         # Then transform the columns of the main matrix as specified:
         matrix = self.transform_matrix(matrix, transform_matrix)
         # If the show_ext option is set, then append the number of shared extant variation units after the matrix's values:
@@ -2334,135 +3912,42 @@ class Collation:
             A NumPy MI matrix with a row and column for each witness.
             A list of witness ID strings.
         """
-        # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
-        # Initialize the output array with the appropriate dimensions:
         witness_labels = [wit.id for wit in self.witnesses]
-        # If the split_missing option is "proportional", then for each variation unit, keep a record of the proportion of non-missing witnesses supporting the substantive variant readings:
-        support_proportions_by_unit = {}
-        if split_missing == SplitMissingType.proportional:
-            for k, vu_id in enumerate(self.variation_unit_ids):
-                # Skip this variation unit if it is a dropped constant site:
-                if vu_id not in substantive_variation_unit_ids_set:
-                    continue
-                support_proportions = [0.0] * len(self.substantive_readings_by_variation_unit_id[vu_id])
-                for i, wit in enumerate(witness_labels):
-                    rdg_support = self.readings_by_witness[wit][k]
-                    for l, w in enumerate(rdg_support):
-                        support_proportions[l] += w
-                norm = (
-                    sum(support_proportions) if sum(support_proportions) > 0 else 1.0
-                )  # if this variation unit has no extant witnesses (e.g., if its only witnesses are fragmentary and we have excluded them), then assume a norm of 1 to avoid division by zero
-                for l in range(len(support_proportions)):
-                    support_proportions[l] = support_proportions[l] / norm
-                support_proportions_by_unit[vu_id] = support_proportions
-        # Then populate data structures mapping each variation unit's ID to normalized reading support dictionaries,
-        # vectors of sampling probabilities for its substantive readings, and expected joint probability matrices:
-        normalized_reading_support_dicts_by_vu_id = {}
-        sampling_probabilities_by_vu_id = {}
-        expected_joint_probabilities_by_vu_id = {}
-        for k, vu_id in enumerate(self.variation_unit_ids):
-            # Skip this variation unit if it is a dropped constant site:
-            if vu_id not in substantive_variation_unit_ids_set:
-                continue
-            # Otherwise, populate normalized reading support vector dictionaries and sampling probability vectors in this unit:
-            normalized_reading_support_by_wit = {}
-            sampling_probabilities = [0.0] * len(self.substantive_readings_by_variation_unit_id[vu_id])
-            for i, wit in enumerate(witness_labels):
-                rdg_support = self.readings_by_witness[wit][k]
-                # Check if this reading support vector represents missing data:
-                norm = sum(rdg_support)
-                if norm == 0:
-                    # If this reading support vector sums to 0, then this is missing data; handle it as specified:
-                    if split_missing == SplitMissingType.uniform:
-                        rdg_support = [1 / len(rdg_support) for l in range(len(rdg_support))]
-                    elif split_missing == SplitMissingType.proportional:
-                        rdg_support = [support_proportions_by_unit[vu_id][l] for l in range(len(rdg_support))]
-                else:
-                    # Otherwise, the data is present, though it may be ambiguous; normalize the reading probabilities to sum to 1:
-                    rdg_support = [w / norm for l, w in enumerate(rdg_support)]
-                normalized_reading_support_by_wit[wit] = rdg_support
-                # Then add this witness's contributions to the readings' sampling probabilities:
-                for l, w in enumerate(normalized_reading_support_by_wit[wit]):
-                    sampling_probabilities[l] += w
-            norm = (
-                sum(sampling_probabilities) if sum(sampling_probabilities) > 0 else 1.0
-            )  # if this variation unit has no extant witnesses (e.g., if its only witnesses are fragmentary and we have excluded them), then assume a norm of 1 to avoid division by zero
-            # Otherwise, normalize the sampling probabilities so they sum to 1:
-            sampling_probabilities = [w / norm for w in sampling_probabilities]
-            normalized_reading_support_dicts_by_vu_id[vu_id] = normalized_reading_support_by_wit
-            sampling_probabilities_by_vu_id[vu_id] = sampling_probabilities
-            # Then populate a contingency table for the expected probabilities of joint support in this unit:
-            expected_joint_probabilities = np.full(
-                (len(sampling_probabilities), len(sampling_probabilities)), 0, dtype=float
-            )
-            for l1 in range(len(sampling_probabilities)):
-                for l2 in range(len(sampling_probabilities)):
-                    expected_joint_probabilities[l1, l2] = sampling_probabilities[l1] * sampling_probabilities[l2]
-            expected_joint_probabilities_by_vu_id[vu_id] = expected_joint_probabilities
-        # Then populate the matrix one variation unit at a time:
-        matrix = np.full((len(witness_labels), len(witness_labels)), 0, dtype=float)
-        with tqdm(total=len(self.witnesses) ** 2) as pbar:
-            # Then calculate the mutual information contribution for each pair of witnesses:
-            for i, wit_1 in enumerate(witness_labels):
-                for j, wit_2 in enumerate(witness_labels):
-                    total_mutual_information = 0.0
-                    # The contribution to the entry for these witnesses will be identical regardless of the order in which they are specified,
-                    # so we only have to calculate it once:
-                    if i > j:
-                        pbar.update(1)
-                        continue
-                    # Otherwise, calculate the mutual information between these witnesses in each substantive variation unit:
-                    for k, vu_id in enumerate(self.variation_unit_ids):
-                        if vu_id not in substantive_variation_unit_ids_set:
-                            continue
-                        wit_1_rdg_support = normalized_reading_support_dicts_by_vu_id[vu_id][wit_1]
-                        wit_2_rdg_support = normalized_reading_support_dicts_by_vu_id[vu_id][wit_2]
-                        sampling_probabilities = sampling_probabilities_by_vu_id[vu_id]
-                        expected_joint_probabilities = expected_joint_probabilities_by_vu_id[vu_id]
-                        # If either witness has an all-zeroes vector (because it is lacunose in this unit), then we can skip these witnesses here:
-                        if sum(wit_1_rdg_support) == 0 or sum(wit_2_rdg_support) == 0:
-                            continue
-                        # Otherwise, populate a contingency table for the observed probabilities of joint support in this unit:
-                        observed_joint_probabilities = np.full(
-                            (len(sampling_probabilities), len(sampling_probabilities)), 0, dtype=float
-                        )
-                        for l1, w1 in enumerate(wit_1_rdg_support):
-                            for l2, w2 in enumerate(wit_2_rdg_support):
-                                observed_joint_probabilities[l1, l2] = w1 * w2
-                        # Then calculate the mutual information using the expected and observed distribution matrices:
-                        mutual_information = 0.0
-                        for l1 in range(len(sampling_probabilities)):
-                            for l2 in range(len(sampling_probabilities)):
-                                observed = observed_joint_probabilities[l1, l2]
-                                expected = expected_joint_probabilities[l1, l2]
-                                if observed == 0:
-                                    continue
-                                mutual_information += observed * math.log2(observed / expected)
-                        # Then add this mutual information to the total for these two witnesses:
-                        total_mutual_information += mutual_information
-                    matrix[i, j] += total_mutual_information
-                    matrix[j, i] += total_mutual_information
-                    pbar.update(1)
+        # Calculate the sampling probabilities of the substantive readings, which give the expected joint distributions of the witnesses' readings:
+        sampling_probabilities = self.get_sampling_probabilities(drop_constant, split_missing)
+        # Then populate the matrix with the total mutual information between each pair of witnesses, one block of variation units at a time:
+        if self.memory_budget is None:
+            matrix = np.zeros((len(witness_labels), len(witness_labels)), dtype=float)
+            for chunk_offsets, chunk_cols, supports in self.iter_normalized_reading_support(
+                drop_constant, split_missing
+            ):
+                matrix += mutual_information(supports, chunk_offsets, sampling_probabilities[chunk_cols])
+        # If a memory budget is set, then do this for one tile of witness pairs at a time:
+        else:
+
+            def compute_tile(row_block, col_block):
+                nrows = row_block.stop - row_block.start
+                ncols = nrows if col_block is None else col_block.stop - col_block.start
+                tile = np.zeros((nrows, ncols), dtype=float)
+                for chunk_offsets, chunk_cols, supports, col_supports in self.iter_normalized_reading_support_tile(
+                    drop_constant, split_missing, row_block, col_block
+                ):
+                    tile += mutual_information(
+                        supports, chunk_offsets, sampling_probabilities[chunk_cols], col_supports
+                    )
+                return tile
+
+            matrix = self.get_witness_matrix(compute_tile)
+        # The diagonal entries of this matrix have always added each witness's mutual information with itself once as a row and once as a column,
+        # so keep them consistent with earlier outputs:
+        matrix[np.diag_indices_from(matrix)] *= 2
         # Initialize a matrix for shared extant variation units for witnesses, and populate it if the proportion or show_ext option is specified:
         ext_matrix = None
         if proportion or show_ext:
             ext_matrix = self.get_ext_matrix(drop_constant=drop_constant, split_missing=split_missing)
         # If the proportion option is set, then divide every value in the matrix by the corresponding entry in the matrix of shared extant variation units:
         if proportion:
-            proportion_matrix = np.full((len(witness_labels), len(witness_labels)), 0.0, dtype=float)
-            np.divide(
-                matrix, ext_matrix, out=proportion_matrix, where=(ext_matrix != 0)
-            )  # division by 0 can occur if two witnesses have no overlapping units; leave their proportion as 0.0
-            matrix = proportion_matrix
+            matrix = self.get_proportion_matrix(matrix, ext_matrix)
         # Then transform the columns of the main matrix as specified:
         matrix = self.transform_matrix(matrix, transform_matrix)
         # If the show_ext option is set, then append the number of shared extant variation units after the matrix's values:
@@ -2490,29 +3975,15 @@ class Collation:
             A list of witness ID strings.
         """
         # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        substantive_variation_unit_ids = self.get_substantive_variation_unit_ids(drop_constant)
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
+        substantive_readings = self.get_substantive_readings()
         # In a first pass, populate a dictionary mapping (variation unit index, reading index) tuples from the readings_by_witness dictionary
         # to the readings' IDs:
         reading_ids_by_indices = {}
-        for j, vu in enumerate(self.variation_units):
-            if vu.id not in substantive_variation_unit_ids_set:
-                continue
-            k = 0
-            for rdg in vu.readings:
-                key = tuple([vu.id, rdg.id])
-                if key not in substantive_variation_unit_reading_tuples_set:
-                    continue
-                indices = tuple([j, k])
-                reading_ids_by_indices[indices] = rdg.id
-                k += 1
+        for j in substantive_variation_unit_inds:
+            for k, rdg in enumerate(substantive_readings[j]):
+                reading_ids_by_indices[(j, k)] = rdg.id
         # Initialize the output array with the appropriate dimensions:
         missing_symbol = '?'
         witness_labels = [wit.id for wit in self.witnesses]
@@ -2520,16 +3991,18 @@ class Collation:
             (len(witness_labels), len(substantive_variation_unit_ids)), missing_symbol, dtype=object
         )  # use dtype=object because the maximum string length is not known up front
         # Then populate it with the appropriate values:
+        offsets = self.reading_offsets.tolist()
         with tqdm(total=len(self.witnesses)) as pbar:
             row_ind = 0
             for i, wit in enumerate(self.witnesses):
+                support = self.reading_support[i].tolist()
+                extant = self.extant_mask[i].tolist()
                 col_ind = 0
-                for j, vu in enumerate(self.variation_units):
-                    if vu.id not in substantive_variation_unit_ids_set:
-                        continue
-                    rdg_support = self.readings_by_witness[wit.id][j]
+                for j in substantive_variation_unit_inds:
+                    vu = self.get_indexed_variation_units()[j]
+                    rdg_support = support[offsets[j] : offsets[j + 1]]
                     # If this reading support vector sums to 0, then this is missing data; handle it as specified:
-                    if sum(rdg_support) == 0:
+                    if not extant[j]:
                         matrix[row_ind, col_ind] = missing_symbol
                     # Otherwise, add its coefficients normally:
                     else:
@@ -2566,41 +4039,27 @@ class Collation:
             A list of column label strings.
         """
         # Populate a list of sites that will correspond to columns of the sequence alignment:
-        substantive_variation_unit_ids = self.variation_unit_ids
-        if drop_constant:
-            substantive_variation_unit_ids = [
-                vu_id
-                for vu_id in self.variation_unit_ids
-                if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-            ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant)
+        substantive_readings = self.get_substantive_readings()
         # Initialize the outputs:
         column_labels = ["taxon", "character", "state", "value"]
         long_table_list = []
         # Populate a dictionary mapping (variation unit index, reading index) tuples to reading texts:
         reading_texts_by_indices = {}
-        for j, vu in enumerate(self.variation_units):
-            if vu.id not in substantive_variation_unit_ids_set:
-                continue
-            k = 0
-            for rdg in vu.readings:
-                key = tuple([vu.id, rdg.id])
-                if key not in substantive_variation_unit_reading_tuples_set:
-                    continue
-                indices = tuple([j, k])
-                reading_texts_by_indices[indices] = rdg.text
-                k += 1
+        for j in substantive_variation_unit_inds:
+            for k, rdg in enumerate(substantive_readings[j]):
+                reading_texts_by_indices[(j, k)] = rdg.text
         # Then populate the output list with the appropriate values:
         witness_labels = [wit.id for wit in self.witnesses]
         missing_symbol = '?'
+        offsets = self.reading_offsets.tolist()
         with tqdm(total=len(self.witnesses)) as pbar:
             for i, wit in enumerate(self.witnesses):
+                support = self.reading_support[i].tolist()
                 row_ind = 0
-                for j, vu_id in enumerate(self.variation_unit_ids):
-                    if vu_id not in substantive_variation_unit_ids_set:
-                        continue
-                    rdg_support = self.readings_by_witness[wit.id][j]
+                for j in substantive_variation_unit_inds:
+                    vu_id = self.variation_unit_ids[j]
+                    rdg_support = support[offsets[j] : offsets[j + 1]]
                     # Populate a list of nonzero coefficients for this reading support vector:
                     rdg_inds = [k for k, w in enumerate(rdg_support) if w > 0]
                     # If this list does not consist of exactly one reading, then treat it as missing data:
@@ -2705,6 +4164,8 @@ class Collation:
             # Convert the collation to a long table and get its column labels first:
             long_table, column_labels = self.to_long_table(drop_constant=drop_constant)
             df = pd.DataFrame(long_table, columns=column_labels)
+        elif table_type == TableType.coverage:
+            df = self.to_coverage_table()
         return df
 
     def to_csv(
@@ -2888,9 +4349,8 @@ class Collation:
         # If there are no witnesses, then no symbols are needed at all:
         if len(self.witnesses) == 0:
             return []
-        wit_id = self.witnesses[0].id
-        for rdg_support in self.readings_by_witness[wit_id]:
-            nsymbols = max(nsymbols, len(rdg_support))
+        if len(self.variation_unit_ids) > 0:
+            nsymbols = self.get_max_nstates()
         stemma_symbols = possible_symbols[:nsymbols]
         return stemma_symbols
 
@@ -2908,35 +4368,24 @@ class Collation:
         """
         # Populate a list of sites that will correspond to columns of the sequence alignment
         # (by default, constant sites are dropped):
-        substantive_variation_unit_ids = [
-            vu_id for vu_id in self.variation_unit_ids if len(self.substantive_readings_by_variation_unit_id[vu_id]) > 1
-        ]
-        substantive_variation_unit_ids_set = set(substantive_variation_unit_ids)
-        substantive_variation_unit_reading_tuples_set = set(self.substantive_variation_unit_reading_tuples)
+        substantive_variation_unit_inds = self.get_substantive_variation_unit_inds(drop_constant=True)
+        substantive_readings = self.get_substantive_readings()
         # In a first pass, populate a dictionary mapping (variation unit index, reading index) tuples from the readings_by_witness dictionary
         # to the readings' texts:
         reading_texts_by_indices = {}
-        for j, vu in enumerate(self.variation_units):
-            if vu.id not in substantive_variation_unit_ids_set:
-                continue
-            k = 0
-            for rdg in vu.readings:
-                key = tuple([vu.id, rdg.id])
-                if key not in substantive_variation_unit_reading_tuples_set:
-                    continue
-                indices = tuple([j, k])
-                reading_texts_by_indices[indices] = rdg.text
-                k += 1
+        for j in substantive_variation_unit_inds:
+            for k, rdg in enumerate(substantive_readings[j]):
+                reading_texts_by_indices[(j, k)] = rdg.text
         # In a second pass, populate another dictionary mapping (variation unit index, reading index) tuples from the readings_by_witness dictionary
         # to the witnesses exclusively supporting those readings:
         reading_wits_by_indices = {}
         for indices in reading_texts_by_indices:
             reading_wits_by_indices[indices] = []
+        offsets = self.reading_offsets.tolist()
         for i, wit in enumerate(self.witnesses):
-            for j, vu_id in enumerate(self.variation_unit_ids):
-                if vu_id not in substantive_variation_unit_ids_set:
-                    continue
-                rdg_support = self.readings_by_witness[wit.id][j]
+            support = self.reading_support[i].tolist()
+            for j in substantive_variation_unit_inds:
+                rdg_support = support[offsets[j] : offsets[j + 1]]
                 # If this witness does not exclusively support exactly one reading at this unit, then treat it as lacunose:
                 if len([k for k, w in enumerate(rdg_support) if w > 0]) != 1:
                     continue
@@ -2963,12 +4412,10 @@ class Collation:
             )  # write the relative path to the chron file
             # Then add a line indicating that all witnesses are lacunose unless they are specified explicitly:
             f.write("= $? $* ;\n\n")
-            with tqdm(total=len(self.variation_unit_ids)) as pbar:
+            with tqdm(total=len(substantive_variation_unit_inds)) as pbar:
                 # Then proceed for each variation unit:
-                for j, vu_id in enumerate(self.variation_unit_ids):
-                    if vu_id not in substantive_variation_unit_ids_set:
-                        pbar.update(1)
-                        continue
+                for j in substantive_variation_unit_inds:
+                    vu_id = self.variation_unit_ids[j]
                     # Print the variation unit ID first:
                     f.write("@ %s\n" % vu_id)
                     # In a first pass, print the texts of all readings enclosed in brackets:
@@ -2990,7 +4437,7 @@ class Collation:
                             f.write(" |")
                             # Add the weight of this variation unit after the pipe by comparing its analysis categories to their weights:
                             weight = 1
-                            vu = self.variation_units[j]
+                            vu = self.get_indexed_variation_units()[j]
                             if len(vu.analysis_categories) > 0:
                                 weight = int(
                                     sum(
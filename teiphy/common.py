@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
 
+from types import MappingProxyType
+
 """
 XML namespaces
 """
 xml_ns = "http://www.w3.org/XML/1998/namespace"
 tei_ns = "http://www.tei-c.org/ns/1.0"
+
+"""
+Shared read-only empty containers (used as defaults for attributes that are usually empty)
+"""
+empty_mapping = MappingProxyType({})
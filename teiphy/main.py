@@ -6,6 +6,7 @@ import typer
 
 from .format import Format
 from .collation import Collation, ClockModel, AncestralLogger, TableType, SplitMissingType, TransformMatrixType
+from .cache import CollationCache
 
 
 app = typer.Typer(rich_markup_mode="rich")
@@ -85,7 +86,7 @@ def to_file(
     ),
     table: TableType = typer.Option(
         TableType.matrix,
-        help="The type of table to use for CSV/TSV/Excel/PHYLIP output.\nIf \"matrix\", then the table will have rows for witnesses and columns for all variant readings, with frequency values in cells (the --split-missing flag can be used with this option).\nIf \"distance\", then the table will have rows and columns for witnesses, with the number or proportion of disagreements between each pair in the corresponding cell (the --proportion flag can be used with this option).\nIf \"similarity\", then the table will have rows and columns for witnesses, with the number or proportion of agreements between each pair in the corresponding cell (the --proportion flag can be used with this option).\nIf \"idf\", then the table will have rows and columns for witnesses, where each cell contains the sum or mean of inverse document frequency-weighted agreements between the corresponding pair of witnesses (the --proportion flag can be used with this option).\nIf \"mi\", then the table will have rows and columns for witnesses, where each cell contains the sum or mean of mutual information between the corresponding pair of witnesses over all variation units (the --proportion flag can be used with this option).\nIf \"nexus\", then the table will have rows for witnesses and columns for variation units with reading IDs in cells (the --ambiguous-as-missing flag can be used with this option).\nIf \"long\", then the table will consist of repeated rows with column entries for taxa, characters, reading indices, and reading texts.\nIf the output is a PHYLIP file, then the type of tabular output must be \"distance\" or \"similarity\"; otherwise, it will be ignored.",
+        help="The type of table to use for CSV/TSV/Excel/PHYLIP output.\nIf \"matrix\", then the table will have rows for witnesses and columns for all variant readings, with frequency values in cells (the --split-missing flag can be used with this option).\nIf \"distance\", then the table will have rows and columns for witnesses, with the number or proportion of disagreements between each pair in the corresponding cell (the --proportion flag can be used with this option).\nIf \"similarity\", then the table will have rows and columns for witnesses, with the number or proportion of agreements between each pair in the corresponding cell (the --proportion flag can be used with this option).\nIf \"idf\", then the table will have rows and columns for witnesses, where each cell contains the sum or mean of inverse document frequency-weighted agreements between the corresponding pair of witnesses (the --proportion flag can be used with this option).\nIf \"mi\", then the table will have rows and columns for witnesses, where each cell contains the sum or mean of mutual information between the corresponding pair of witnesses over all variation units (the --proportion flag can be used with this option).\nIf \"nexus\", then the table will have rows for witnesses and columns for variation units with reading IDs in cells (the --ambiguous-as-missing flag can be used with this option).\nIf \"long\", then the table will consist of repeated rows with column entries for taxa, characters, reading indices, and reading texts.\nIf \"coverage\", then the table will have rows for witnesses with the number and proportion of variation units at which each is extant and a column for each fragmentary threshold from 0 to 1 in steps of 0.05, indicating whether the witness would be retained at that threshold, followed by a final row with the number of witnesses retained at each threshold (this should be used without the --fragmentary-threshold option).\nIf the output is a PHYLIP file, then the type of tabular output must be \"distance\" or \"similarity\"; otherwise, it will be ignored.",
     ),
     split_missing: SplitMissingType = typer.Option(
         None,
@@ -103,6 +104,42 @@ def to_file(
         None,
         help="Seed for random number generation (used for setting default initial values of transcriptional rate parameters for BEAST 2 XML output); if not specified, then the default seeding of the numpy.random.default_rng class will be used.",
     ),
+    stream: bool = typer.Option(
+        False,
+        help="Parse the input collation incrementally, discarding each variation unit's XML as soon as it has been processed; this reduces the memory needed for very large collations.",
+    ),
+    workers: int = typer.Option(
+        1,
+        help="The number of worker processes to use for parsing the variation units in the input collation. If greater than 1, then the variation units are parsed in parallel.",
+    ),
+    packed: bool = typer.Option(
+        False,
+        help="Count agreements, disagreements, and shared extant variation units for distance and similarity matrix outputs over packed bitsets of the witnesses' readings. This uses less memory than the default matrix products for large collations with few ambiguous readings and gives the same results.",
+    ),
+    scratch_dir: Path = typer.Option(
+        None,
+        file_okay=False,
+        dir_okay=True,
+        writable=True,
+        resolve_path=True,
+        help="Directory in which to store the witnesses' reading support data as a memory-mapped scratch file, for collations too large to fit in memory. The scratch file is deleted when the conversion finishes.",
+    ),
+    memory_budget: int = typer.Option(
+        None,
+        help="The approximate amount of memory (in MB) to use at a time for witness-to-witness matrix outputs (i.e., tabular outputs of type \"distance\", \"similarity\", \"idf\", \"mean-idf\", \"mi\", and \"mean-mi\", and their counts of shared extant variation units). If specified, then these matrices are computed in tiles of witness pairs that fit within this budget, for collations with too many witnesses for their matrices to be computed all at once. If the --scratch-dir option is also specified, then the finished tiles are written to a memory-mapped scratch file.",
+    ),
+    cache_dir: Path = typer.Option(
+        None,
+        file_okay=False,
+        dir_okay=True,
+        writable=True,
+        resolve_path=True,
+        help="Directory in which to cache parsed collations. If specified, then the collation constructed from the input file and the parsing options (i.e., the -t, -m, -s, --fill-correctors, --fragmentary-threshold, --fill-correctors-threshold, and --dates-file options) is stored here, and later conversions of the same input with the same options load it instead of parsing the input again. Cached collations are loaded with Python's pickle module, which can run arbitrary code, so this must be a trusted directory that only you can write to.",
+    ),
+    cache_size: int = typer.Option(
+        1024,
+        help="The maximum total size (in MB) of the files in the cache directory. When it is exceeded, the least recently used cached collations are deleted. This option is only used if the --cache-dir option is specified.",
+    ),
     verbose: bool = typer.Option(False, help="Enable verbose logging (mostly for debugging purposes)."),
     version: bool = typer.Option(
         False,
@@ -146,14 +183,6 @@ def to_file(
     if input.suffix.lower() != ".xml":
         print("Error opening input file: The input file is not an XML file. Make sure the input file type is .xml.")
         exit(1)
-    # If it is, then try to parse it:
-    xml = None
-    try:
-        parser = et.XMLParser(remove_comments=True)
-        xml = et.parse(input, parser=parser)
-    except Exception as err:
-        print(f"Error opening input file: {err}")
-        exit(1)
     # Make sure the fragmentary_threshold input, if specified, is between 0 and 1:
     if fragmentary_threshold is not None and (fragmentary_threshold < 0.0 or fragmentary_threshold > 1.0):
         print(
@@ -168,21 +197,75 @@ def to_file(
             % fill_correctors_threshold
         )
         exit(1)
+    # Make sure the number of workers is positive:
+    if workers < 1:
+        print("Error: the number of workers is %d. It must be at least 1." % workers)
+        exit(1)
     # Make sure the dates_file input, if specified, is a CSV file:
     if dates_file is not None and dates_file.suffix.lower() != ".csv":
         print("Error opening dates file: The dates file is not a CSV file. Make sure the dates file type is .csv.")
         exit(1)
-    coll = Collation(
-        xml,
-        suffixes,
-        trivial_reading_types,
-        missing_reading_types,
-        fill_correctors,
-        fragmentary_threshold,
-        fill_correctors_threshold,
-        dates_file,
-        verbose,
-    )
+    # If a cache directory was specified, then try to load a collation previously constructed from the same input with the same options:
+    cache = None
+    cache_key = None
+    coll = None
+    if cache_dir is not None:
+        cache = CollationCache(cache_dir, max_size=cache_size * (1 << 20), verbose=verbose)
+        cache_key = cache.get_key(
+            input,
+            suffixes,
+            trivial_reading_types,
+            missing_reading_types,
+            fill_correctors,
+            fragmentary_threshold,
+            fill_correctors_threshold,
+            dates_file,
+        )
+        coll = cache.load(cache_key)
+        if coll is not None:
+            coll.verbose = verbose
+            coll.packed = packed
+            coll.memory_budget = memory_budget * (1 << 20) if memory_budget is not None else None
+            if scratch_dir is not None:
+                coll.set_scratch_dir(scratch_dir)
+            else:
+                coll.scratch_dir = None
+    if coll is None:
+        # Otherwise, try to parse the input:
+        options = {
+            "manuscript_suffixes": suffixes,
+            "trivial_reading_types": trivial_reading_types,
+            "missing_reading_types": missing_reading_types,
+            "fill_corrector_lacunae": fill_correctors,
+            "fragmentary_threshold": fragmentary_threshold,
+            "fill_correctors_threshold": fill_correctors_threshold,
+            "dates_file": dates_file,
+            "verbose": verbose,
+            "workers": workers,
+            "packed": packed,
+            "scratch_dir": scratch_dir,
+            "memory_budget": memory_budget * (1 << 20) if memory_budget is not None else None,
+        }
+        xml = None
+        if not stream:
+            try:
+                parser = et.XMLParser(remove_comments=True)
+                xml = et.parse(input, parser=parser)
+            except Exception as err:
+                print(f"Error opening input file: {err}")
+                exit(1)
+        try:
+            # If the input is to be streamed, then it will be parsed as the Collation is constructed:
+            if stream:
+                coll = Collation.from_path(input, stream=True, **options)
+            else:
+                coll = Collation(xml, **options)
+        except et.XMLSyntaxError as err:
+            print(f"Error opening input file: {err}")
+            exit(1)
+        # If a cache directory was specified, then store the new collation there:
+        if cache is not None:
+            cache.store(cache_key, coll)
     coll.to_file(
         output,
         format=format,
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 
+import sys  # for interning witness sigla
+
 from lxml import etree as et
 
-from .common import xml_ns, tei_ns
+from .common import xml_ns, tei_ns, empty_mapping
 
 
 class Reading:
@@ -13,12 +15,16 @@ class Reading:
     Attributes:
         id: The ID string of this reading, which should be unique within its parent app element.
         type: A string representing the type of reading. Examples include "reconstructed", "defective", "orthographic", "subreading", "ambiguous", "overlap", and "lac". The default value is "substantive".
-        text: Serialization of the contents of this element.
-        wits: A list of sigla referring to witnesses that support this reading.
-        targets: A list of other reading ID strings to which this reading corresponds. For substantive readings, this should be empty. For ambiguous readings, it should contain references to the readings that might correspond to this one. For overlap readings, it should contain a reference to the reading from the overlapping variation unit responsible for the overlap.
+        text: Serialization of the contents of this element. It is only computed when it is first accessed (or when it is needed as the ID of this reading);
+            until then, the reading keeps a handle to its element.
+        wits: A tuple of sigla referring to witnesses that support this reading.
+            The sigla are interned strings, so that each distinct siglum is stored only once no matter how many readings refer to it.
+        targets: A tuple of other reading ID strings to which this reading corresponds. For substantive readings, this should be empty. For ambiguous readings, it should contain references to the readings that might correspond to this one. For overlap readings, it should contain a reference to the reading from the overlapping variation unit responsible for the overlap.
         certainties: A dictionary mapping target reading IDs to floating-point certainty values.
     """
 
+    __slots__ = ["type", "_text", "_xml", "id", "wits", "targets", "certainties"]
+
     def __init__(self, xml: et.Element, verbose: bool = False):
         """Constructs a new Reading instance from the TEI XML input.
 
@@ -27,11 +33,12 @@ class Reading:
             verbose: An optional flag indicating whether or not to print status updates.
         """
         self.type = ""
-        self.text = ""
+        self._text = None
+        self._xml = None
         self.id = ""
-        self.targets = []
-        self.certainties = {}
-        self.wits = []
+        self.targets = ()
+        self.certainties = empty_mapping
+        self.wits = ()
         self.parse(xml, verbose)
         if verbose:
             if len(self.wits) == 0:
@@ -51,8 +58,49 @@ class Reading:
                         % (self.id, self.type, ", ".join([wit for wit in self.wits]))
                     )
 
+    @property
+    def text(self):
+        # If the text has not been serialized yet, then do so now, and release the handle to the XML element:
+        if self._text is None:
+            self._text = self.parse_text(self._xml) if self._xml is not None else ""
+            self._xml = None
+        return self._text
+
+    @text.setter
+    def text(self, text: str):
+        self._text = text
+        self._xml = None
+
+    def trim(self):
+        """If this reading still has a handle to its element, then drops the attributes of the element, which are not needed to serialize its text.
+        This should only be done when the element belongs to a tree that will not be used again (e.g., a collation being streamed).
+        """
+        if self._xml is not None:
+            self._xml.attrib.clear()
+        return
+
+    def __getstate__(self):
+        # lxml elements cannot be pickled, so serialize the text (which releases the element) first:
+        self.text
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        # The shared empty mapping cannot be pickled, so replace it with an ordinary dictionary:
+        state["certainties"] = dict(self.certainties)
+        return state
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+        # Unpickled strings are not interned, so intern the sigla again:
+        self.wits = tuple([sys.intern(wit) for wit in self.wits])
+        if len(self.certainties) == 0:
+            self.certainties = empty_mapping
+
     def parse(self, xml: et.Element, verbose: bool = False):
-        """Given an XML element, recursively parses it and its subelements.
+        """Given an XML element, parses it and its subelements.
+
+        The subelements are visited in a single iterative walk over the element,
+        and the serialized text is assembled from a list of pieces that are only joined at the end,
+        so the time taken is linear in the size of the element, and deeply nested markup does not exhaust the recursion limit.
 
         Args:
             xml: A lem, rdg, or witDetail element.
@@ -60,189 +108,202 @@ class Reading:
         """
         # Determine what this element is:
         raw_tag = xml.tag.replace("{%s}" % tei_ns, "")
-        # If it is a reading or lemma, then copy its witnesses, and recursively process its children:
-        if raw_tag in ["rdg", "lem"]:
-            # If it has a type, then save that; otherwise, default to "substantive":
-            self.type = xml.get("type") if xml.get("type") is not None else "substantive"
-            # Populate its list of the entries in its wit attribute (stripping any "#" prefixes), split over spaces:
-            self.wits = [w.strip("#") for w in xml.get("wit").split()] if xml.get("wit") is not None else []
-            # Populate its text recursively using its children:
-            self.text = xml.text if xml.text is not None else ""
-            for child in xml:
-                self.parse(child, verbose)
-            # Strip any surrounding whitespace left over from spaces added between word elements:
-            self.text = self.text.strip()
-            # Populate its ID, using its xml:id if it has one; otherwise, use its n attribute if it has one; otherwise, use its text:
-            self.id = ""
-            if xml.get("{%s}id" % xml_ns) is not None:
-                self.id = xml.get("{%s}id" % xml_ns)
-            elif xml.get("n") is not None:
-                self.id = xml.get("n")
-            else:
-                self.id = self.text
+        if raw_tag not in ["rdg", "lem", "witDetail"]:
             return
-        # If it is a witness detail (e.g., an ambiguous reading), then copy its target readings and witnesses, and recursively process its children:
+        # If it has a type, then save that; otherwise, default to "substantive":
+        self.type = xml.get("type") if xml.get("type") is not None else "substantive"
+        # If it is a witness detail (e.g., an ambiguous reading), then copy its target readings:
         if raw_tag == "witDetail":
-            # If it has a type, then save that; otherwise, default to "substantive":
-            self.type = xml.get("type") if xml.get("type") is not None else "substantive"
             # Populate its list of target reading IDs in its target attribute (stripping any "#" prefixes), split over spaces:
-            self.targets = [t.strip("#") for t in xml.get("target").split()] if xml.get("target") is not None else []
-            # Populate its list of the entries in its wit attribute (stripping any "#" prefixes), split over spaces:
-            self.wits = [w.strip("#") for w in xml.get("wit").split()] if xml.get("wit") is not None else []
-            # Populate its certainties map and text recursively using its children:
-            self.certainties = {}
-            for t in self.targets:
-                self.certainties[t] = 0
-            self.text = xml.text if xml.text is not None else ""
-            for child in xml:
-                self.parse(child, verbose)
-            # Strip any surrounding whitespace left over from spaces added between word elements:
-            self.text = self.text.strip()
-            # Populate its ID, using its xml:id if it has one; otherwise, use its n attribute if it has one; otherwise, use its text:
-            self.id = ""
-            if xml.get("{%s}id" % xml_ns) is not None:
-                self.id = xml.get("{%s}id" % xml_ns)
-            elif xml.get("n") is not None:
-                self.id = xml.get("n")
-            else:
-                self.id = self.text
-            return
-        # If it is a certainty measurement, then store its value in this reading's certainties map
-        # (overwriting any previous values for this reading in the map, since they shouldn't be specified more than once):
-        if raw_tag == "certainty":
+            self.targets = (
+                tuple([t.strip("#") for t in xml.get("target").split()]) if xml.get("target") is not None else ()
+            )
+            # Initialize its certainties map (it will be populated from its children):
+            if len(self.targets) > 0:
+                self.certainties = {}
+                for t in self.targets:
+                    self.certainties[t] = 0
+        # Populate its list of the entries in its wit attribute (stripping any "#" prefixes), split over spaces:
+        self.wits = (
+            tuple([sys.intern(w.strip("#")) for w in xml.get("wit").split()]) if xml.get("wit") is not None else ()
+        )
+        # Populate its certainties map from any certainty elements it contains:
+        self.parse_certainties(xml)
+        # Keep a handle to the element, so that its text can be serialized when it is first needed:
+        self._text = None
+        self._xml = xml
+        # Populate its ID, using its xml:id if it has one; otherwise, use its n attribute if it has one; otherwise, use its text:
+        self.id = ""
+        if xml.get("{%s}id" % xml_ns) is not None:
+            self.id = xml.get("{%s}id" % xml_ns)
+        elif xml.get("n") is not None:
+            self.id = xml.get("n")
+        else:
+            self.id = self.text
+        return
+
+    def parse_certainties(self, xml: et.Element):
+        """Given a lem, rdg, or witDetail element, populates this reading's certainties map from any certainty elements it contains,
+        overwriting any previous values for their targets (since they shouldn't be specified more than once).
+
+        Args:
+            xml: A lem, rdg, or witDetail element.
+        """
+        for elem in xml.iter("{%s}certainty" % tei_ns, "certainty"):
             # Get its target reading IDs (stripping any "#" prefixes):
-            targets = [t.strip("#") for t in xml.get("target").split()] if xml.get("target") is not None else []
+            targets = [t.strip("#") for t in elem.get("target").split()] if elem.get("target") is not None else []
             # Now set the entry for each target reading to that degree;
             # if no degree is specified, then assume that all targets are equally likely and assign them all a value of 1 (we will normalize at the end):
-            degree = float(xml.get("degree")) if xml.get("degree") is not None else 1
+            degree = float(elem.get("degree")) if elem.get("degree") is not None else 1
+            if self.certainties is empty_mapping:
+                self.certainties = {}
             for t in targets:
                 self.certainties[t] = degree
-            return
-        # If it is a word, then serialize its text and tail,
-        # recursively processing any subelements,
-        # and add a space after it:
-        if raw_tag == "w":
-            self.text += xml.text if xml.text is not None else ""
-            for child in xml:
-                self.parse(child, verbose)
-            self.text += xml.tail if xml.tail is not None else ""
-            self.text += " "
-            return
-        # If it is an abbreviation, then serialize its text and tail,
-        # recursively processing any subelements:
-        if raw_tag == "abbr":
-            self.text += xml.text if xml.text is not None else ""
-            for child in xml:
-                self.parse(child, verbose)
-            self.text += xml.tail if xml.tail is not None else ""
-            return
-        # If it is an overline-rendered element, then add an overline to each character in its contents:
-        if raw_tag == "hi":
-            # Keep track of how long the text currently is, so we can modify just the portion we're about to add:
-            starting_ind = len(self.text)
-            self.text += xml.text if xml.text is not None else ""
-            # for child in xml:
-            #     self.parse(child, verbose)
-            # NOTE: other rendering types could be supported here
-            if xml.get("rend") is not None:
-                old_text = self.text[starting_ind:]
-                rend = xml.get("rend")
-                if rend == "overline":
-                    new_text = "".join([c + "\u0305" for c in old_text])
-                    self.text = self.text[:starting_ind] + new_text
-            self.text += xml.tail if xml.tail is not None else ""
-            return
-        # If it is a space, then serialize as a single space:
-        if raw_tag == "space":
-            text = "["
-            if xml.get("unit") is not None and xml.get("extent") is not None:
-                unit = xml.get("unit")
-                extent = xml.get("extent")
-                text += extent + " " + unit
-                text += " "
-                text += "space"
-            else:
-                text += "space"
-            if xml.get("reason") is not None:
-                text += " "
-                reason = xml.get("reason")
-                text += "(" + reason + ")"
-            text += "]"
-            text += xml.tail if xml.tail is not None else ""
-            self.text += text
-            return
-        # If it is an expansion, then serialize it in parentheses:
-        if raw_tag == "ex":
-            self.text += "("
-            self.text += xml.text if xml.text is not None else ""
-            # for child in xml:
-            #     self.parse(child, verbose)
-            self.text += ")"
-            self.text += xml.tail if xml.tail is not None else ""
-            return
-        # If it is a gap, then serialize it based on its attributes:
-        if raw_tag == "gap":
-            text = ""
-            text += "["
-            if xml.get("unit") is not None and xml.get("extent") is not None:
-                unit = xml.get("unit")
-                extent = xml.get("extent")
-                text += extent + " " + unit
-                text += " "
-                text += "gap"
-            else:
-                text += "..."  # placeholder text for gap if no unit and extent are specified
-            if xml.get("reason") is not None:
-                text += " "
-                reason = xml.get("reason")
-                text += "(" + reason + ")"
-            text += "]"
-            text += xml.tail if xml.tail is not None else ""
-            self.text += text
-            return
-        # If it is a supplied element, then recursively set the contents in brackets:
-        if raw_tag == "supplied":
-            self.text += "["
-            self.text += xml.text if xml.text is not None else ""
-            for child in xml:
-                self.parse(child, verbose)
-            self.text += "]"
-            self.text += xml.tail if xml.tail is not None else ""
-            return
-        # If it is an unclear element, then add an underdot to each character in its contents:
-        if raw_tag == "unclear":
-            # Keep track of how long the text currently is, so we can modify just the portion we're about to add:
-            starting_ind = len(self.text)
-            self.text += xml.text if xml.text is not None else ""
-            for child in xml:
-                self.parse(child, verbose)
-            old_text = self.text[
-                starting_ind:
-            ].strip()  # strip any trailing spaces (in case there were entire words whose presence is unclear)
-            new_text = ""
-            # Add a dot under each character other than spaces:
-            for c in old_text:
-                new_text += c
-                if c != " ":
-                    new_text += "\u0323"
-            self.text = self.text[:starting_ind] + new_text
-            self.text += xml.tail if xml.tail is not None else ""
-            return
-        # If it is a choice element, then recursively set the contents in brackets, separated by slashes:
-        if raw_tag == "choice":
-            self.text += "["
-            self.text += xml.text if xml.text is not None else ""
-            for child in xml:
-                self.parse(child, verbose)
-                self.text = self.text.strip() + "/"  # add a slash between each possibility
-            self.text = self.text.strip("/")  # remove the last one we added
-            self.text += "]"
-            self.text += xml.tail if xml.tail is not None else ""
-            return
-        # If it is a ref element, then set its text (stripped of "#" characters) in parentheses:
-        if raw_tag == "ref":
-            self.text += "("
-            self.text += xml.get("target").strip("#") if xml.get("target") is not None else ""
-            self.text += ")"
-            self.text += xml.tail if xml.tail is not None else ""
-            return
+        return
+
+    def parse_text(self, xml: et.Element):
+        """Given a lem, rdg, or witDetail element, serializes the text of its contents.
+
+        Args:
+            xml: A lem, rdg, or witDetail element.
+
+        Returns:
+            The serialized text of the element, stripped of surrounding whitespace.
+        """
+        # The serialized text is accumulated as a list of pieces.
+        # Elements whose contents must be transformed as a whole (i.e., unclear and choice elements) get their own buffers,
+        # which are kept on a stack together with the depths of their elements:
+        pieces = [xml.text if xml.text is not None else ""]
+        stack = [(0, "rdg", pieces)]
+        depth = 0
+        walker = et.iterwalk(xml, events=("start", "end"))
+        for event, elem in walker:
+            if event == "start":
+                depth += 1
+                # The reading element itself has already been handled:
+                if depth == 1:
+                    continue
+                raw_tag = elem.tag.replace("{%s}" % tei_ns, "")
+                text = elem.text if elem.text is not None else ""
+                # If it is a certainty measurement, then skip it, since it has already been stored in this reading's certainties map:
+                if raw_tag == "certainty":
+                    walker.skip_subtree()
+                # If it is a word or an abbreviation, then serialize its text and process its subelements:
+                elif raw_tag in ["w", "abbr"]:
+                    pieces.append(text)
+                # If it is an overline-rendered element, then add an overline to each character in its text (ignoring any subelements):
+                elif raw_tag == "hi":
+                    # NOTE: other rendering types could be supported here
+                    if elem.get("rend") is not None and elem.get("rend") == "overline":
+                        text = "".join([c + "\u0305" for c in text])
+                    pieces.append(text)
+                    walker.skip_subtree()
+                # If it is a space, then serialize as a single space:
+                elif raw_tag == "space":
+                    pieces.append(self.serialize_lacuna(elem, "space", "space"))
+                    walker.skip_subtree()
+                # If it is an expansion, then serialize it in parentheses:
+                elif raw_tag == "ex":
+                    pieces.append("(" + text + ")")
+                    walker.skip_subtree()
+                # If it is a gap, then serialize it based on its attributes
+                # (with placeholder text for the gap if no unit and extent are specified):
+                elif raw_tag == "gap":
+                    pieces.append(self.serialize_lacuna(elem, "gap", "..."))
+                    walker.skip_subtree()
+                # If it is a supplied element, then set its contents in brackets:
+                elif raw_tag == "supplied":
+                    pieces.append("[" + text)
+                # If it is an unclear element, then start a new buffer for its contents, so that we can add underdots to them later:
+                elif raw_tag == "unclear":
+                    pieces = [text]
+                    stack.append((depth, raw_tag, pieces))
+                # If it is a choice element, then start a new buffer for its contents, so that we can separate them with slashes:
+                elif raw_tag == "choice":
+                    pieces = ["[" + text]
+                    stack.append((depth, raw_tag, pieces))
+                # If it is a ref element, then set its target (stripped of "#" characters) in parentheses:
+                elif raw_tag == "ref":
+                    pieces.append("(" + (elem.get("target").strip("#") if elem.get("target") is not None else "") + ")")
+                    walker.skip_subtree()
+                # Otherwise, ignore this element, its contents, and its tail:
+                else:
+                    walker.skip_subtree()
+                continue
+            # Otherwise, we have reached the end of an element:
+            depth -= 1
+            if depth == 0:
+                break
+            raw_tag = elem.tag.replace("{%s}" % tei_ns, "")
+            tail = elem.tail if elem.tail is not None else ""
+            if raw_tag in ["abbr", "hi", "space", "ex", "gap", "ref"]:
+                pieces.append(tail)
+            elif raw_tag == "w":
+                # Add a space after each word:
+                pieces.append(tail)
+                pieces.append(" ")
+            elif raw_tag == "supplied":
+                pieces.append("]")
+                pieces.append(tail)
+            elif raw_tag == "unclear":
+                stack.pop()
+                # Strip any surrounding spaces (in case there were entire words whose presence is unclear),
+                # and add a dot under each character other than spaces:
+                old_text = "".join(pieces).strip()
+                new_text = "".join([c + "\u0323" if c != " " else c for c in old_text])
+                pieces = stack[-1][2]
+                pieces.append(new_text)
+                pieces.append(tail)
+            elif raw_tag == "choice":
+                stack.pop()
+                # Remove the last slash we added, and close the brackets:
+                new_text = "".join(pieces).rstrip("/") + "]"
+                pieces = stack[-1][2]
+                pieces.append(new_text)
+                pieces.append(tail)
+            # If this element is a child of a choice element, then add a slash between it and the next possibility:
+            if stack[-1][1] == "choice" and stack[-1][0] == depth:
+                self.rstrip_pieces(pieces)
+                pieces.append("/")
+        # Strip any surrounding whitespace left over from spaces added between word elements:
+        return "".join(stack[0][2]).strip()
+
+    def rstrip_pieces(self, pieces: list):
+        """Strips trailing whitespace from the end of a list of text pieces in place.
+
+        Args:
+            pieces: A list of strings.
+        """
+        while len(pieces) > 0:
+            last = pieces.pop().rstrip()
+            if last != "":
+                pieces.append(last)
+                return
+        return
+
+    def serialize_lacuna(self, xml: et.Element, name: str, placeholder: str):
+        """Serializes a space or gap element based on its attributes.
+
+        Args:
+            xml: A space or gap element.
+            name: The name to use for this type of element in the serialization.
+            placeholder: The text to use if the element does not specify a unit and extent.
+
+        Returns:
+            The serialization of the element, in brackets.
+        """
+        text = "["
+        if xml.get("unit") is not None and xml.get("extent") is not None:
+            unit = xml.get("unit")
+            extent = xml.get("extent")
+            text += extent + " " + unit
+            text += " "
+            text += name
+        else:
+            text += placeholder
+        if xml.get("reason") is not None:
+            text += " "
+            reason = xml.get("reason")
+            text += "(" + reason + ")"
+        text += "]"
+        return text
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+from collections.abc import Mapping  # for the read-only dictionary interface
+
+
+class ReadingSupportView(Mapping):
+    """Class providing a read-only, dictionary-like view of a Collation's reading support tensor.
+
+    For each base witness ID, the view returns a list containing a reading support list for every variation unit,
+    in the same form as the dictionary of lists that Collation.readings_by_witness used to be.
+    These lists are materialized from the tensor on every access, so modifying them does not modify the collation.
+
+    Attributes:
+        collation: The Collation whose reading support tensor is viewed.
+    """
+
+    __slots__ = ["collation"]
+
+    def __init__(self, collation):
+        """Constructs a new view of the given Collation's reading support tensor.
+
+        Args:
+            collation: A Collation.
+        """
+        self.collation = collation
+
+    def __getitem__(self, wit_id: str):
+        wit_ind = self.collation.witness_index_by_id[wit_id]
+        return self.collation.get_witness_reading_support(wit_ind)
+
+    def __iter__(self):
+        return (wit.id for wit in self.collation.witnesses)
+
+    def __len__(self):
+        return len(self.collation.witnesses)
+
+    def __contains__(self, wit_id: str):
+        return wit_id in self.collation.witness_index_by_id
+
+    def __repr__(self):
+        return "%s(%d witnesses)" % (type(self).__name__, len(self))
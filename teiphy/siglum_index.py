@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+from lxml import etree as et
+
+from .common import tei_ns
+from .siglum_resolver import SiglumResolver
+from .variation_unit import VariationUnit
+
+
+class SiglumIndex:
+    """Class for an index of the witness sigla that occur in a collation, built in a single pass over its app elements.
+
+    For each distinct siglum, the index records the IDs of the variation units in which it occurs and the base witness to which it resolves,
+    so that the suffixes of each siglum are stripped once, no matter how many times it occurs.
+
+    Attributes:
+        unit_ids_by_siglum: A dictionary mapping each distinct siglum to a list of the IDs of the variation units in which it occurs, in document order.
+        base_by_siglum: A dictionary mapping each distinct siglum to its base siglum, as resolved by the resolver.
+        resolver: The SiglumResolver used to populate the base_by_siglum dictionary, or None if it has not been populated yet.
+    """
+
+    # The tags of the elements whose wit attributes are indexed:
+    wit_tags = ["{%s}%s" % (tei_ns, tag) for tag in ["lem", "rdg", "rdgGrp", "witDetail"]]
+
+    def __init__(self):
+        """Constructs a new, empty SiglumIndex."""
+        self.unit_ids_by_siglum = {}
+        self.base_by_siglum = {}
+        self.resolver = None
+
+    def __len__(self):
+        return len(self.unit_ids_by_siglum)
+
+    def __iter__(self):
+        return iter(self.unit_ids_by_siglum)
+
+    def __contains__(self, siglum: str):
+        return siglum in self.unit_ids_by_siglum
+
+    def copy(self):
+        """Returns a copy of this SiglumIndex that can be modified without affecting it.
+
+        Returns:
+            A new SiglumIndex with the same entries.
+        """
+        index = SiglumIndex()
+        index.unit_ids_by_siglum = {siglum: list(unit_ids) for siglum, unit_ids in self.unit_ids_by_siglum.items()}
+        index.base_by_siglum = dict(self.base_by_siglum)
+        index.resolver = self.resolver
+        return index
+
+    def add(self, siglum: str, unit_id: str):
+        """Records an occurrence of the given siglum in the variation unit with the given ID.
+
+        Args:
+            siglum: A witness siglum.
+            unit_id: The ID of the variation unit in which it occurs.
+        """
+        unit_ids = self.unit_ids_by_siglum.get(siglum)
+        if unit_ids is None:
+            self.unit_ids_by_siglum[siglum] = [unit_id]
+            # If the base sigla have already been resolved, then resolve the new siglum as well:
+            if self.resolver is not None:
+                self.base_by_siglum[siglum] = self.resolver.resolve(siglum)
+        elif unit_ids[-1] != unit_id:
+            unit_ids.append(unit_id)
+        return
+
+    def index_app(self, app: et.Element):
+        """Given an app element, records the witness sigla in the wit attributes of all lem, rdg, rdgGrp, and witDetail elements that belong to it
+        (i.e., that are not inside another app element nested in it) as occurrences in its variation unit.
+
+        Args:
+            app: An lxml.etree.Element representing an app element.
+        """
+        unit_id = VariationUnit.parse_id(app)
+        for elem in app.iter(*self.wit_tags):
+            wit_str = elem.get("wit")
+            if wit_str is None:
+                continue
+            # The sigla of a nested app element are indexed under its own variation unit:
+            if next(elem.iterancestors("{%s}app" % tei_ns)) is not app:
+                continue
+            for wit in wit_str.split():
+                self.add(wit.strip("#"), unit_id)  # remove the URI prefix, if there is one
+        return
+
+    def update(self, other):
+        """Adds the occurrences recorded in another SiglumIndex (e.g., for another file of the same collation) to this one.
+
+        Args:
+            other: A SiglumIndex.
+        """
+        for siglum, unit_ids in other.unit_ids_by_siglum.items():
+            for unit_id in unit_ids:
+                self.add(siglum, unit_id)
+        return
+
+    def resolve(self, resolver: SiglumResolver):
+        """Returns the dictionary mapping each distinct siglum to its base siglum under the given resolver,
+        resolving every distinct siglum once if the base sigla have not already been resolved with this resolver.
+
+        Args:
+            resolver: A SiglumResolver.
+
+        Returns:
+            A dictionary mapping witness sigla to their base sigla.
+        """
+        if resolver is not self.resolver:
+            self.base_by_siglum = {siglum: resolver.resolve(siglum) for siglum in self.unit_ids_by_siglum}
+            self.resolver = resolver
+        return self.base_by_siglum
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+from typing import List, Iterable
+from collections import OrderedDict  # for the bounded memo table
+
+
+class SiglumResolver:
+    """Class for resolving witness sigla to their base witness sigla by stripping manuscript suffixes.
+
+    The suffixes are compiled once into a trie keyed on their reversed characters,
+    so that all suffixes ending a siglum can be found in a single backward scan over the siglum
+    rather than by testing every suffix in turn.
+    Resolved sigla are stored in a memo table of bounded size, from which the least recently used entries are evicted.
+
+    Attributes:
+        manuscript_suffixes: A list of suffixes used to distinguish manuscript subwitnesses from their base witnesses.
+            When more than one suffix ends a siglum, the one that occurs first in this list is stripped.
+        witness_ids: A frozenset of base witness ID strings.
+            If the witness list changes, then a new SiglumResolver should be constructed for it, since the memoized resolutions may no longer hold.
+        maxsize: The maximum number of resolved sigla to keep in the memo table.
+        hits: The number of resolutions served from the memo table.
+        misses: The number of resolutions that had to be computed.
+    """
+
+    def __init__(self, manuscript_suffixes: List[str], witness_ids: Iterable[str], maxsize: int = 65536):
+        """Constructs a new SiglumResolver for the given suffixes and witnesses.
+
+        Args:
+            manuscript_suffixes: A list of suffixes used to distinguish manuscript subwitnesses from their base witnesses.
+            witness_ids: An iterable of base witness ID strings.
+            maxsize: An optional maximum number of resolved sigla to keep in the memo table.
+        """
+        self.manuscript_suffixes = list(manuscript_suffixes)
+        self.witness_ids = frozenset(witness_ids)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.memo = OrderedDict()
+        # Each trie node is a list consisting of a dictionary of child nodes keyed by character
+        # and the index in the suffix list of the suffix ending at this node (or None if no suffix ends here):
+        self.trie = [{}, None]
+        for i, suffix in enumerate(self.manuscript_suffixes):
+            # An empty suffix cannot be stripped from anything, so skip it:
+            if suffix == "":
+                continue
+            node = self.trie
+            for c in reversed(suffix):
+                node = node[0].setdefault(c, [{}, None])
+            # If the same suffix is listed more than once, then only its first occurrence matters:
+            if node[1] is None:
+                node[1] = i
+
+    def __len__(self):
+        return len(self.memo)
+
+    def match_suffix(self, siglum: str, end: int):
+        """Returns the length of the first suffix in the suffix list that ends the given prefix of a siglum.
+
+        Args:
+            siglum: A witness siglum.
+            end: The length of the prefix of the siglum to check.
+
+        Returns:
+            The length of the matching suffix with the lowest index in the suffix list, or 0 if no suffix matches.
+        """
+        node = self.trie
+        best_index = None
+        best_length = 0
+        for j in range(end - 1, -1, -1):
+            node = node[0].get(siglum[j])
+            if node is None:
+                break
+            if node[1] is not None and (best_index is None or node[1] < best_index):
+                best_index = node[1]
+                best_length = end - j
+        return best_length
+
+    def resolve(self, wit: str):
+        """Given a witness siglum, strips the manuscript suffixes from it until it matches a base witness or until no more suffixes can be stripped.
+
+        Args:
+            wit: A string representing a witness siglum, potentially including suffixes to be stripped.
+
+        Returns:
+            The resulting base siglum.
+        """
+        base_wit = self.memo.get(wit)
+        if base_wit is not None:
+            self.hits += 1
+            self.memo.move_to_end(wit)
+            return base_wit
+        self.misses += 1
+        # If our starting siglum corresponds to a siglum in the witness list, then just keep it;
+        # otherwise, strip any suffixes we find until the siglum corresponds to a base witness in the list
+        # or no more suffixes can be stripped:
+        end = len(wit)
+        while wit[:end] not in self.witness_ids:
+            suffix_length = self.match_suffix(wit, end)
+            if suffix_length == 0:
+                break
+            end -= suffix_length
+        base_wit = wit[:end]
+        self.memo[wit] = base_wit
+        if len(self.memo) > self.maxsize:
+            self.memo.popitem(last=False)
+        return base_wit
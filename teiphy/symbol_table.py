@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+from typing import Iterable
+
+
+class SymbolTable:
+    """Class for assigning dense integer IDs to strings (e.g., the IDs of witnesses, variation units, or readings),
+    so that inner loops and arrays can refer to them by int, and the strings only have to be looked up when output is written.
+
+    IDs are assigned in order, starting from 0.
+    A symbol can either be added, in which case it always receives a new ID (so that the IDs match the positions of the objects it labels),
+    or interned, in which case it keeps the ID it received when it was first seen (so that repeated strings are stored only once).
+
+    Attributes:
+        symbols: A list of the symbol strings, indexed by their int IDs.
+        index_by_symbol: A dictionary mapping each distinct symbol string to its int ID (or, if it was added more than once, to its last ID).
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        """Constructs a new SymbolTable, adding the given symbols in order.
+
+        Args:
+            symbols: An optional iterable of symbol strings.
+        """
+        self.symbols = []
+        self.index_by_symbol = {}
+        for symbol in symbols:
+            self.add(symbol)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str):
+        return symbol in self.index_by_symbol
+
+    def add(self, symbol: str):
+        """Assigns the next int ID to the given symbol, even if it has been seen before.
+
+        Args:
+            symbol: A symbol string.
+
+        Returns:
+            The int ID assigned to the symbol.
+        """
+        ind = len(self.symbols)
+        self.symbols.append(symbol)
+        self.index_by_symbol[symbol] = ind
+        return ind
+
+    def intern(self, symbol: str):
+        """Returns the int ID of the given symbol, assigning it the next ID if it has not been seen before.
+
+        Args:
+            symbol: A symbol string.
+
+        Returns:
+            The int ID of the symbol.
+        """
+        ind = self.index_by_symbol.get(symbol)
+        if ind is None:
+            ind = self.add(symbol)
+        return ind
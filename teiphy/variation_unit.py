@@ -2,7 +2,7 @@
 
 from lxml import etree as et  # for reading TEI XML inputs
 
-from .common import xml_ns, tei_ns
+from .common import xml_ns, tei_ns, empty_mapping
 from .reading import Reading
 
 
@@ -20,6 +20,14 @@ class VariationUnit:
         that could explain the rise of the second reading from the first.
     """
 
+    __slots__ = [
+        "id",
+        "analysis_categories",
+        "readings",
+        "intrinsic_relations",
+        "transcriptional_relations_by_date_range",
+    ]
+
     def __init__(self, xml: et.Element, verbose: bool = False):
         """Constructs a new VariationUnit instance from the TEI XML input.
 
@@ -27,36 +35,63 @@ class VariationUnit:
             xml: An lxml.etree.Element representing an app element.
             verbose: An optional boolean flag indicating whether or not to print status updates.
         """
-        # Use its xml:id if it has one; otherwise, use its n, from, and to attributes if it has them:
-        self.id = ""
-        if xml.get("{%s}id" % xml_ns) is not None:
-            self.id = xml.get("{%s}id" % xml_ns)
-        elif xml.get("n") is not None:
-            self.id = xml.get("n")
-            if xml.get("from") is not None and xml.get("to") is not None:
-                if xml.get("from") != xml.get("to"):
-                    self.id += "_" + xml.get("from") + "_" + xml.get("to")  # range of word indices
-                else:
-                    self.id += "_" + xml.get("from")  # single word index
+        self.id = VariationUnit.parse_id(xml)
         # Initialize its list of analysis categories (for weighting changes in this unit in the stemma program):
-        self.analysis_categories = []
+        self.analysis_categories = ()
         if xml.get("ana") is not None:
             ana_split = xml.get("ana").split()
-            for ana in ana_split:
-                self.analysis_categories.append(ana.strip("#"))  # remove any leading hashtags
+            self.analysis_categories = tuple([ana.strip("#") for ana in ana_split])  # remove any leading hashtags
         # Initialize its list of readings:
         self.readings = []
         # Initialize its dictionaries of intrinsic and transcriptional relations:
-        self.intrinsic_relations = {}
-        self.transcriptional_relations_by_date_range = {}
+        self.intrinsic_relations = empty_mapping
+        self.transcriptional_relations_by_date_range = empty_mapping
         # Now parse the app element to populate these data structures:
         self.parse(xml, verbose)
         if verbose:
             print("New VariationUnit %s with %d readings" % (self.id, len(self.readings)))
 
+    @staticmethod
+    def parse_id(xml: et.Element):
+        """Given an app element, returns the ID of its variation unit.
+
+        Args:
+            xml: An lxml.etree.Element representing an app element.
+
+        Returns:
+            Its xml:id if it has one; otherwise, an ID assembled from its n, from, and to attributes if it has them; otherwise, an empty string.
+        """
+        # Use its xml:id if it has one; otherwise, use its n, from, and to attributes if it has them:
+        vu_id = ""
+        if xml.get("{%s}id" % xml_ns) is not None:
+            vu_id = xml.get("{%s}id" % xml_ns)
+        elif xml.get("n") is not None:
+            vu_id = xml.get("n")
+            if xml.get("from") is not None and xml.get("to") is not None:
+                if xml.get("from") != xml.get("to"):
+                    vu_id += "_" + xml.get("from") + "_" + xml.get("to")  # range of word indices
+                else:
+                    vu_id += "_" + xml.get("from")  # single word index
+        return vu_id
+
     def __str__(self):
         return self.id
 
+    def __getstate__(self):
+        # The shared empty mapping cannot be pickled, so replace it with an ordinary dictionary:
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state["intrinsic_relations"] = dict(self.intrinsic_relations)
+        state["transcriptional_relations_by_date_range"] = dict(self.transcriptional_relations_by_date_range)
+        return state
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+        if len(self.intrinsic_relations) == 0:
+            self.intrinsic_relations = empty_mapping
+        if len(self.transcriptional_relations_by_date_range) == 0:
+            self.transcriptional_relations_by_date_range = empty_mapping
+
     def __repr__(self):
         return str(self)
 
@@ -115,7 +150,8 @@ class VariationUnit:
                 while len(previous_rdg.targets) > 0:
                     previous_rdg_ind -= 1
                     previous_rdg = self.readings[previous_rdg_ind]
-                witDetail.targets.append(previous_rdg.id)
+                witDetail.targets = (previous_rdg.id,)
+                witDetail.certainties = dict(witDetail.certainties)
                 witDetail.certainties[previous_rdg.id] = 1
             self.readings.append(witDetail)
             return
@@ -17,6 +17,8 @@ class Witness:
         date_range: A list containing a low and high date for this Witness.
     """
 
+    __slots__ = ["id", "type", "date_range"]
+
     def __init__(self, xml: et.Element, verbose: bool = False):
         """Constructs a new Witness instance from the TEI XML input.
 
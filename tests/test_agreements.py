@@ -0,0 +1,195 @@
+import unittest
+import numpy as np
+
+from teiphy.agreements import (
+    get_unit_columns,
+    get_unit_sums,
+    gram_counts,
+    shared_extant_counts,
+    information_weighted_agreements,
+    mutual_information,
+    AgreementCounts,
+)
+
+
+class UnitColumnsTestCase(unittest.TestCase):
+    def test_get_unit_columns(self):
+        unit_inds, widths, unit_offsets, cols = get_unit_columns(np.array([0, 2, 2, 5, 6]), [0, 1, 2])
+        self.assertEqual(unit_inds.tolist(), [0, 1, 2])
+        self.assertEqual(widths.tolist(), [2, 0, 3])
+        self.assertEqual(unit_offsets.tolist(), [0, 2, 2, 5])
+        self.assertEqual(cols.tolist(), [0, 1, 2, 3, 4])
+        unit_inds, widths, unit_offsets, cols = get_unit_columns(np.array([0, 2, 2, 5, 6]), [0, 3])
+        self.assertEqual(cols.tolist(), [0, 1, 5])
+
+    def test_get_unit_sums(self):
+        array = np.array([[1, 2, 3, 4, 5], [0, 0, 1, 0, 0]])
+        # Units without readings, including one at the end, should sum to 0:
+        sums = get_unit_sums(array, np.array([0, 2, 2, 5, 5]))
+        self.assertEqual(sums.tolist(), [[3, 0, 12, 0], [0, 0, 1, 0]])
+        self.assertEqual(get_unit_sums(array > 0, np.array([0, 2, 5])).tolist(), [[2, 3], [0, 1]])
+
+
+class GramCountsTestCase(unittest.TestCase):
+    def test_gram_counts(self):
+        rng = np.random.default_rng(0)
+        mask = rng.random((5, 130)) < 0.3
+        counts = gram_counts(mask)
+        self.assertEqual(counts.dtype, int)
+        self.assertEqual(counts.tolist(), (mask.astype(int) @ mask.T.astype(int)).tolist())
+        self.assertEqual(gram_counts(mask[:2], mask[2:]).tolist(), counts[:2, 2:].tolist())
+
+    def test_shared_extant_counts(self):
+        rng = np.random.default_rng(0)
+        extant_mask = rng.random((6, 40)) < 0.5
+        unit_inds = [0, 3, 4, 10, 39]
+        expected = extant_mask[:, unit_inds].astype(int) @ extant_mask[:, unit_inds].T.astype(int)
+        self.assertEqual(shared_extant_counts(extant_mask, unit_inds, chunk_size=12).tolist(), expected.tolist())
+        expected = extant_mask.astype(int) @ extant_mask.T.astype(int)
+        self.assertEqual(shared_extant_counts(extant_mask).tolist(), expected.tolist())
+        self.assertEqual(
+            shared_extant_counts(extant_mask, chunk_size=12, row_block=slice(1, 3), col_block=slice(3, 6)).tolist(),
+            expected[1:3, 3:6].tolist(),
+        )
+        self.assertEqual(shared_extant_counts(extant_mask, row_block=slice(2, 5)).tolist(), expected[2:5, 2:5].tolist())
+
+
+class AgreementCountsTestCase(unittest.TestCase):
+    def setUp(self):
+        # Three units with 2, 0, and 3 readings and four witnesses:
+        # the first witness is ambiguous in the last unit, and the last witness is lacunose in the first unit.
+        self.reading_offsets = np.array([0, 2, 2, 5])
+        self.reading_support = np.array(
+            [
+                [1, 0, 0.5, 0.5, 0],
+                [1, 0, 0, 1, 0],
+                [0, 1, 0, 0, 1],
+                [0, 0, 1, 0, 0],
+            ],
+            dtype=float,
+        )
+        self.extant_mask = np.array(
+            [
+                [True, False, True],
+                [True, False, True],
+                [True, False, True],
+                [False, False, True],
+            ]
+        )
+        self.agreement_counts = AgreementCounts(self.reading_support, self.reading_offsets, self.extant_mask)
+
+    def test_shared_extant_counts(self):
+        self.assertEqual(
+            self.agreement_counts.shared_extant_counts().tolist(),
+            [[2, 2, 2, 1], [2, 2, 2, 1], [2, 2, 2, 1], [1, 1, 1, 1]],
+        )
+
+    def test_agreement_counts(self):
+        self.assertEqual(
+            self.agreement_counts.agreement_counts().tolist(), [[1, 1, 0, 0], [1, 2, 0, 0], [0, 0, 2, 0], [0, 0, 0, 1]]
+        )
+
+    def test_disagreement_counts(self):
+        self.assertEqual(
+            self.agreement_counts.disagreement_counts().tolist(),
+            [[0, 0, 2, 0], [0, 0, 2, 1], [2, 2, 0, 1], [0, 1, 1, 0]],
+        )
+
+    def test_counts_are_copies(self):
+        self.agreement_counts.agreement_counts()[0, 0] = 100
+        self.assertEqual(self.agreement_counts.agreement_counts()[0, 0], 1)
+
+    def test_unit_inds(self):
+        agreement_counts = AgreementCounts(self.reading_support, self.reading_offsets, self.extant_mask, [0])
+        self.assertEqual(
+            agreement_counts.disagreement_counts().tolist(), [[0, 0, 1, 0], [0, 0, 1, 0], [1, 1, 0, 0], [0, 0, 0, 0]]
+        )
+
+    def test_chunk_size(self):
+        agreement_counts = AgreementCounts(self.reading_support, self.reading_offsets, self.extant_mask, chunk_size=1)
+        self.assertEqual(
+            agreement_counts.disagreement_counts().tolist(), self.agreement_counts.disagreement_counts().tolist()
+        )
+        self.assertEqual(
+            agreement_counts.agreement_counts().tolist(), self.agreement_counts.agreement_counts().tolist()
+        )
+
+    def test_ambiguous_pairs(self):
+        # Two witnesses that are both ambiguous between the same two readings overlap once in that unit, not twice:
+        reading_support = np.array([[0.5, 0.5], [0.5, 0.5], [0, 1]])
+        extant_mask = np.ones((3, 1), dtype=bool)
+        agreement_counts = AgreementCounts(reading_support, np.array([0, 2]), extant_mask)
+        self.assertEqual(agreement_counts.overlaps.tolist(), [[1, 1, 1], [1, 1, 1], [1, 1, 1]])
+        self.assertEqual(agreement_counts.agreement_counts().tolist(), [[0, 0, 0], [0, 0, 0], [0, 0, 1]])
+
+    def test_tiles(self):
+        rng = np.random.default_rng(0)
+        reading_offsets = np.concatenate([[0], np.cumsum(rng.integers(0, 4, 30))])
+        reading_support = (rng.random((11, reading_offsets[-1])) < 0.4).astype(np.uint8)
+        extant_mask = rng.random((11, 30)) < 0.8
+        agreement_counts = AgreementCounts(reading_support, reading_offsets, extant_mask)
+        for row_block, col_block in [(slice(0, 4), slice(4, 11)), (slice(6, 11), slice(0, 2)), (slice(3, 8), None)]:
+            tile = AgreementCounts(
+                reading_support, reading_offsets, extant_mask, chunk_size=40, row_block=row_block, col_block=col_block
+            )
+            cols = row_block if col_block is None else col_block
+            self.assertEqual(tile.shared_extant.tolist(), agreement_counts.shared_extant[row_block, cols].tolist())
+            self.assertEqual(tile.agreements.tolist(), agreement_counts.agreements[row_block, cols].tolist())
+            self.assertEqual(tile.overlaps.tolist(), agreement_counts.overlaps[row_block, cols].tolist())
+
+
+class InformationWeightedAgreementsTestCase(unittest.TestCase):
+    def test_information_weighted_agreements(self):
+        rng = np.random.default_rng(0)
+        unit_offsets = np.array([0, 2, 2, 5, 6, 9])
+        supports = rng.random((7, 9)) * (rng.random((7, 9)) < 0.6)
+        weights = rng.random(9)
+        # Normalize each witness's support in each unit to sum to 1:
+        for k in range(len(unit_offsets) - 1):
+            unit_supports = supports[:, unit_offsets[k] : unit_offsets[k + 1]]
+            norms = unit_supports.sum(axis=1, keepdims=True)
+            np.divide(unit_supports, norms, out=unit_supports, where=(norms > 0))
+        expected = np.zeros((7, 7))
+        for i in range(7):
+            for j in range(7):
+                for k in range(len(unit_offsets) - 1):
+                    products = (supports[i] * supports[j])[unit_offsets[k] : unit_offsets[k + 1]]
+                    if products.sum() > 0:
+                        expected[i, j] += (
+                            products * weights[unit_offsets[k] : unit_offsets[k + 1]]
+                        ).sum() / products.sum()
+        matrix = information_weighted_agreements(supports, unit_offsets, weights)
+        self.assertTrue(np.all(matrix == matrix.T))
+        self.assertTrue(np.allclose(matrix, expected))
+        tile = information_weighted_agreements(supports[:3], unit_offsets, weights, supports[3:])
+        self.assertTrue(np.allclose(tile, expected[:3, 3:]))
+
+
+class MutualInformationTestCase(unittest.TestCase):
+    def test_mutual_information(self):
+        rng = np.random.default_rng(0)
+        unit_offsets = np.array([0, 2, 2, 5, 6, 9])
+        supports = rng.random((7, 9)) * (rng.random((7, 9)) < 0.6)
+        sampling_probabilities = np.zeros(9)
+        # Normalize each witness's support and the sampling probabilities in each unit to sum to 1:
+        for k in range(len(unit_offsets) - 1):
+            unit_supports = supports[:, unit_offsets[k] : unit_offsets[k + 1]]
+            norms = unit_supports.sum(axis=1, keepdims=True)
+            np.divide(unit_supports, norms, out=unit_supports, where=(norms > 0))
+            unit_sums = unit_supports.sum(axis=0)
+            sampling_probabilities[unit_offsets[k] : unit_offsets[k + 1]] = unit_sums / max(unit_sums.sum(), 1.0)
+        expected = np.zeros((7, 7))
+        for i in range(7):
+            for j in range(7):
+                for k in range(len(unit_offsets) - 1):
+                    a = supports[i, unit_offsets[k] : unit_offsets[k + 1]]
+                    b = supports[j, unit_offsets[k] : unit_offsets[k + 1]]
+                    p = sampling_probabilities[unit_offsets[k] : unit_offsets[k + 1]]
+                    observed = np.outer(a, b)
+                    mask = observed > 0
+                    expected[i, j] += (observed[mask] * np.log2(observed[mask] / np.outer(p, p)[mask])).sum()
+        matrix = mutual_information(supports, unit_offsets, sampling_probabilities)
+        self.assertTrue(np.all(matrix == matrix.T))
+        self.assertTrue(np.allclose(matrix, expected))
+        tile = mutual_information(supports[:3], unit_offsets, sampling_probabilities, supports[3:])
+        self.assertTrue(np.allclose(tile, expected[:3, 3:]))
@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+
+from teiphy.bitsets import pack_bits, popcount, pairwise_popcount, ReadingBitsets
+
+
+class BitsetsTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.mask = rng.random((5, 130)) < 0.3
+
+    def test_pack_bits(self):
+        words = pack_bits(self.mask)
+        self.assertEqual(words.dtype, np.uint64)
+        self.assertEqual(words.shape, (5, 3))
+        self.assertEqual(popcount(words).tolist(), self.mask.sum(axis=1).tolist())
+
+    def test_popcount_without_bitwise_count(self):
+        words = pack_bits(self.mask)
+        with patch("teiphy.bitsets.hasattr", return_value=False, create=True):
+            self.assertEqual(popcount(words).tolist(), self.mask.sum(axis=1).tolist())
+
+    def test_pairwise_popcount(self):
+        counts = pairwise_popcount(pack_bits(self.mask))
+        expected = self.mask.astype(int) @ self.mask.T.astype(int)
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+    def test_pairwise_popcount_tiles(self):
+        mask = np.random.default_rng(1).random((7, 200)) < 0.3
+        # Use a small chunk size, so that the rows are processed in tiles of 2:
+        counts = pairwise_popcount(pack_bits(mask), chunk_size=2 * 7 * 4)
+        expected = mask.astype(int) @ mask.T.astype(int)
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+
+class ReadingBitsetsTestCase(unittest.TestCase):
+    def setUp(self):
+        # Three units with 2, 0, and 3 readings and four witnesses:
+        # the first witness is ambiguous in the last unit, and the last witness is lacunose in the first unit.
+        self.reading_offsets = np.array([0, 2, 2, 5])
+        self.reading_support = np.array(
+            [
+                [1, 0, 0.5, 0.5, 0],
+                [1, 0, 0, 1, 0],
+                [0, 1, 0, 0, 1],
+                [0, 0, 1, 0, 0],
+            ],
+            dtype=float,
+        )
+        self.extant_mask = np.array(
+            [
+                [True, False, True],
+                [True, False, True],
+                [True, False, True],
+                [False, False, True],
+            ]
+        )
+        self.bitsets = ReadingBitsets(self.reading_support, self.reading_offsets, self.extant_mask)
+
+    def test_ambiguous_supports(self):
+        self.assertEqual(len(self.bitsets.ambiguous_supports), 1)
+
+    def test_shared_extant_counts(self):
+        self.assertEqual(
+            self.bitsets.shared_extant_counts().tolist(), [[2, 2, 2, 1], [2, 2, 2, 1], [2, 2, 2, 1], [1, 1, 1, 1]]
+        )
+
+    def test_agreement_counts(self):
+        self.assertEqual(
+            self.bitsets.agreement_counts().tolist(), [[1, 1, 0, 0], [1, 2, 0, 0], [0, 0, 2, 0], [0, 0, 0, 1]]
+        )
+
+    def test_disagreement_counts(self):
+        self.assertEqual(
+            self.bitsets.disagreement_counts().tolist(), [[0, 0, 2, 0], [0, 0, 2, 1], [2, 2, 0, 1], [0, 1, 1, 0]]
+        )
+
+    def test_disagreement_counts_ambiguous_pair(self):
+        # Make the third witness ambiguous in the last unit too, so that it overlaps with the first witness there:
+        reading_support = self.reading_support.copy()
+        reading_support[2, 2:] = [0.5, 0, 0.5]
+        bitsets = ReadingBitsets(reading_support, self.reading_offsets, self.extant_mask)
+        self.assertEqual(
+            bitsets.disagreement_counts().tolist(), [[0, 0, 1, 0], [0, 0, 2, 1], [1, 2, 0, 0], [0, 1, 0, 0]]
+        )
+
+    def test_unit_inds(self):
+        bitsets = ReadingBitsets(self.reading_support, self.reading_offsets, self.extant_mask, [0])
+        self.assertEqual(len(bitsets.ambiguous_supports), 0)
+        self.assertEqual(
+            bitsets.disagreement_counts().tolist(), [[0, 0, 1, 0], [0, 0, 1, 0], [1, 1, 0, 0], [0, 0, 0, 0]]
+        )
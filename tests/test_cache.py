@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch
+import os
+import time
+import tempfile
+from pathlib import Path
+from lxml import etree as et
+from tqdm import tqdm
+from functools import partialmethod
+
+from teiphy import Collation
+from teiphy.cache import CollationCache
+
+test_dir = Path(__file__).parent
+root_dir = test_dir.parent
+input_example = root_dir / "example/ubs_ephesians.xml"
+some_dates_csv_file = test_dir / "some_dates.csv"
+
+# For unit tests, we need to disable tqdm, because it writes to stderr (which will cause most tests to fail):
+tqdm.__init__ = partialmethod(tqdm.__init__, disable=True)
+
+
+class CollationCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = CollationCache(Path(self.tmp_dir.name) / "cache")
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(xml, manuscript_suffixes=["*", "T"], fill_corrector_lacunae=True)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_key_options(self):
+        key = self.cache.get_key(input_example, manuscript_suffixes=["*", "T"])
+        self.assertEqual(key, self.cache.get_key(input_example, manuscript_suffixes=["*", "T"]))
+        self.assertNotEqual(key, self.cache.get_key(input_example, manuscript_suffixes=["T", "*"]))
+        self.assertNotEqual(
+            key, self.cache.get_key(input_example, manuscript_suffixes=["*", "T"], fragmentary_threshold=0.5)
+        )
+        self.assertNotEqual(
+            key, self.cache.get_key(input_example, manuscript_suffixes=["*", "T"], dates_file=some_dates_csv_file)
+        )
+
+    def test_get_key_reading_types(self):
+        self.assertEqual(
+            self.cache.get_key(input_example, missing_reading_types=["lac", "overlap"]),
+            self.cache.get_key(input_example, missing_reading_types=["overlap", "lac"]),
+        )
+
+    def test_get_key_version(self):
+        key = self.cache.get_key(input_example)
+        with patch("teiphy.cache.__version__", "0.0.0"):
+            self.assertNotEqual(key, self.cache.get_key(input_example))
+
+    def test_load_missing(self):
+        self.assertIsNone(self.cache.load(self.cache.get_key(input_example)))
+
+    def test_store_load(self):
+        key = self.cache.get_key(input_example, manuscript_suffixes=["*", "T"], fill_corrector_lacunae=True)
+        self.cache.store(key, self.collation)
+        collation = self.cache.load(key)
+        self.assertEqual([wit.id for wit in collation.witnesses], [wit.id for wit in self.collation.witnesses])
+        self.assertEqual([vu.id for vu in collation.variation_units], [vu.id for vu in self.collation.variation_units])
+        self.assertEqual(collation.readings_by_witness, self.collation.readings_by_witness)
+        self.assertEqual(
+            collation.substantive_variation_unit_reading_tuples,
+            self.collation.substantive_variation_unit_reading_tuples,
+        )
+        self.assertEqual(
+            collation.variation_units[1].readings[0].text, self.collation.variation_units[1].readings[0].text
+        )
+
+    def test_load_corrupted(self):
+        key = self.cache.get_key(input_example)
+        self.cache.get_path(key).write_bytes(b"not a pickle")
+        self.assertIsNone(self.cache.load(key))
+        self.assertFalse(self.cache.get_path(key).exists())
+
+    def test_evict(self):
+        self.cache.store("a", self.collation)
+        size = self.cache.get_path("a").stat().st_size
+        self.cache.store("b", self.collation)
+        self.cache.store("c", self.collation)
+        # Make "a" the least recently used entry and "b" the most recently used one:
+        now = time.time()
+        os.utime(self.cache.get_path("a"), (now - 30, now - 30))
+        os.utime(self.cache.get_path("c"), (now - 20, now - 20))
+        os.utime(self.cache.get_path("b"), (now - 10, now - 10))
+        self.cache.max_size = 2 * size
+        self.cache.evict()
+        self.assertFalse(self.cache.get_path("a").exists())
+        self.assertTrue(self.cache.get_path("b").exists())
+        self.assertTrue(self.cache.get_path("c").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
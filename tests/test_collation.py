@@ -2,13 +2,15 @@ import unittest
 from unittest.mock import patch
 from io import StringIO
 from pathlib import Path
+import tempfile
 from datetime import datetime
 import numpy as np
 from lxml import etree as et
 from tqdm import tqdm
 from functools import partialmethod
 
-from teiphy import tei_ns, Collation
+from teiphy import tei_ns, xml_ns, Collation, Witness, Reading, VariationUnit
+from teiphy.collation import ParsingException
 
 test_dir = Path(__file__).parent
 root_dir = test_dir.parent
@@ -72,6 +74,804 @@ class CollationDefaultTestCase(unittest.TestCase):
         self.assertEqual(self.collation.origin_date_range[1], 80)
 
 
+class CollationStreamTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(xml, fill_corrector_lacunae=True)
+        self.streamed_collation = Collation.from_path(input_example, stream=True, fill_corrector_lacunae=True)
+
+    def test_witnesses(self):
+        self.assertEqual(
+            [wit.id for wit in self.streamed_collation.witnesses], [wit.id for wit in self.collation.witnesses]
+        )
+
+    def test_variation_units(self):
+        self.assertEqual(
+            [vu.id for vu in self.streamed_collation.variation_units], [vu.id for vu in self.collation.variation_units]
+        )
+
+    def test_readings_by_witness(self):
+        self.assertEqual(self.streamed_collation.readings_by_witness, self.collation.readings_by_witness)
+
+    def test_substantive_variation_unit_reading_tuples(self):
+        self.assertEqual(
+            self.streamed_collation.substantive_variation_unit_reading_tuples,
+            self.collation.substantive_variation_unit_reading_tuples,
+        )
+
+    def test_intrinsic_odds_by_id(self):
+        self.assertEqual(self.streamed_collation.intrinsic_odds_by_id, self.collation.intrinsic_odds_by_id)
+
+    def test_transcriptional_rates_by_id(self):
+        self.assertEqual(
+            self.streamed_collation.transcriptional_rates_by_id, self.collation.transcriptional_rates_by_id
+        )
+
+    def test_origin_date_range(self):
+        self.assertEqual(self.streamed_collation.origin_date_range, self.collation.origin_date_range)
+
+    def test_from_path_no_stream(self):
+        collation = Collation.from_path(input_example, fill_corrector_lacunae=True)
+        self.assertEqual(collation.readings_by_witness, self.collation.readings_by_witness)
+
+    def test_nested_apps(self):
+        # Nest the second app element in the first reading of the first app element:
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        apps = xml.xpath("//tei:app", namespaces={"tei": tei_ns})
+        apps[0].find("{%s}rdg" % tei_ns).append(apps[1])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_addr = Path(tmp_dir) / "nested_example.xml"
+            xml.write(str(file_addr), encoding="utf-8")
+            collation = Collation.from_path(file_addr, fill_corrector_lacunae=True)
+            streamed_collation = Collation.from_path(file_addr, stream=True, fill_corrector_lacunae=True)
+        self.assertEqual(streamed_collation.variation_unit_ids, collation.variation_unit_ids)
+        self.assertEqual(streamed_collation.siglum_index.unit_ids_by_siglum, collation.siglum_index.unit_ids_by_siglum)
+        self.assertEqual(streamed_collation.readings_by_witness, collation.readings_by_witness)
+        self.assertEqual(
+            [rdg.text for rdg in streamed_collation.variation_units[0].readings],
+            [rdg.text for rdg in collation.variation_units[0].readings],
+        )
+
+
+class CollationWorkersTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(xml, manuscript_suffixes=["*", "T"])
+        self.parallel_collation = Collation(xml, manuscript_suffixes=["*", "T"], workers=2)
+
+    def test_variation_units(self):
+        self.assertEqual(
+            [vu.id for vu in self.parallel_collation.variation_units], [vu.id for vu in self.collation.variation_units]
+        )
+
+    def test_readings(self):
+        for vu, parallel_vu in zip(self.collation.variation_units, self.parallel_collation.variation_units):
+            self.assertEqual([rdg.id for rdg in parallel_vu.readings], [rdg.id for rdg in vu.readings])
+            self.assertEqual([rdg.text for rdg in parallel_vu.readings], [rdg.text for rdg in vu.readings])
+
+    def test_readings_by_witness(self):
+        self.assertEqual(self.parallel_collation.readings_by_witness, self.collation.readings_by_witness)
+
+    def test_stream(self):
+        Collation.stream_chunk_size = 5
+        try:
+            streamed_collation = Collation.from_path(
+                input_example, stream=True, manuscript_suffixes=["*", "T"], workers=2
+            )
+        finally:
+            Collation.stream_chunk_size = 256
+        self.assertEqual(
+            [vu.id for vu in streamed_collation.variation_units], [vu.id for vu in self.collation.variation_units]
+        )
+        self.assertEqual(streamed_collation.readings_by_witness, self.collation.readings_by_witness)
+
+    def test_stream_bounded(self):
+        # With only one chunk per worker in flight, the parsed chunks must be collected in order while the file is still being read:
+        Collation.stream_chunk_size = 1
+        Collation.stream_chunks_per_worker = 1
+        try:
+            streamed_collation = Collation.from_path(
+                input_example, stream=True, manuscript_suffixes=["*", "T"], workers=2
+            )
+        finally:
+            Collation.stream_chunk_size = 256
+            Collation.stream_chunks_per_worker = 2
+        self.assertEqual(
+            [vu.id for vu in streamed_collation.variation_units], [vu.id for vu in self.collation.variation_units]
+        )
+        self.assertEqual(streamed_collation.readings_by_witness, self.collation.readings_by_witness)
+
+
+class CollationMultipleFilesTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(xml, manuscript_suffixes=["*", "T"], fill_corrector_lacunae=True)
+        # Split the example collation into one file per chapter:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_addrs = []
+        for chapter in range(1, 7):
+            chapter_xml = et.parse(input_example, parser=parser)
+            for app in chapter_xml.xpath("//tei:app", namespaces={"tei": tei_ns}):
+                if not app.get("{%s}id" % xml_ns).startswith("B10K%dV" % chapter):
+                    app.getparent().remove(app)
+            file_addr = Path(self.tmp_dir.name) / ("chapter_%d.xml" % chapter)
+            chapter_xml.write(str(file_addr), encoding="utf-8")
+            self.file_addrs.append(file_addr)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def remove_witness(self, file_addr, wit_id):
+        chapter_xml = et.parse(str(file_addr))
+        for witness in chapter_xml.xpath("//tei:listWit/tei:witness[@n=\"%s\"]" % wit_id, namespaces={"tei": tei_ns}):
+            witness.getparent().remove(witness)
+        chapter_xml.write(str(file_addr), encoding="utf-8")
+
+    def test_from_paths(self):
+        collation = Collation.from_paths(self.file_addrs, manuscript_suffixes=["*", "T"], fill_corrector_lacunae=True)
+        self.assertEqual([wit.id for wit in collation.witnesses], [wit.id for wit in self.collation.witnesses])
+        self.assertEqual([vu.id for vu in collation.variation_units], [vu.id for vu in self.collation.variation_units])
+        self.assertEqual(collation.readings_by_witness, self.collation.readings_by_witness)
+        self.assertEqual(collation.intrinsic_odds_by_id, self.collation.intrinsic_odds_by_id)
+        self.assertEqual(collation.transcriptional_rates_by_id, self.collation.transcriptional_rates_by_id)
+        self.assertEqual(collation.origin_date_range, self.collation.origin_date_range)
+        self.assertEqual(collation.siglum_index.unit_ids_by_siglum, self.collation.siglum_index.unit_ids_by_siglum)
+
+    def test_from_paths_order(self):
+        collation = Collation.from_paths(list(reversed(self.file_addrs)), manuscript_suffixes=["*", "T"])
+        self.assertEqual(collation.variation_units[0].id, self.collation.variation_units[-8].id)
+
+    def test_from_paths_workers(self):
+        collation = Collation.from_paths(
+            self.file_addrs, manuscript_suffixes=["*", "T"], fill_corrector_lacunae=True, workers=2
+        )
+        self.assertEqual(collation.readings_by_witness, self.collation.readings_by_witness)
+
+    def test_from_paths_inconsistent_list_wits(self):
+        self.remove_witness(self.file_addrs[2], "P46")
+        with self.assertRaises(ParsingException):
+            Collation.from_paths(self.file_addrs, manuscript_suffixes=["*", "T"])
+
+    def test_from_paths_merge_list_wits(self):
+        self.remove_witness(self.file_addrs[0], "P46")
+        collation = Collation.from_paths(self.file_addrs, manuscript_suffixes=["*", "T"], merge_list_wits=True)
+        self.assertIn("P46", collation.witness_index_by_id)
+        self.assertEqual(len(collation.witnesses), len(self.collation.witnesses))
+
+
+class CollationReadingSupportTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        self.xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(
+            self.xml,
+            manuscript_suffixes=["*", "T"],
+            missing_reading_types=["lac", "overlap"],
+            fill_corrector_lacunae=True,
+        )
+
+    def test_reading_support_shape(self):
+        nreadings = [
+            len(self.collation.substantive_readings_by_variation_unit_id[vu_id])
+            for vu_id in self.collation.variation_unit_ids
+        ]
+        self.assertEqual(self.collation.reading_support.shape, (len(self.collation.witnesses), sum(nreadings)))
+        self.assertEqual(self.collation.extant_mask.shape, (len(self.collation.witnesses), len(nreadings)))
+        self.assertEqual(np.diff(self.collation.reading_offsets).tolist(), nreadings)
+
+    def test_extant_mask(self):
+        for wit_id, rdg_supports in self.collation.readings_by_witness.items():
+            i = self.collation.witness_index_by_id[wit_id]
+            self.assertEqual(
+                self.collation.extant_mask[i].tolist(), [sum(rdg_support) != 0 for rdg_support in rdg_supports]
+            )
+
+    def test_readings_by_witness_read_only(self):
+        vu_ind = self.collation.variation_unit_ids.index("B10K4V8U16")
+        with self.assertRaises(TypeError):
+            self.collation.readings_by_witness["06C1"] = []
+        self.collation.readings_by_witness["06C1"][vu_ind][0] = 0
+        self.assertEqual(self.collation.readings_by_witness["06C1"][vu_ind], [1, 0, 0])
+
+    def test_filtered_witness_index_by_id(self):
+        collation = self.collation.reconfigure(fragmentary_threshold=0.7)
+        self.assertLess(len(collation.witnesses), len(self.collation.witnesses))
+        self.assertEqual(collation.witness_index_by_id, {wit.id: i for i, wit in enumerate(collation.witnesses)})
+        self.assertEqual(collation.reading_support.shape[0], len(collation.witnesses))
+        for wit in collation.witnesses:
+            self.assertEqual(collation.readings_by_witness[wit.id], self.collation.readings_by_witness[wit.id])
+
+
+class CollationPackedTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(xml, manuscript_suffixes=["*", "T"], missing_reading_types=["lac", "overlap"])
+        self.packed_collation = Collation(
+            xml, manuscript_suffixes=["*", "T"], missing_reading_types=["lac", "overlap"], packed=True
+        )
+
+    def test_get_reading_bitsets(self):
+        bitsets = self.collation.get_reading_bitsets()
+        self.assertEqual(bitsets.extant.shape, (len(self.collation.witnesses), 1))
+        self.assertGreater(len(bitsets.ambiguous_supports), 0)
+
+    def test_ext_matrix(self):
+        for drop_constant in [False, True]:
+            self.assertEqual(
+                self.packed_collation.get_ext_matrix(drop_constant=drop_constant).tolist(),
+                self.collation.get_ext_matrix(drop_constant=drop_constant).tolist(),
+            )
+
+    def test_distance_matrix(self):
+        for drop_constant in [False, True]:
+            distance_matrix, _ = self.collation.to_distance_matrix(drop_constant=drop_constant, show_ext=True)
+            packed_distance_matrix, _ = self.packed_collation.to_distance_matrix(
+                drop_constant=drop_constant, show_ext=True
+            )
+            self.assertEqual(packed_distance_matrix.tolist(), distance_matrix.tolist())
+
+    def test_similarity_matrix(self):
+        for drop_constant in [False, True]:
+            similarity_matrix, _ = self.collation.to_similarity_matrix(drop_constant=drop_constant, proportion=True)
+            packed_similarity_matrix, _ = self.packed_collation.to_similarity_matrix(
+                drop_constant=drop_constant, proportion=True
+            )
+            self.assertEqual(packed_similarity_matrix.tolist(), similarity_matrix.tolist())
+
+
+class CollationScratchDirTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        self.xml = et.parse(input_example, parser=parser)
+        self.options = {
+            "manuscript_suffixes": ["*", "T", "C", "C1", "C2"],
+            "missing_reading_types": ["lac", "overlap"],
+            "fill_corrector_lacunae": True,
+            "fragmentary_threshold": 0.5,
+        }
+        self.collation = Collation(self.xml, **self.options)
+        self.scratch_dir = tempfile.TemporaryDirectory()
+        # Use a small chunk size, so that the arrays are processed in several chunks:
+        with patch.object(Collation, "array_chunk_size", 97):
+            self.scratch_collation = Collation(self.xml, scratch_dir=self.scratch_dir.name, **self.options)
+
+    def tearDown(self):
+        del self.scratch_collation
+        self.scratch_dir.cleanup()
+
+    def test_reading_support(self):
+        self.assertIsInstance(self.scratch_collation.reading_support, np.memmap)
+        self.assertEqual(self.scratch_collation.reading_support.tolist(), self.collation.reading_support.tolist())
+        self.assertEqual(self.scratch_collation.extant_mask.tolist(), self.collation.extant_mask.tolist())
+
+    def test_distance_matrix(self):
+        with patch.object(Collation, "array_chunk_size", 97):
+            distance_matrix, _ = self.scratch_collation.to_distance_matrix(drop_constant=True, show_ext=True)
+        self.assertEqual(
+            distance_matrix.tolist(), self.collation.to_distance_matrix(drop_constant=True, show_ext=True)[0].tolist()
+        )
+
+    def test_idf_matrix(self):
+        for split_missing in [None, "uniform", "proportional"]:
+            with patch.object(Collation, "array_chunk_size", 97):
+                idf_matrix, _ = self.scratch_collation.to_idf_matrix(split_missing=split_missing)
+            self.assertTrue(np.all(idf_matrix == idf_matrix.T))
+            self.assertTrue(np.allclose(idf_matrix, self.collation.to_idf_matrix(split_missing=split_missing)[0]))
+
+    def test_mi_matrix(self):
+        for split_missing in [None, "uniform", "proportional"]:
+            with patch.object(Collation, "array_chunk_size", 97):
+                mi_matrix, _ = self.scratch_collation.to_mi_matrix(split_missing=split_missing)
+            self.assertTrue(np.all(mi_matrix == mi_matrix.T))
+            self.assertTrue(np.allclose(mi_matrix, self.collation.to_mi_matrix(split_missing=split_missing)[0]))
+
+    def test_scratch_dir_not_packed(self):
+        # The scratch_dir option should not imply the packed option:
+        self.assertFalse(self.scratch_collation.packed)
+        with patch.object(Collation, "get_reading_bitsets") as get_reading_bitsets:
+            self.scratch_collation.to_similarity_matrix(show_ext=True)
+            get_reading_bitsets.assert_not_called()
+
+    def test_scratch_dir_packed(self):
+        self.scratch_collation.packed = True
+        with patch.object(Collation, "array_chunk_size", 97):
+            distance_matrix, _ = self.scratch_collation.to_distance_matrix(proportion=True, show_ext=True)
+        self.assertEqual(
+            distance_matrix.tolist(), self.collation.to_distance_matrix(proportion=True, show_ext=True)[0].tolist()
+        )
+
+    def test_set_scratch_dir(self):
+        self.scratch_collation.set_scratch_dir(None)
+        self.assertNotIsInstance(self.scratch_collation.reading_support, np.memmap)
+        self.assertEqual(self.scratch_collation.reading_support.tolist(), self.collation.reading_support.tolist())
+
+
+class CollationMemoryBudgetTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        self.xml = et.parse(input_example, parser=parser)
+        self.options = {
+            "manuscript_suffixes": ["*", "T", "C", "C1", "C2"],
+            "missing_reading_types": ["lac", "overlap"],
+            "fill_corrector_lacunae": True,
+        }
+        self.collation = Collation(self.xml, **self.options)
+        # Use a small memory budget, so that the matrices are computed in tiles of 5 witnesses:
+        self.tiled_collation = Collation(self.xml, memory_budget=128 * 25, **self.options)
+
+    def test_witness_block_size(self):
+        self.assertEqual(self.collation.get_witness_block_size(), len(self.collation.witnesses))
+        self.assertEqual(self.tiled_collation.get_witness_block_size(), 5)
+        self.assertEqual(self.tiled_collation.get_tile_chunk_size(), 50)
+
+    def test_ext_matrix(self):
+        for drop_constant in [False, True]:
+            self.assertEqual(
+                self.tiled_collation.get_ext_matrix(drop_constant=drop_constant).tolist(),
+                self.collation.get_ext_matrix(drop_constant=drop_constant).tolist(),
+            )
+
+    def test_distance_matrix(self):
+        for proportion in [False, True]:
+            distance_matrix, _ = self.tiled_collation.to_distance_matrix(proportion=proportion, show_ext=True)
+            self.assertEqual(
+                distance_matrix.tolist(),
+                self.collation.to_distance_matrix(proportion=proportion, show_ext=True)[0].tolist(),
+            )
+
+    def test_similarity_matrix(self):
+        for proportion in [False, True]:
+            similarity_matrix, _ = self.tiled_collation.to_similarity_matrix(proportion=proportion, show_ext=True)
+            self.assertEqual(
+                similarity_matrix.tolist(),
+                self.collation.to_similarity_matrix(proportion=proportion, show_ext=True)[0].tolist(),
+            )
+
+    def test_ext_matrix_shared(self):
+        # The shared extant variation units should be counted in the same tiles as the disagreements, and then reused by later outputs:
+        with patch("teiphy.collation.shared_extant_counts") as shared_extant_counts:
+            distance_matrix, _ = self.tiled_collation.to_distance_matrix(proportion=True)
+            self.assertIn(("ext_matrix", False), self.tiled_collation.derived_views)
+            similarity_matrix, _ = self.tiled_collation.to_similarity_matrix(show_ext=True)
+            idf_matrix, _ = self.tiled_collation.to_idf_matrix(proportion=True)
+            shared_extant_counts.assert_not_called()
+        self.assertEqual(distance_matrix.tolist(), self.collation.to_distance_matrix(proportion=True)[0].tolist())
+        self.assertEqual(similarity_matrix.tolist(), self.collation.to_similarity_matrix(show_ext=True)[0].tolist())
+        self.assertTrue(np.allclose(idf_matrix, self.collation.to_idf_matrix(proportion=True)[0]))
+
+    def test_idf_matrix(self):
+        for split_missing in [None, "uniform", "proportional"]:
+            idf_matrix, _ = self.tiled_collation.to_idf_matrix(split_missing=split_missing, proportion=True)
+            self.assertTrue(np.all(idf_matrix == idf_matrix.T))
+            self.assertTrue(
+                np.allclose(idf_matrix, self.collation.to_idf_matrix(split_missing=split_missing, proportion=True)[0])
+            )
+
+    def test_mi_matrix(self):
+        for split_missing in [None, "uniform", "proportional"]:
+            mi_matrix, _ = self.tiled_collation.to_mi_matrix(split_missing=split_missing)
+            self.assertTrue(np.all(mi_matrix == mi_matrix.T))
+            self.assertTrue(np.allclose(mi_matrix, self.collation.to_mi_matrix(split_missing=split_missing)[0]))
+
+    def test_scratch_dir(self):
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            scratch_collation = Collation(self.xml, scratch_dir=scratch_dir, memory_budget=128 * 25, **self.options)
+            distance_matrix, _ = scratch_collation.to_distance_matrix()
+            self.assertIsInstance(distance_matrix, np.memmap)
+            self.assertEqual(distance_matrix.tolist(), self.collation.to_distance_matrix()[0].tolist())
+            del scratch_collation, distance_matrix
+
+    def test_reconfigure(self):
+        collation = self.collation.reconfigure(memory_budget=128 * 25)
+        self.assertEqual(collation.memory_budget, 128 * 25)
+        self.assertEqual(
+            collation.to_similarity_matrix()[0].tolist(), self.collation.to_similarity_matrix()[0].tolist()
+        )
+
+
+class CollationViewTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(xml, manuscript_suffixes=["*", "T"], missing_reading_types=["lac", "overlap"])
+
+    def test_view_all(self):
+        view = self.collation.view()
+        self.assertTrue(np.shares_memory(view.reading_support, self.collation.reading_support))
+        self.assertEqual(view.to_nexus_table()[0].tolist(), self.collation.to_nexus_table()[0].tolist())
+
+    def test_view_witnesses(self):
+        witnesses = ["P46", "01", "03", "Byz"]
+        view = self.collation.view(witnesses=witnesses)
+        wit_inds = sorted(self.collation.witness_index_by_id[wit_id] for wit_id in witnesses)
+        self.assertEqual([wit.id for wit in view.witnesses], [self.collation.witnesses[i].id for i in wit_inds])
+        self.assertEqual(view.readings_by_witness["03"], self.collation.readings_by_witness["03"])
+        distance_matrix, _ = self.collation.to_distance_matrix(show_ext=True)
+        view_distance_matrix, _ = view.to_distance_matrix(show_ext=True)
+        self.assertEqual(view_distance_matrix.tolist(), distance_matrix[np.ix_(wit_inds, wit_inds)].tolist())
+
+    def test_view_unit_range(self):
+        view = self.collation.view(units=slice(2, 5))
+        self.assertTrue(np.shares_memory(view.reading_support, self.collation.reading_support))
+        self.assertEqual(view.variation_unit_ids, self.collation.variation_unit_ids[2:5])
+        self.assertEqual([vu.id for vu in view.variation_units], view.variation_unit_ids)
+        matrix, reading_labels, _ = self.collation.to_numpy()
+        view_matrix, view_reading_labels, _ = view.to_numpy()
+        offsets = self.collation.reading_offsets
+        self.assertEqual(view_reading_labels, reading_labels[offsets[2] : offsets[5]])
+        self.assertEqual(view_matrix.tolist(), matrix[offsets[2] : offsets[5]].tolist())
+
+    def test_view_units(self):
+        units = [self.collation.variation_unit_ids[j] for j in [0, 3, 4]]
+        view = self.collation.view(witnesses=["UBS", "P46", "01"], units=units)
+        self.assertEqual(view.variation_unit_ids, units)
+        self.assertEqual(view.reading_support.shape, (3, int(np.diff(view.reading_offsets).sum())))
+        self.assertEqual(
+            view.readings_by_witness["P46"], [self.collation.readings_by_witness["P46"][j] for j in [0, 3, 4]]
+        )
+
+    def test_view_skipped_units(self):
+        # A variation unit that is not indexed in the reading support array should not shift the other variation units:
+        skipped_vu = VariationUnit(
+            et.fromstring('<app xmlns="%s" xml:id="skipped"><rdg n="1" wit="P46"/></app>' % tei_ns)
+        )
+        self.collation.variation_units = [skipped_vu] + self.collation.variation_units
+        self.collation.invalidate_derived_views()
+        units = [self.collation.variation_unit_ids[j] for j in [0, 3, 4]]
+        view = self.collation.view(units=units)
+        self.assertEqual([vu.id for vu in view.variation_units], units)
+
+    def test_view_unknown_witness(self):
+        with self.assertRaises(ValueError):
+            self.collation.view(witnesses=["P46", "nonexistent"])
+
+
+class CollationAddRemoveWitnessTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(xml, manuscript_suffixes=["*", "T"], missing_reading_types=["lac", "overlap"])
+        self.original_reading_support = np.array(self.collation.reading_support)
+        self.new_witness = Witness(et.fromstring('<witness n="NEW" type="manuscript"/>'))
+        self.new_readings = {"B10K1V1U24-26": "2", "B10K1V6U20-24": ["1", "2"]}
+
+    def test_add_witness(self):
+        nwits = len(self.collation.witnesses)
+        self.collation.add_witness(self.new_witness, self.new_readings)
+        self.assertEqual(len(self.collation.witnesses), nwits + 1)
+        self.assertEqual(self.collation.witness_index_by_id["NEW"], nwits)
+        self.assertEqual(self.collation.reading_support.shape[0], nwits + 1)
+        self.assertEqual(self.collation.reading_support[:nwits].tolist(), self.original_reading_support.tolist())
+        readings = self.collation.readings_by_witness["NEW"]
+        self.assertEqual(readings[0], [0.0, 1.0])
+        self.assertEqual(readings[1][:2], [1.0, 1.0])
+        self.assertEqual(sum(sum(rdg_support) for rdg_support in readings[2:]), 0)
+        self.assertEqual(self.collation.extant_mask[nwits].tolist()[:3], [True, True, False])
+        distance_matrix, _ = self.collation.to_distance_matrix()
+        self.assertEqual(distance_matrix.shape, (nwits + 1, nwits + 1))
+
+    def test_add_corrector_fragmentary_threshold(self):
+        xml = et.parse(input_example, parser=et.XMLParser(remove_comments=True))
+        options = {
+            "manuscript_suffixes": ["*", "T"],
+            "missing_reading_types": ["lac", "overlap"],
+            "fill_corrector_lacunae": True,
+            "fragmentary_threshold": 0.9,
+        }
+        collation = Collation(xml, **options)
+        # The last witness in the listWit is fragmentary at this threshold, but it should still be the source for the corrector's lacunae:
+        self.assertNotIn("TheodoreOfMopsuestia", collation.witness_index_by_id)
+        corrector = Witness(et.fromstring('<witness n="NEW" type="corrector"/>'))
+        readings = {"B10K1V18U12": "1", "B10K2V21U6-8": "1", "B10K3V1U14-18": "1", "B10K4V19U4": "1"}
+        collation.add_witness(corrector, readings)
+        # Reconfiguring the collation parses its readings again, as the constructor does:
+        expected_collation = collation.reconfigure()
+        self.assertIn("NEW", collation.witness_index_by_id)
+        self.assertEqual(collation.readings_by_witness["NEW"], expected_collation.readings_by_witness["NEW"])
+
+    def test_add_witness_skipped_units(self):
+        # A variation unit that is not indexed in the reading support array should not shift the other variation units:
+        skipped_vu = VariationUnit(
+            et.fromstring('<app xmlns="%s" xml:id="skipped"><rdg n="1" wit="P46"/></app>' % tei_ns)
+        )
+        self.collation.variation_units = [skipped_vu] + self.collation.variation_units
+        self.collation.invalidate_derived_views()
+        self.collation.add_witness(self.new_witness, self.new_readings)
+        self.assertIs(self.collation.variation_units[0], skipped_vu)
+        self.assertIn("NEW", self.collation.variation_units[1].readings[1].wits)
+        readings = self.collation.readings_by_witness["NEW"]
+        self.assertEqual(readings[0], [0.0, 1.0])
+        self.assertEqual(readings[1][:2], [1.0, 1.0])
+
+    def test_add_corrector_skipped_units(self):
+        options = {
+            "manuscript_suffixes": ["*", "T"],
+            "missing_reading_types": ["lac", "overlap"],
+            "fill_corrector_lacunae": True,
+            "fragmentary_threshold": 0.9,
+        }
+        collation = Collation(et.parse(input_example, parser=et.XMLParser(remove_comments=True)), **options)
+        expected_collation = Collation(et.parse(input_example, parser=et.XMLParser(remove_comments=True)), **options)
+        # The corrector's lacunae are filled from the unfilled rows of its chain, which must be matched to the variation units by ID:
+        skipped_vu = VariationUnit(
+            et.fromstring('<app xmlns="%s" xml:id="skipped"><rdg n="1" wit="P46"/></app>' % tei_ns)
+        )
+        collation.variation_units = [skipped_vu] + collation.variation_units
+        collation.invalidate_derived_views()
+        corrector = Witness(et.fromstring('<witness n="NEW" type="corrector"/>'))
+        readings = {"B10K1V18U12": "1", "B10K2V21U6-8": "1", "B10K3V1U14-18": "1", "B10K4V19U4": "1"}
+        collation.add_witness(corrector, readings)
+        expected_collation.add_witness(corrector, readings)
+        self.assertEqual(collation.readings_by_witness["NEW"], expected_collation.readings_by_witness["NEW"])
+
+    def test_add_witness_reconfigure(self):
+        self.collation.add_witness(self.new_witness, self.new_readings)
+        collation = self.collation.reconfigure(missing_reading_types=["lac"])
+        self.assertIn("NEW", collation.witness_index_by_id)
+        self.assertEqual(collation.readings_by_witness["NEW"][0], [0.0, 1.0])
+
+    def test_add_existing_witness(self):
+        with self.assertRaises(ValueError):
+            self.collation.add_witness(Witness(et.fromstring('<witness n="P46"/>')), self.new_readings)
+
+    def test_add_unknown_reading(self):
+        with self.assertRaises(ValueError):
+            self.collation.add_witness(self.new_witness, {"B10K1V1U24-26": "nonexistent"})
+
+    def test_remove_witness(self):
+        i = self.collation.witness_index_by_id["P46"]
+        expected_readings = self.collation.readings_by_witness["01"]
+        self.collation.remove_witness("P46")
+        self.assertNotIn("P46", self.collation.witness_index_by_id)
+        self.assertEqual(self.collation.witnesses[i].id, self.collation.unfiltered_witnesses[i].id)
+        self.assertEqual(self.collation.reading_support.shape[0], len(self.collation.witnesses))
+        self.assertEqual(self.collation.readings_by_witness["01"], expected_readings)
+        self.assertEqual(
+            self.collation.reading_support.tolist(), np.delete(self.original_reading_support, i, axis=0).tolist()
+        )
+
+    def test_add_and_remove_witness(self):
+        i = self.collation.witness_index_by_id["P46"]
+        self.collation.remove_witness("P46")
+        self.collation.add_witness(self.new_witness, self.new_readings)
+        self.collation.remove_witness("NEW")
+        self.assertEqual(
+            self.collation.reading_support.tolist(), np.delete(self.original_reading_support, i, axis=0).tolist()
+        )
+
+    def test_derived_views(self):
+        substantive_variation_unit_ids = self.collation.get_substantive_variation_unit_ids(drop_constant=True)
+        bitsets = self.collation.get_reading_bitsets()
+        self.collation.add_witness(self.new_witness, self.new_readings)
+        self.assertIs(
+            self.collation.get_substantive_variation_unit_ids(drop_constant=True), substantive_variation_unit_ids
+        )
+        self.assertIsNot(self.collation.get_reading_bitsets(), bitsets)
+        self.assertEqual(self.collation.get_reading_bitsets().extant.shape[0], len(self.collation.witnesses))
+
+    def test_remove_witness_from_view(self):
+        view = self.collation.view()
+        view.remove_witness("P46")
+        self.assertEqual(self.collation.reading_support.tolist(), self.original_reading_support.tolist())
+
+    def test_remove_witness_with_view(self):
+        view = self.collation.view()
+        i = self.collation.witness_index_by_id["P46"]
+        self.collation.remove_witness("P46")
+        self.assertEqual(view.reading_support.tolist(), self.original_reading_support.tolist())
+        self.assertEqual(
+            self.collation.reading_support.tolist(), np.delete(self.original_reading_support, i, axis=0).tolist()
+        )
+
+    def test_add_witness_to_derived_collation(self):
+        for collation in [self.collation.reconfigure(), self.collation.view()]:
+            collation.add_witness(self.new_witness, self.new_readings)
+            self.assertEqual(collation.siglum_index.unit_ids_by_siglum["NEW"], list(self.new_readings))
+            self.assertNotIn("NEW", self.collation.siglum_index)
+            for vu in self.collation.variation_units:
+                for rdg in vu.readings:
+                    self.assertNotIn("NEW", rdg.wits)
+            self.assertNotIn("NEW", self.collation.reconfigure().witness_index_by_id)
+
+
+class CollationSupportDtypeTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        self.xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(self.xml, manuscript_suffixes=["*", "T"], missing_reading_types=["lac", "overlap"])
+
+    def test_whole_number_support(self):
+        collation = Collation(et.parse(malformed_categories_example, parser=et.XMLParser(remove_comments=True)))
+        self.assertEqual(collation.reading_support.dtype, np.uint8)
+        self.assertTrue(
+            all(isinstance(w, float) for rdg_support in collation.readings_by_witness["UBS"] for w in rdg_support)
+        )
+
+    def test_fractional_support(self):
+        # The certainty degrees in the example collation cannot all be represented exactly in single precision:
+        self.assertEqual(self.collation.reading_support.dtype, np.float64)
+
+    def test_support_dtype_option(self):
+        collation = self.collation.reconfigure(support_dtype="float32")
+        self.assertEqual(collation.reading_support.dtype, np.float32)
+        self.assertEqual(collation.reading_support.nbytes, self.collation.reading_support.nbytes // 2)
+        self.assertTrue(np.allclose(collation.reading_support, self.collation.reading_support, atol=1e-6))
+
+    def test_verbose_report(self):
+        with patch("sys.stdout", new=StringIO()) as out:
+            self.collation.reconfigure(verbose=True, support_dtype="float32")
+        self.assertIn("Stored reading support array as float32", out.getvalue())
+
+
+class CollationReconfigureTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        self.xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(self.xml)
+
+    def assertCollationsEqual(self, collation, expected_collation):
+        self.assertEqual([wit.id for wit in collation.witnesses], [wit.id for wit in expected_collation.witnesses])
+        self.assertEqual(collation.variation_unit_ids, expected_collation.variation_unit_ids)
+        self.assertEqual(collation.readings_by_witness, expected_collation.readings_by_witness)
+        self.assertEqual(
+            collation.substantive_variation_unit_reading_tuples,
+            expected_collation.substantive_variation_unit_reading_tuples,
+        )
+        self.assertEqual(
+            collation.substantive_readings_by_variation_unit_id,
+            expected_collation.substantive_readings_by_variation_unit_id,
+        )
+
+    def test_reconfigure(self):
+        options = {
+            "manuscript_suffixes": ["*", "T"],
+            "trivial_reading_types": ["reconstructed", "defective", "orthographic", "subreading"],
+            "missing_reading_types": ["lac", "overlap"],
+            "fill_corrector_lacunae": True,
+        }
+        collation = self.collation.reconfigure(**options)
+        self.assertCollationsEqual(collation, Collation(self.xml, **options))
+        self.assertIs(collation.variation_units, self.collation.variation_units)
+
+    def test_reconfigure_unchanged(self):
+        collation = Collation(self.xml, manuscript_suffixes=["*", "T"], missing_reading_types=["lac", "overlap"])
+        collation.reconfigure(missing_reading_types=[])
+        self.assertCollationsEqual(
+            collation, Collation(self.xml, manuscript_suffixes=["*", "T"], missing_reading_types=["lac", "overlap"])
+        )
+
+    def test_reconfigure_fragmentary_threshold(self):
+        options = {"manuscript_suffixes": ["*", "T"], "missing_reading_types": ["lac", "overlap"]}
+        collation = Collation(self.xml, fragmentary_threshold=0.7, **options)
+        self.assertCollationsEqual(collation.reconfigure(fragmentary_threshold=None), Collation(self.xml, **options))
+        self.assertCollationsEqual(
+            collation.reconfigure(fragmentary_threshold=0.5, fill_corrector_lacunae=True),
+            Collation(self.xml, fragmentary_threshold=0.5, fill_corrector_lacunae=True, **options),
+        )
+
+    def test_reconfigure_bad_option(self):
+        with self.assertRaises(TypeError):
+            self.collation.reconfigure(dates_file="dates.csv")
+
+
+class CollationDerivedViewsTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        self.collation = Collation(xml, manuscript_suffixes=["*", "T"], missing_reading_types=["lac", "overlap"])
+
+    def test_substantive_variation_unit_ids(self):
+        self.assertEqual(self.collation.get_substantive_variation_unit_ids(), self.collation.variation_unit_ids)
+        self.assertEqual(
+            self.collation.get_substantive_variation_unit_ids(drop_constant=True),
+            [
+                vu_id
+                for vu_id in self.collation.variation_unit_ids
+                if len(self.collation.substantive_readings_by_variation_unit_id[vu_id]) > 1
+            ],
+        )
+        self.assertEqual(
+            [
+                (vu_id, rdg.id)
+                for vu_id, readings in zip(self.collation.variation_unit_ids, self.collation.get_substantive_readings())
+                for rdg in readings
+            ],
+            self.collation.substantive_variation_unit_reading_tuples,
+        )
+
+    def test_reading_symbols(self):
+        # The substantive readings are identified by ints, and their (variation unit ID, reading ID) tuples are only built on first use:
+        self.assertNotIn("substantive_variation_unit_reading_tuples", self.collation.derived_views)
+        self.assertEqual(len(self.collation.reading_symbol_ids), self.collation.reading_support.shape[1])
+        self.assertEqual(
+            [self.collation.reading_symbols.symbols[r] for r in self.collation.reading_symbol_ids],
+            [rdg_id for vu_id, rdg_id in self.collation.substantive_variation_unit_reading_tuples],
+        )
+        self.assertEqual(len(self.collation.reading_symbols), len(set(self.collation.reading_symbols.symbols)))
+        self.assertEqual(self.collation.get_substantive_reading_ids(0), ["1", "2"])
+        self.assertEqual(self.collation.get_variation_unit_index_by_id()["B10K1V6U20-24"], 1)
+
+    def test_substantive_variation_unit_inds(self):
+        self.assertEqual(
+            self.collation.get_substantive_variation_unit_inds(), list(range(len(self.collation.variation_unit_ids)))
+        )
+        self.assertEqual(
+            [
+                self.collation.variation_unit_ids[j]
+                for j in self.collation.get_substantive_variation_unit_inds(drop_constant=True)
+            ],
+            self.collation.get_substantive_variation_unit_ids(drop_constant=True),
+        )
+
+    def test_views_are_memoized(self):
+        bitsets = self.collation.get_reading_bitsets()
+        self.assertIs(self.collation.get_reading_bitsets(), bitsets)
+        self.assertIs(
+            self.collation.get_substantive_variation_unit_ids(drop_constant=True),
+            self.collation.get_substantive_variation_unit_ids(drop_constant=True),
+        )
+
+    def test_ext_matrix_is_memoized(self):
+        ext_matrix = self.collation.get_ext_matrix(drop_constant=True)
+        self.assertIn(("ext_matrix", True), self.collation.derived_views)
+        # Modifying the returned matrix should not modify the shared counts:
+        ext_matrix[0, 0] = -1
+        self.assertNotEqual(self.collation.get_ext_matrix(drop_constant=True)[0, 0], -1)
+        self.assertIs(
+            self.collation.get_agreement_counts(drop_constant=True),
+            self.collation.get_agreement_counts(drop_constant=True),
+        )
+        self.assertEqual(
+            self.collation.get_ext_matrix(drop_constant=True).tolist(),
+            self.collation.get_agreement_counts(drop_constant=True).shared_extant_counts().tolist(),
+        )
+
+    def test_invalidate_derived_views(self):
+        substantive_variation_unit_ids = self.collation.get_substantive_variation_unit_ids(drop_constant=True)
+        self.collation.invalidate_derived_views()
+        self.assertEqual(self.collation.derived_views, {})
+        self.assertIsNot(
+            self.collation.get_substantive_variation_unit_ids(drop_constant=True), substantive_variation_unit_ids
+        )
+
+    def test_reconfigure_invalidates_derived_views(self):
+        self.collation.get_nstates()
+        collation = self.collation.reconfigure(fragmentary_threshold=0.7)
+        self.assertEqual(collation.get_reading_bitsets().extant.shape[0], len(collation.witnesses))
+        self.assertNotEqual(len(collation.witnesses), len(self.collation.witnesses))
+        self.assertEqual(self.collation.get_reading_bitsets().extant.shape[0], len(self.collation.witnesses))
+
+
+class CollationCoverageTestCase(unittest.TestCase):
+    def setUp(self):
+        parser = et.XMLParser(remove_comments=True)
+        self.xml = et.parse(input_example, parser=parser)
+        self.options = {"manuscript_suffixes": ["*", "T"], "missing_reading_types": ["lac", "overlap"]}
+        self.collation = Collation(self.xml, **self.options)
+
+    def test_get_coverage(self):
+        extant_counts, proportions_extant, thresholds, remaining_counts = self.collation.get_coverage([0.0, 0.5, 0.7])
+        self.assertEqual(thresholds.tolist(), [0.0, 0.5, 0.7])
+        self.assertEqual(len(extant_counts), len(self.collation.witnesses))
+        self.assertEqual(remaining_counts[0], len(self.collation.witnesses))
+        for threshold, remaining_count in zip(thresholds, remaining_counts):
+            filtered_collation = Collation(self.xml, fragmentary_threshold=threshold, **self.options)
+            self.assertEqual(remaining_count, len(filtered_collation.witnesses))
+
+    def test_to_coverage_table(self):
+        df = self.collation.to_dataframe(table_type="coverage")
+        self.assertEqual(len(df.index), len(self.collation.witnesses) + 1)
+        self.assertEqual(list(df.columns[:3]), ["extant", "proportion", "0"])
+        self.assertEqual(df.columns[-1], "1")
+        self.assertEqual(df.loc["remaining", "0"], len(self.collation.witnesses))
+        self.assertEqual(df.loc["remaining", "0.5"], df["0.5"].iloc[:-1].sum())
+
+
 class CollationMalformedCategoriesTestCase(unittest.TestCase):
     def setUp(self):
         parser = et.XMLParser(remove_comments=True)
@@ -272,6 +1072,65 @@ class CollationManuscriptSuffixesTestCase(unittest.TestCase):
     def test_get_base_wit_multiple_suffixes(self):
         self.assertEqual(self.collation.get_base_wit("424T*"), "424")
 
+    def test_get_base_wit_memoized(self):
+        self.assertEqual(self.collation.siglum_resolver.memo["01*"], "01")
+        self.assertEqual(self.collation.siglum_resolver.memo["424C"], "424C")
+        hits = self.collation.siglum_resolver.hits
+        self.assertEqual(self.collation.get_base_wit("01*"), "01")
+        self.assertEqual(self.collation.siglum_resolver.hits, hits + 1)
+
+    def test_reading_text_not_built(self):
+        # Outputs that do not use reading labels should not serialize the text of any readings:
+        parser = et.XMLParser(remove_comments=True)
+        xml = et.parse(input_example, parser=parser)
+        with patch.object(Reading, "parse_text", autospec=True, side_effect=Reading.parse_text) as parse_text:
+            collation = Collation(xml)
+            collation.to_distance_matrix()
+            parse_text.assert_not_called()
+            vu = collation.variation_units[0]
+            self.assertEqual(vu.readings[0].text, "εν εφεσω")
+            # Only the one reading of the unit that contains markup needs serializing:
+            self.assertEqual(parse_text.call_count, 1)
+
+    def test_reading_text_streamed(self):
+        # When a collation is streamed, the readings keep only their own elements (unlinked from the tree and without their attributes) until their text is needed:
+        with patch.object(Reading, "parse_text", autospec=True, side_effect=Reading.parse_text) as parse_text:
+            collation = Collation.from_path(input_example, stream=True, manuscript_suffixes=["*", "T"])
+            collation.to_distance_matrix()
+            parse_text.assert_not_called()
+        for vu in collation.variation_units:
+            for rdg in vu.readings:
+                if rdg._xml is not None:
+                    self.assertEqual(len(rdg._xml.attrib), 0)
+                    self.assertNotIn("{%s}TEI" % tei_ns, [elem.tag for elem in rdg._xml.iterancestors()])
+        self.assertEqual(
+            [rdg.text for vu in collation.variation_units for rdg in vu.readings],
+            [rdg.text for vu in self.collation.variation_units for rdg in vu.readings],
+        )
+
+    def test_witness_rows_by_siglum(self):
+        witness_rows_by_siglum = self.collation.get_witness_rows_by_siglum()
+        self.assertEqual(witness_rows_by_siglum["01*"], self.collation.witness_index_by_id["01"])
+        self.assertEqual(witness_rows_by_siglum["424C"], self.collation.witness_index_by_id["424C"])
+        self.assertIs(self.collation.get_witness_rows_by_siglum(), witness_rows_by_siglum)
+
+    def test_sigla(self):
+        self.assertIn("arbgr1", self.collation.siglum_index)
+        # Every siglum of every reading should be indexed under the variation units in which it occurs:
+        for vu in self.collation.variation_units:
+            for rdg in vu.readings:
+                for wit in rdg.wits:
+                    self.assertIn(vu.id, self.collation.siglum_index.unit_ids_by_siglum[wit])
+        self.assertEqual(self.collation.siglum_index.unit_ids_by_siglum["arbgr1"][0], "B10K1V1U24-26")
+
+    def test_siglum_bases_resolved_once(self):
+        # The base witness of each distinct siglum should be resolved once, no matter how many times the siglum occurs:
+        base_by_siglum = self.collation.siglum_index.resolve(self.collation.siglum_resolver)
+        self.assertEqual(base_by_siglum["01*"], "01")
+        self.assertEqual(base_by_siglum["424C"], "424C")
+        self.assertIs(self.collation.siglum_index.resolve(self.collation.siglum_resolver), base_by_siglum)
+        self.assertEqual(self.collation.siglum_resolver.misses, len(self.collation.siglum_index))
+
     def test_merged_attestations(self):
         vu_ind = self.collation.variation_unit_ids.index("B10K4V28U18-24")
         rdg_support = self.collation.readings_by_witness["arbgr1"][vu_ind]
@@ -302,6 +1161,12 @@ class CollationFillCorrectorLacunaeTestCase(unittest.TestCase):
             rdg_support, [0, 1, 0]
         )  # this corrector is active in this unit and should have its own reading
 
+    def test_filled_extant_mask(self):
+        for i, rdg_supports in enumerate(self.collation.readings_by_witness.values()):
+            self.assertEqual(
+                self.collation.extant_mask[i].tolist(), [sum(rdg_support) != 0 for rdg_support in rdg_supports]
+            )
+
 
 class CollationFillCorrectorsThresholdTestCase(unittest.TestCase):
     def setUp(self):
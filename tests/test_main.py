@@ -60,6 +60,21 @@ def test_malformed_input():
         assert result.stdout.startswith("Error opening input file:")
 
 
+def test_malformed_input_stream():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.nexus"
+        result = runner.invoke(app, ["--stream", str(malformed_example), str(output)])
+        assert result.stdout.startswith("Error opening input file:")
+
+
+def test_no_listwit_input_stream():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.nexus"
+        result = runner.invoke(app, ["--verbose", "--stream", str(no_listwit_example), str(output)])
+        assert isinstance(result.exception, ParsingException)
+        assert "An explicit listWit element must be included in the TEI XML collation." in str(result.exception)
+
+
 def test_no_listwit_input():
     with tempfile.TemporaryDirectory() as tmp_dir:
         output = Path(tmp_dir) / "test.nexus"
@@ -169,6 +184,68 @@ def test_to_nexus():
         assert "StatesFormat=Frequency" not in text
 
 
+def test_to_nexus_stream():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.nexus"
+        streamed_output = Path(tmp_dir) / "test_stream.nexus"
+        result = runner.invoke(app, [str(input_example), str(output)])
+        assert result.exit_code == 0
+        result = runner.invoke(app, ["--verbose", "--stream", str(input_example), str(streamed_output)])
+        assert result.exit_code == 0
+        assert streamed_output.exists()
+        assert streamed_output.read_text(encoding="utf-8") == output.read_text(encoding="utf-8")
+
+
+def test_to_nexus_workers():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.nexus"
+        parallel_output = Path(tmp_dir) / "test_workers.nexus"
+        result = runner.invoke(app, [str(input_example), str(output)])
+        assert result.exit_code == 0
+        result = runner.invoke(app, ["--workers", "2", str(input_example), str(parallel_output)])
+        assert result.exit_code == 0
+        assert parallel_output.read_text(encoding="utf-8") == output.read_text(encoding="utf-8")
+
+
+def test_to_nexus_bad_workers():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.nexus"
+        result = runner.invoke(app, ["--workers", "0", str(input_example), str(output)])
+        assert result.stdout.startswith("Error: the number of workers is 0. It must be at least 1.")
+
+
+def test_to_nexus_cache_dir():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = Path(tmp_dir) / "cache"
+        output = Path(tmp_dir) / "test.nexus"
+        cached_output = Path(tmp_dir) / "test_cached.nexus"
+        result = runner.invoke(app, ["--cache-dir", str(cache_dir), str(input_example), str(output)])
+        assert result.exit_code == 0
+        assert len(list(cache_dir.glob("*.pickle"))) == 1
+        result = runner.invoke(
+            app, ["--verbose", "--cache-dir", str(cache_dir), str(input_example), str(cached_output)]
+        )
+        assert result.exit_code == 0
+        assert "Loaded cached collation" in result.stdout
+        assert cached_output.read_text(encoding="utf-8") == output.read_text(encoding="utf-8")
+        # A different set of options should not reuse the same cached collation:
+        result = runner.invoke(app, ["--cache-dir", str(cache_dir), "-s", "*", str(input_example), str(output)])
+        assert result.exit_code == 0
+        assert len(list(cache_dir.glob("*.pickle"))) == 2
+
+
+def test_to_nexus_cache_dir_bad_workers():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = Path(tmp_dir) / "cache"
+        output = Path(tmp_dir) / "test.nexus"
+        result = runner.invoke(app, ["--cache-dir", str(cache_dir), str(input_example), str(output)])
+        assert result.exit_code == 0
+        # Invalid options should be rejected even if the cached collation could be reused:
+        result = runner.invoke(app, ["--cache-dir", str(cache_dir), "--workers", 0, str(input_example), str(output)])
+        assert result.exit_code == 1
+        assert result.stdout.startswith("Error: the number of workers is")
+
+
 def test_to_nexus_drop_constant():
     with tempfile.TemporaryDirectory() as tmp_dir:
         output = Path(tmp_dir) / "test.nexus"
@@ -1448,6 +1525,69 @@ def test_to_csv_distance_table():
         assert ",13," in text
 
 
+def test_to_csv_packed_distance_table():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.csv"
+        packed_output = Path(tmp_dir) / "test_packed.csv"
+        result = runner.invoke(app, ["--table", "distance", "--show-ext", str(input_example), str(output)])
+        assert result.exit_code == 0
+        result = runner.invoke(
+            app, ["--table", "distance", "--show-ext", "--packed", str(input_example), str(packed_output)]
+        )
+        assert result.exit_code == 0
+        assert packed_output.read_text(encoding="utf-8-sig") == output.read_text(encoding="utf-8-sig")
+
+
+def test_to_csv_memory_budget_similarity_table():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.csv"
+        tiled_output = Path(tmp_dir) / "test_tiled.csv"
+        scratch_dir = Path(tmp_dir) / "scratch"
+        result = runner.invoke(app, ["--table", "similarity", "--show-ext", str(input_example), str(output)])
+        assert result.exit_code == 0
+        result = runner.invoke(
+            app,
+            [
+                "--table",
+                "similarity",
+                "--show-ext",
+                "--memory-budget",
+                "1",
+                "--scratch-dir",
+                str(scratch_dir),
+                str(input_example),
+                str(tiled_output),
+            ],
+        )
+        assert result.exit_code == 0
+        assert tiled_output.read_text(encoding="utf-8-sig") == output.read_text(encoding="utf-8-sig")
+
+
+def test_to_csv_coverage_table():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.csv"
+        result = runner.invoke(app, ["--table", "coverage", str(input_example), str(output)])
+        assert result.exit_code == 0
+        assert output.exists()
+        text = output.read_text(encoding="utf-8-sig")
+        assert text.startswith(",extant,proportion,0,0.05,0.1,")
+        assert "\nUBS," in text
+        assert "\nremaining,," in text
+
+
+def test_to_nexus_scratch_dir():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = Path(tmp_dir) / "test.nexus"
+        scratch_output = Path(tmp_dir) / "test_scratch.nexus"
+        scratch_dir = Path(tmp_dir) / "scratch"
+        result = runner.invoke(app, [str(input_example), str(output)])
+        assert result.exit_code == 0
+        result = runner.invoke(app, ["--scratch-dir", str(scratch_dir), str(input_example), str(scratch_output)])
+        assert result.exit_code == 0
+        assert scratch_output.read_text(encoding="utf-8") == output.read_text(encoding="utf-8")
+        assert list(scratch_dir.iterdir()) == []
+
+
 def test_to_csv_proportion_distance_table():
     with tempfile.TemporaryDirectory() as tmp_dir:
         output = Path(tmp_dir) / "test.csv"
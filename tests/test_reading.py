@@ -1,4 +1,5 @@
 import unittest
+import pickle
 from lxml import etree as et
 
 from teiphy import Reading
@@ -50,24 +51,24 @@ class ReadingTestCase(unittest.TestCase):
             "<rdg n=\"1-v1\" type=\"reconstructed\" wit=\"#L2010\"><w>εν</w><w><unclear>ε</unclear>φεσω</w></rdg>"
         )
         reading = Reading(xml, verbose=True)
-        self.assertEqual(reading.wits, ["L2010"])
+        self.assertEqual(reading.wits, ("L2010",))
 
     def test_init_wits_n(self):
         xml = et.fromstring("<rdg n=\"2\" wit=\"P46 01* 03* 6 424C1 1739 BasilOfCaesarea Ephrem Marcion Origen\"/>")
         reading = Reading(xml, verbose=True)
         self.assertEqual(
-            reading.wits, ["P46", "01*", "03*", "6", "424C1", "1739", "BasilOfCaesarea", "Ephrem", "Marcion", "Origen"]
+            reading.wits, ("P46", "01*", "03*", "6", "424C1", "1739", "BasilOfCaesarea", "Ephrem", "Marcion", "Origen")
         )
 
     def test_init_targets_id(self):
         xml = et.fromstring("<witDetail target=\"#B10K1V1U2R1 #B10K1V1U2R2\"/>")
         reading = Reading(xml, verbose=True)
-        self.assertEqual(reading.targets, ["B10K1V1U2R1", "B10K1V1U2R2"])
+        self.assertEqual(reading.targets, ("B10K1V1U2R1", "B10K1V1U2R2"))
 
     def test_init_targets_n(self):
         xml = et.fromstring("<witDetail target=\"1 2 3\"/>")
         reading = Reading(xml, verbose=True)
-        self.assertEqual(reading.targets, ["1", "2", "3"])
+        self.assertEqual(reading.targets, ("1", "2", "3"))
 
     def test_init_certainties_default(self):
         xml = et.fromstring("<witDetail target=\"1 2\"/>")
@@ -169,6 +170,59 @@ class ReadingTestCase(unittest.TestCase):
         reading = Reading(xml, verbose=True)
         self.assertEqual(reading.text, "(B1K1V1U2)(B1K1V1U4)")
 
+    def test_init_text_unclear_choice_leading_whitespace(self):
+        xml = et.fromstring(
+            "<rdg n=\"1\" wit=\"A\">\n    <w><unclear><choice><w>οτι</w><w>ετι</w></choice></unclear></w>\n</rdg>"
+        )
+        reading = Reading(xml, verbose=True)
+        self.assertEqual(reading.text, "[̣ο̣τ̣ι̣/̣ε̣τ̣ι̣]̣")
+
+    def test_init_text_deep_nesting(self):
+        depth = 2000
+        parser = et.XMLParser(huge_tree=True)  # to allow nesting deeper than the Python recursion limit
+        xml = et.fromstring(
+            "<rdg n=\"1\" wit=\"A\">" + "<supplied>" * depth + "α" + "</supplied>" * depth + "</rdg>", parser
+        )
+        reading = Reading(xml)
+        self.assertEqual(reading.text, "[" * depth + "α" + "]" * depth)
+
+    def test_text_lazy(self):
+        xml = et.fromstring("<rdg n=\"1\" wit=\"A\"><w>πα<ex>ρα</ex></w></rdg>")
+        reading = Reading(xml)
+        self.assertIsNone(reading._text)  # the text should not be serialized until it is needed
+        self.assertEqual(reading.text, "πα(ρα)")
+        self.assertIsNone(reading._xml)
+
+    def test_text_trim(self):
+        xml = et.fromstring("<rdg n=\"1\" wit=\"A\"><w>πα<ex>ρα</ex></w></rdg>")
+        reading = Reading(xml)
+        reading.trim()
+        self.assertIsNone(xml.get("wit"))  # the attributes of the element are not needed for its text
+        self.assertEqual(reading.wits, ("A",))
+        self.assertEqual(reading.text, "πα(ρα)")
+
+    def test_text_pickle(self):
+        xml = et.fromstring("<rdg n=\"1\" wit=\"A\"><w><abbr><hi rend=\"overline\">θυ</hi></abbr></w></rdg>")
+        reading = pickle.loads(pickle.dumps(Reading(xml)))
+        self.assertEqual(reading.text, "θ̅υ̅")
+
+    def test_slots(self):
+        xml = et.fromstring("<rdg n=\"1\" wit=\"A B\"><w>εν</w></rdg>")
+        reading = Reading(xml)
+        self.assertFalse(hasattr(reading, "__dict__"))
+
+    def test_wits_interned(self):
+        reading_1 = Reading(et.fromstring("<rdg n=\"1\" wit=\"A B\"/>"))
+        reading_2 = Reading(et.fromstring("<rdg n=\"2\" wit=\"#B C\"/>"))
+        self.assertIs(reading_1.wits[1], reading_2.wits[0])
+        self.assertEqual(reading_2.wits, ("B", "C"))
+
+    def test_empty_containers_shared(self):
+        reading_1 = Reading(et.fromstring("<rdg n=\"1\" wit=\"A\"/>"))
+        reading_2 = Reading(et.fromstring("<rdg n=\"2\"/>"))
+        self.assertIs(reading_1.certainties, reading_2.certainties)
+        self.assertIs(reading_2.targets, reading_2.wits)
+
 
 if __name__ == '__main__':
     unittest.main()
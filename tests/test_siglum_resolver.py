@@ -0,0 +1,56 @@
+import unittest
+
+from teiphy.siglum_resolver import SiglumResolver
+
+
+class SiglumResolverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.resolver = SiglumResolver(
+            ["*", "T", "C", "C0", "C1", "C2", "C2a", "C2b", "A", "/1", "/2", "/3"], ["01", "424", "424C"]
+        )
+
+    def test_resolve_no_suffix(self):
+        self.assertEqual(self.resolver.resolve("424"), "424")
+
+    def test_resolve_apparent_suffix(self):
+        self.assertEqual(self.resolver.resolve("424C"), "424C")  # "C" is a suffix, but "424C" is a distinct witness
+
+    def test_resolve_one_suffix(self):
+        self.assertEqual(self.resolver.resolve("01*"), "01")
+
+    def test_resolve_multiple_suffixes(self):
+        self.assertEqual(self.resolver.resolve("424T*"), "424")
+
+    def test_resolve_suffix_order(self):
+        # "C1" ends this siglum, but "C" precedes it in the suffix list and does not, so "C1" should be stripped:
+        self.assertEqual(self.resolver.resolve("01C1"), "01")
+        # When two suffixes end a siglum, only the one that comes first in the suffix list is stripped at each step:
+        resolver = SiglumResolver(["C2", "2"], ["01"])
+        self.assertEqual(resolver.resolve("01C2"), "01")
+        resolver = SiglumResolver(["2", "C2"], ["01"])
+        self.assertEqual(resolver.resolve("01C2"), "01C")
+
+    def test_resolve_unknown(self):
+        self.assertEqual(self.resolver.resolve("05C*"), "05")
+
+    def test_hits_misses(self):
+        self.resolver.resolve("01*")
+        self.resolver.resolve("01*")
+        self.resolver.resolve("424T*")
+        self.assertEqual(self.resolver.hits, 1)
+        self.assertEqual(self.resolver.misses, 2)
+        self.assertEqual(len(self.resolver), 2)
+
+    def test_maxsize(self):
+        resolver = SiglumResolver(["*"], ["01"], maxsize=2)
+        resolver.resolve("01*")
+        resolver.resolve("02*")
+        resolver.resolve("01*")
+        resolver.resolve("03*")
+        self.assertEqual(len(resolver), 2)
+        self.assertIn("01*", resolver.memo)  # the most recently used entries should be kept
+        self.assertNotIn("02*", resolver.memo)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from teiphy.symbol_table import SymbolTable
+
+
+class SymbolTableTestCase(unittest.TestCase):
+    def test_add(self):
+        table = SymbolTable(["A", "B"])
+        self.assertEqual(table.add("C"), 2)
+        self.assertEqual(table.symbols, ["A", "B", "C"])
+        self.assertEqual(table.index_by_symbol, {"A": 0, "B": 1, "C": 2})
+        self.assertEqual(len(table), 3)
+
+    def test_add_repeated(self):
+        # Added symbols always get new IDs, so that the IDs match the positions of the objects they label:
+        table = SymbolTable(["A", "A"])
+        self.assertEqual(table.symbols, ["A", "A"])
+        self.assertEqual(table.index_by_symbol["A"], 1)
+
+    def test_intern(self):
+        table = SymbolTable()
+        self.assertEqual([table.intern(symbol) for symbol in ["1", "2", "1", "3", "2"]], [0, 1, 0, 2, 1])
+        self.assertEqual(table.symbols, ["1", "2", "3"])
+        self.assertIn("3", table)
+        self.assertNotIn("4", table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import pickle
 from lxml import etree as et
 
 from teiphy import VariationUnit
@@ -109,6 +110,38 @@ class VariationUnitTestCase(unittest.TestCase):
         self.assertEqual(vu.analysis_categories[0], "Harm")
         self.assertEqual(vu.analysis_categories[1], "Sem")
 
+    def test_init_wit_detail_default_target(self):
+        xml = et.fromstring(
+            """
+        <app xml:id="B10K5V19U17">
+            <rdg n="1" wit="01 03"><w>εν</w></rdg>
+            <rdg n="2" wit="02"><w>εν</w><w>χαριτι</w></rdg>
+            <witDetail n="W1" wit="06"/>
+        </app>
+        """
+        )
+        vu = VariationUnit(xml)
+        self.assertEqual(vu.readings[2].targets, ("2",))
+        self.assertEqual(vu.readings[2].certainties, {"2": 1})
+        self.assertEqual(len(vu.readings[1].certainties), 0)
+
+    def test_pickle(self):
+        xml = et.fromstring(
+            """
+        <app xml:id="B10K5V19U17" ana="#Harm">
+            <rdg n="1" wit="01 03"><w>εν</w></rdg>
+            <rdg n="2" wit="02"><w>εν</w><w>χαριτι</w></rdg>
+        </app>
+        """
+        )
+        vu = pickle.loads(pickle.dumps(VariationUnit(xml)))
+        self.assertFalse(hasattr(vu, "__dict__"))
+        self.assertEqual(vu.id, "B10K5V19U17")
+        self.assertEqual(vu.analysis_categories, ("Harm",))
+        self.assertEqual(len(vu.intrinsic_relations), 0)
+        self.assertEqual(vu.readings[0].wits, ("01", "03"))
+        self.assertEqual(vu.readings[1].text, "εν χαριτι")
+
     def test_init_readings_lem_wits(self):
         xml = et.fromstring(
             """